@@ -0,0 +1,339 @@
+"""Extraction benchmarks over a deterministic synthetic corpus.
+
+Generates archives locally (zip stored/deflated, tar.gz, tar.bz2, and 7z /
+multi-part RAR when py7zr / the rar tool are available), then times
+extract_archive, scan_directory and tracker lookups. Results are written as
+JSON so two commits can be compared with --compare.
+
+    python benchmarks/bench.py --sizes 1M,64M,1G --output bench.json
+    python benchmarks/bench.py --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+SEED = 20240601
+CHUNK = 4 * 1024 * 1024
+FORMATS = ('zip-stored', 'zip-deflated', 'tar.gz', 'tar.bz2', '7z', 'rar-multipart')
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper()
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def percentiles(values) -> dict:
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))]
+    return {'p50': rank(50), 'p90': rank(90), 'p99': rank(99), 'max': ordered[-1],
+            'mean': sum(ordered) / len(ordered), 'n': len(ordered)}
+
+
+def _peak_rss_bytes() -> int:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def _quiet_logs() -> None:
+    import logging
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+# ---- Corpus -------------------------------------------------------------------
+
+def write_payload(path: str, size: int, seed: int) -> None:
+    """Media-like payload: mostly incompressible bytes with some zero runs."""
+    rng = random.Random(seed)
+    with open(path, 'wb') as f:
+        left = size
+        while left > 0:
+            n = min(CHUNK, left)
+            if rng.random() < 0.1:
+                f.write(bytes(n))
+            else:
+                f.write(rng.randbytes(n))
+            left -= n
+
+
+def build_archive(fmt: str, payload: str, out_dir: str, label: str):
+    """Create one archive holding `movie.mkv`; return its path or None if unsupported here."""
+    import tarfile
+    import zipfile
+    os.makedirs(out_dir, exist_ok=True)
+    if fmt in ('zip-stored', 'zip-deflated'):
+        path = os.path.join(out_dir, f'{label}.zip')
+        compression = zipfile.ZIP_STORED if fmt == 'zip-stored' else zipfile.ZIP_DEFLATED
+        with zipfile.ZipFile(path, 'w', compression=compression, allowZip64=True) as zf:
+            zf.write(payload, 'movie.mkv')
+        return path
+    if fmt in ('tar.gz', 'tar.bz2'):
+        path = os.path.join(out_dir, f'{label}.{fmt}')
+        with tarfile.open(path, 'w:' + fmt.split('.')[1]) as tf:
+            tf.add(payload, 'movie.mkv')
+        return path
+    if fmt == '7z':
+        try:
+            import py7zr
+        except ImportError:
+            return None
+        path = os.path.join(out_dir, f'{label}.7z')
+        with py7zr.SevenZipFile(path, 'w') as z:
+            z.write(payload, 'movie.mkv')
+        return path
+    if fmt == 'rar-multipart':
+        if shutil.which('rar') is None:
+            return None
+        staged = os.path.join(out_dir, 'movie.mkv')
+        shutil.copyfile(payload, staged)
+        volume_kb = max(64, os.path.getsize(payload) // 4 // 1024)  # about four volumes
+        subprocess.run(['rar', 'a', '-m0', '-ep', f'-v{volume_kb}k', '-idq',
+                        os.path.join(out_dir, f'{label}.rar'), staged], check=True)
+        os.remove(staged)
+        firsts = sorted(n for n in os.listdir(out_dir) if n.endswith('.rar'))
+        return os.path.join(out_dir, firsts[0]) if firsts else None
+    raise ValueError(f"Unknown format {fmt}")
+
+
+def build_corpus(workdir: str, sizes, formats) -> list:
+    corpus = []
+    payload_dir = os.path.join(workdir, 'payload')
+    os.makedirs(payload_dir, exist_ok=True)
+    for size in sizes:
+        payload = os.path.join(payload_dir, f'{size}.bin')
+        if not os.path.exists(payload) or os.path.getsize(payload) != size:
+            write_payload(payload, size, SEED + size)
+        for fmt in formats:
+            label = f'{fmt}-{size}'
+            out_dir = os.path.join(workdir, 'archives', label)
+            existing = [n for n in sorted(os.listdir(out_dir))] if os.path.isdir(out_dir) else []
+            if existing:
+                path = os.path.join(out_dir, existing[0])
+            else:
+                path = build_archive(fmt, payload, out_dir, label)
+            if path is None:
+                shutil.rmtree(out_dir, ignore_errors=True)
+                print(f"skipping {fmt}: tooling not available", file=sys.stderr)
+                continue
+            corpus.append({'format': fmt, 'size': size, 'path': path})
+    return corpus
+
+
+# ---- Benchmarks ---------------------------------------------------------------
+
+def _clean_outputs(archive_dir: str) -> None:
+    for name in os.listdir(archive_dir):
+        path = os.path.join(archive_dir, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif name.endswith(('.mkv', '.partial', '.progress.json')):
+            os.remove(path)
+
+
+def _extract_case(archive: str, repeat: int) -> dict:
+    """Runs in a fresh process so peak RSS belongs to this case only."""
+    from radarr_extractor import core
+    _quiet_logs()
+    baseline_rss = _peak_rss_bytes()
+    durations, written = [], 0
+    for _ in range(repeat):
+        _clean_outputs(os.path.dirname(archive))
+        started = time.perf_counter()
+        core.extract_archive(archive)
+        durations.append(time.perf_counter() - started)
+        written = core.get_last_extract_stats().get('bytes_written', 0)
+    _clean_outputs(os.path.dirname(archive))
+    return {'seconds': percentiles(durations), 'bytes_written': written,
+            'peak_rss': _peak_rss_bytes(), 'baseline_rss': baseline_rss}
+
+
+def bench_extract(corpus, repeat: int) -> list:
+    results = []
+    ctx = multiprocessing.get_context('spawn')
+    for case in corpus:
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as ex:
+            res = ex.submit(_extract_case, case['path'], repeat).result()
+        p50 = res['seconds']['p50']
+        res.update(format=case['format'], size=case['size'],
+                   mb_per_sec=round(res['bytes_written'] / p50 / 1e6, 2) if p50 else None)
+        print(f"extract {case['format']:>14} {case['size']:>12} B  "
+              f"p50 {p50:.3f}s  {res['mb_per_sec']} MB/s  rss {res['peak_rss'] >> 20} MiB", file=sys.stderr)
+        results.append(res)
+    return results
+
+
+def build_tree(root: str, dirs: int, files_per_dir: int) -> None:
+    rng = random.Random(SEED)
+    for d in range(dirs):
+        path = os.path.join(root, f'release-{d // 50:03d}', f'movie-{d:05d}')
+        os.makedirs(path, exist_ok=True)
+        for f in range(files_per_dir):
+            name = 'movie.part01.rar' if f == 0 and rng.random() < 0.3 else f'file{f:03d}.nfo'
+            open(os.path.join(path, name), 'w').close()
+
+
+def bench_scan(workdir: str, dirs: int, files_per_dir: int, repeat: int) -> dict:
+    from unittest.mock import patch
+    from radarr_extractor import core
+    from radarr_extractor.dirstate import DirStateCache
+    root = os.path.join(workdir, 'tree')
+    if not os.path.isdir(root):
+        build_tree(root, dirs, files_per_dir)
+    cache_file = os.path.join(workdir, 'bench-dirstate.json')
+    if os.path.exists(cache_file):
+        os.remove(cache_file)
+    results = {'dirs': dirs, 'files_per_dir': files_per_dir}
+    with patch.object(core, '_submit_process', lambda path: None), \
+            patch.object(core, '_DIRSTATE', DirStateCache(cache_file)):
+        for label, force in (('full', True), ('incremental', False)):
+            durations = []
+            core.scan_directory(root)  # prime the dirstate cache and the page cache
+            for _ in range(repeat):
+                started = time.perf_counter()
+                summary = core.scan_directory(root, force=force)
+                durations.append(time.perf_counter() - started)
+            results[label] = {'seconds': percentiles(durations), 'archives': summary['archives']}
+            print(f"scan {label:>12}  p50 {results[label]['seconds']['p50']:.3f}s", file=sys.stderr)
+    return results
+
+
+def bench_tracker(workdir: str, entries: int, lookups: int) -> dict:
+    from radarr_extractor.tracker import FileTrackerStore, SqliteTrackerStore
+    results = {'entries': entries, 'lookups': lookups}
+    paths = [f'/downloads/release-{i // 50:03d}/movie-{i:06d}.rar' for i in range(entries)]
+    rng = random.Random(SEED)
+    probes = [rng.choice(paths) if rng.random() < 0.5 else f'/downloads/missing-{i}.rar' for i in range(lookups)]
+    for name in ('file', 'sqlite'):
+        base = os.path.join(workdir, f'bench-tracker-{name}')
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(base + suffix):
+                os.remove(base + suffix)
+        store = FileTrackerStore(base) if name == 'file' else SqliteTrackerStore(base, batch_size=500)
+        started = time.perf_counter()
+        for p in paths:
+            store.record(p, {'size': 1})
+        store.flush()
+        record_sec = time.perf_counter() - started
+        latencies = []
+        for p in probes:
+            t = time.perf_counter_ns()
+            store.contains(p)
+            latencies.append((time.perf_counter_ns() - t) / 1000)
+        store.close()
+        results[name] = {'record_seconds': record_sec, 'lookup_us': percentiles(latencies)}
+        print(f"tracker {name:>6}  lookup p50 {results[name]['lookup_us']['p50']:.1f}us  "
+              f"p99 {results[name]['lookup_us']['p99']:.1f}us", file=sys.stderr)
+    return results
+
+
+# ---- Reporting ------------------------------------------------------------------
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def _flatten(report: dict) -> dict:
+    """Comparable headline numbers keyed by a stable name."""
+    flat = {}
+    for r in report.get('extract', []):
+        flat[f"extract/{r['format']}/{r['size']}/seconds_p50"] = r['seconds']['p50']
+        flat[f"extract/{r['format']}/{r['size']}/peak_rss"] = r['peak_rss']
+    for label in ('full', 'incremental'):
+        if label in report.get('scan', {}):
+            flat[f"scan/{label}/seconds_p50"] = report['scan'][label]['seconds']['p50']
+    for name in ('file', 'sqlite'):
+        if name in report.get('tracker', {}):
+            flat[f"tracker/{name}/lookup_us_p50"] = report['tracker'][name]['lookup_us']['p50']
+            flat[f"tracker/{name}/lookup_us_p99"] = report['tracker'][name]['lookup_us']['p99']
+    return flat
+
+
+def compare(baseline: dict, current: dict) -> None:
+    old, new = _flatten(baseline), _flatten(current)
+    print(f"baseline {baseline['meta'].get('commit')} -> current {current['meta'].get('commit')}")
+    for key in sorted(set(old) & set(new)):
+        if old[key]:
+            change = (new[key] - old[key]) / old[key] * 100
+            print(f"{key:<55} {old[key]:>14.4g} {new[key]:>14.4g} {change:+7.1f}%")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='1M,16M,128M', help='comma-separated payload sizes (K/M/G)')
+    parser.add_argument('--formats', default=','.join(FORMATS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--workdir', default=os.path.join(REPO_ROOT, '.bench-corpus'),
+                        help='corpus directory, reused between runs (not under a tmp/temp path: '
+                             'the scanner skips those)')
+    parser.add_argument('--scan-dirs', type=int, default=2000)
+    parser.add_argument('--scan-files', type=int, default=5)
+    parser.add_argument('--tracker-entries', type=int, default=20000)
+    parser.add_argument('--tracker-lookups', type=int, default=20000)
+    parser.add_argument('--skip', default='', help='comma-separated: extract,scan,tracker')
+    parser.add_argument('--output', help='write the JSON report here instead of stdout')
+    parser.add_argument('--compare', metavar='BASELINE', help='print changes against a previous report')
+    args = parser.parse_args(argv)
+
+    workdir = os.path.abspath(args.workdir)
+    os.makedirs(workdir, exist_ok=True)
+    # Config is read at import time; keep tracker/dirstate files inside the workdir
+    os.environ.setdefault('DOWNLOAD_DIR', workdir)
+    os.environ.setdefault('EXTRACT_MODE', 'inplace')
+    skip = set(filter(None, args.skip.split(',')))
+    import radarr_extractor.config  # noqa: F401  (configures logging; quieten it afterwards)
+    _quiet_logs()
+
+    report = {'meta': {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'started_at': time.time(),
+        'args': vars(args),
+    }}
+    if 'extract' not in skip:
+        sizes = [parse_size(s) for s in args.sizes.split(',') if s]
+        formats = [f for f in args.formats.split(',') if f]
+        report['extract'] = bench_extract(build_corpus(workdir, sizes, formats), args.repeat)
+    if 'scan' not in skip:
+        report['scan'] = bench_scan(workdir, args.scan_dirs, args.scan_files, args.repeat)
+    if 'tracker' not in skip:
+        report['tracker'] = bench_tracker(workdir, args.tracker_entries, args.tracker_lookups)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+
+
+class ArchiveIndex:
+    """LRU cache of archive summaries (member counts, sizes, media detection).
+
+    Entries are keyed by path and stored with the archive's signature (size
+    and mtime, or the whole volume set for multi-part RAR); a changed
+    signature makes the entry stale, so headers are only read again after the
+    archive itself changed. `loader(path)` builds a summary on a miss.
+    """
+
+    def __init__(self, loader, capacity: int = 2048):
+        self._loader = loader
+        self.capacity = max(1, int(capacity))
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # path -> (signature, summary)
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0, 'evicted': 0}
+
+    def peek(self, path: str, signature):
+        """Cached summary for path if it matches signature, else None; never reads the archive."""
+        with self._lock:
+            cached = self._entries.get(path)
+            if cached is None:
+                return None
+            if cached[0] != signature:
+                self._stats['stale'] += 1
+                del self._entries[path]
+                return None
+            self._entries.move_to_end(path)
+            self._stats['hits'] += 1
+            return cached[1]
+
+    def get(self, path: str, signature) -> dict:
+        summary = self.peek(path, signature)
+        if summary is not None:
+            return summary
+        with self._lock:
+            self._stats['misses'] += 1
+        summary = self._loader(path)
+        with self._lock:
+            self._entries[path] = (signature, summary)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self._stats['evicted'] += 1
+        return summary
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            self._entries.pop(path, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['capacity'] = self.capacity
+            return stats
@@ -0,0 +1,182 @@
+"""Extraction backends.
+
+The ``python`` backend is the in-process rarfile/zipfile/tarfile/py7zr code in
+core. ``system_fast`` shells out to ``unrar``/``7z``/``bsdtar`` so extraction
+runs outside the GIL and can use every core. It keeps the same guarantees as
+the Python backend: member paths are validated up front, the member filter is
+applied, output lands in a private staging directory first, and links are
+rejected before anything is moved into the destination.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Callable, List, Optional
+from radarr_extractor.config import logger
+
+
+class BackendUnavailable(Exception):
+    """No suitable external tool exists for this format."""
+
+
+class UnsafeArchiveError(Exception):
+    """Archive contains a member that must not be extracted (never retried)."""
+
+
+_STATS_LOCK = threading.Lock()
+_BACKEND_STATS = {}
+
+
+def record_backend_run(name: str, bytes_written: int, seconds: float, ok: bool = True) -> None:
+    with _STATS_LOCK:
+        stats = _BACKEND_STATS.setdefault(
+            name, {'archives': 0, 'failures': 0, 'fallbacks': 0, 'bytes': 0, 'seconds': 0.0})
+        if ok:
+            stats['archives'] += 1
+            stats['bytes'] += int(bytes_written or 0)
+            stats['seconds'] += max(0.0, seconds)
+        else:
+            stats['failures'] += 1
+
+
+def record_backend_fallback(name: str) -> None:
+    with _STATS_LOCK:
+        stats = _BACKEND_STATS.setdefault(
+            name, {'archives': 0, 'failures': 0, 'fallbacks': 0, 'bytes': 0, 'seconds': 0.0})
+        stats['fallbacks'] += 1
+
+
+def get_backend_stats() -> dict:
+    """Per-backend archive/byte counters and average throughput in MB/s."""
+    with _STATS_LOCK:
+        out = {}
+        for name, stats in _BACKEND_STATS.items():
+            entry = dict(stats)
+            entry['mb_per_sec'] = (stats['bytes'] / stats['seconds'] / 1e6) if stats['seconds'] > 0 else 0.0
+            out[name] = entry
+        return out
+
+
+def _decode(output: bytes) -> List[str]:
+    return [line for line in output.decode('utf-8', errors='surrogateescape').splitlines() if line.strip()]
+
+
+class SystemFastBackend:
+    name = 'system_fast'
+
+    # Preferred tools per archive format, first available wins
+    _TOOLS = {
+        'rar': ('unrar', '7z', 'bsdtar'),
+        '7z': ('7z', 'bsdtar'),
+        'zip': ('bsdtar', '7z'),
+        'tar': ('bsdtar',),
+        'tar.gz': ('bsdtar',),
+        'tar.bz2': ('bsdtar',),
+        'tar.xz': ('bsdtar',),
+        'tar.zst': ('bsdtar',),
+    }
+    _EXECUTABLES = {'unrar': ('unrar',), '7z': ('7z', '7zz', '7za'), 'bsdtar': ('bsdtar',)}
+
+    def __init__(self):
+        self._which = {}
+
+    def _find(self, tool: str) -> Optional[str]:
+        if tool not in self._which:
+            self._which[tool] = next(
+                (p for p in (shutil.which(exe) for exe in self._EXECUTABLES[tool]) if p), None)
+        return self._which[tool]
+
+    def select_tool(self, fmt: str):
+        for tool in self._TOOLS.get(fmt, ()):
+            exe = self._find(tool)
+            if exe:
+                return tool, exe
+        raise BackendUnavailable(f"No external extractor available for {fmt}")
+
+    def _run(self, cmd: List[str]) -> bytes:
+        proc = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if proc.returncode != 0:
+            err = proc.stderr.decode('utf-8', errors='replace').strip().splitlines()
+            raise Exception(f"{os.path.basename(cmd[0])} exited with {proc.returncode}: {err[-1] if err else ''}")
+        return proc.stdout
+
+    def list_members(self, tool: str, exe: str, archive_path: str) -> List[str]:
+        """Return member names; directory entries end with '/'."""
+        if tool == 'unrar':
+            return _decode(self._run([exe, 'lb', '-p-', archive_path]))
+        if tool == '7z':
+            lines = _decode(self._run([exe, 'l', '-slt', '-p', archive_path]))
+            names = []
+            in_entries = False
+            for line in lines:
+                # Entries follow the '----------' separator; the header also has a Path line
+                if line.startswith('----------'):
+                    in_entries = True
+                elif in_entries and line.startswith('Path = '):
+                    names.append(line[len('Path = '):])
+                elif in_entries and names and line.strip() == 'Folder = +':
+                    names[-1] = names[-1].rstrip('/') + '/'
+            return names
+        return _decode(self._run([exe, '-tf', archive_path]))
+
+    def _extract_cmd(self, tool: str, exe: str, archive_path: str, staging: str, listfile: str) -> List[str]:
+        if tool == 'unrar':
+            return [exe, 'x', '-o+', '-idq', '-y', '-p-', archive_path, f'@{listfile}', staging + os.sep]
+        if tool == '7z':
+            return [exe, 'x', '-y', '-bd', '-spd', '-p', f'-o{staging}', archive_path, f'@{listfile}']
+        return [exe, '-x', '-f', archive_path, '-C', staging, '-T', listfile]
+
+    def extract(self, archive_path: str, dest_dir: str, fmt: str,
+                member_filter: Callable[[str], bool], is_safe_path: Callable[[str, str], bool],
+                on_bytes: Callable[[int], None] = None) -> int:
+        """Extract selected members of archive_path into dest_dir; return bytes written."""
+        tool, exe = self.select_tool(fmt)
+        names = self.list_members(tool, exe, archive_path)
+        selected = []
+        for name in names:
+            if not is_safe_path(dest_dir, os.path.join(dest_dir, name)):
+                raise UnsafeArchiveError(f"Unsafe {fmt} member path: {name}")
+            if not name.endswith('/') and member_filter(name):
+                selected.append(name)
+        if not selected:
+            return 0
+        os.makedirs(dest_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='.extracting-', dir=dest_dir)
+        written = 0
+        try:
+            listfile = os.path.join(staging, '.members')
+            with open(listfile, 'w', encoding='utf-8', errors='surrogateescape') as f:
+                f.write('\n'.join(selected) + '\n')
+            out_dir = os.path.join(staging, 'out')
+            os.makedirs(out_dir)
+            logger.info(f"system_fast: extracting {len(selected)} member(s) with {tool}")
+            self._run(self._extract_cmd(tool, exe, archive_path, out_dir, listfile))
+            for root, dirs, files in os.walk(out_dir):
+                for entry in dirs + files:
+                    if os.path.islink(os.path.join(root, entry)):
+                        raise UnsafeArchiveError(f"Unsafe {fmt} member (link): {entry}")
+                for entry in files:
+                    src = os.path.join(root, entry)
+                    rel = os.path.relpath(src, out_dir)
+                    if not member_filter(rel):
+                        continue
+                    target = os.path.join(dest_dir, rel)
+                    if not is_safe_path(dest_dir, target):
+                        raise UnsafeArchiveError(f"Unsafe {fmt} member path: {rel}")
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    size = os.path.getsize(src)
+                    os.replace(src, target)
+                    written += size
+                    if on_bytes is not None:
+                        on_bytes(size)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return written
+
+
+_SYSTEM_FAST = SystemFastBackend()
+
+
+def get_system_fast_backend() -> SystemFastBackend:
+    return _SYSTEM_FAST
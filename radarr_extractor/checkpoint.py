@@ -0,0 +1,116 @@
+import json
+import os
+import time
+from radarr_extractor.config import logger
+from radarr_extractor.fastcopy import file_crc32
+
+# Suffix for members being written; they are renamed into place once complete
+PARTIAL_SUFFIX = '.partial'
+
+# Suffixes of the progress file (and its temp copy) kept next to the output
+PROGRESS_SUFFIXES = ('.progress.json', '.progress.json.tmp')
+
+
+class ExtractionCheckpoint:
+    """Per-member progress of one archive extraction, persisted next to the output.
+
+    Members are written to `<name>.partial` and atomically renamed when
+    complete, then recorded with the size and CRC from the archive header.
+    After a restart a member is skipped if it is recorded with the same
+    size/CRC and the file on disk still has that size and, when the header
+    carries a CRC-32, that CRC, so extraction resumes at the first incomplete
+    or damaged member. Progress is only trusted while the
+    archive's size and mtime are unchanged; complete() removes the file.
+    """
+
+    SAVE_INTERVAL_SEC = 2.0
+
+    def __init__(self, archive_path: str, dest_dir: str, enabled: bool = True):
+        self.archive_path = archive_path
+        self.dest_dir = dest_dir
+        self.enabled = enabled
+        self.path = os.path.join(dest_dir, f".{os.path.basename(archive_path)}.progress.json")
+        self._members = {}
+        self._last_save = 0.0
+        self._dirty = False
+        self.resumed = 0
+        try:
+            st = os.stat(archive_path)
+            self._archive_sig = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            self._archive_sig = None
+        if enabled:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return
+        if data.get('archive_sig') != self._archive_sig or self._archive_sig is None:
+            logger.info(f"Archive changed since last attempt, not resuming: {self.archive_path}")
+            return
+        self._members = data.get('members', {})
+        if self._members:
+            logger.info(f"Resuming extraction of {self.archive_path}: "
+                        f"{len(self._members)} member(s) already complete")
+
+    def is_done(self, name: str, out_path: str, size: int, crc=None) -> bool:
+        """True if the member was completed by an earlier attempt and is still intact."""
+        if not self.enabled:
+            return False
+        entry = self._members.get(name)
+        if entry is None or entry[0] != size or entry[1] != crc:
+            return False
+        try:
+            if os.path.getsize(out_path) != size:
+                return False
+            if crc is not None and file_crc32(out_path) != crc:
+                logger.info(f"Re-extracting {name}: CRC of {out_path} no longer matches")
+                return False
+        except OSError:
+            return False
+        self.resumed += 1
+        return True
+
+    @staticmethod
+    def partial_path(out_path: str) -> str:
+        return out_path + PARTIAL_SUFFIX
+
+    def commit(self, name: str, partial_path: str, out_path: str, size: int, crc=None) -> None:
+        """Atomically move a finished member into place and record it."""
+        os.replace(partial_path, out_path)
+        if not self.enabled:
+            return
+        self._members[name] = [size, crc]
+        self._dirty = True
+        if time.monotonic() - self._last_save >= self.SAVE_INTERVAL_SEC:
+            self.save()
+
+    def save(self) -> None:
+        if not self.enabled or not self._dirty:
+            return
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'archive': self.archive_path, 'archive_sig': self._archive_sig,
+                           'members': self._members}, f, separators=(',', ':'))
+            os.replace(tmp, self.path)
+            self._dirty = False
+            self._last_save = time.monotonic()
+        except Exception as e:
+            logger.warning(f"Cannot save checkpoint {self.path}: {e}")
+
+    def complete(self) -> None:
+        """The whole archive is extracted; progress is no longer needed."""
+        self._dirty = False
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Cannot remove checkpoint {self.path}: {e}")
@@ -18,21 +18,92 @@ def _parse_bool(val: str, default: bool) -> bool:
     return str(val).strip().lower() in {"1", "true", "yes", "y", "on"}
 
 RADARR_NOTIFY = _parse_bool(os.environ.get('RADARR_NOTIFY'), True)
+# Rescans for the same folder within this window are sent once
+NOTIFY_COALESCE_SEC = float(os.environ.get('NOTIFY_COALESCE_SEC', '5'))
+NOTIFY_MAX_ATTEMPTS = int(os.environ.get('NOTIFY_MAX_ATTEMPTS', '5'))
 
 # Performance and selection
 MAX_CONCURRENT_EXTRACTS = int(os.environ.get('MAX_CONCURRENT_EXTRACTS', '1'))
+# Extraction queue order: webhook > ui > watchdog > scan, round-robin across top-level folders
+SCHEDULER_FAIRNESS = _parse_bool(os.environ.get('SCHEDULER_FAIRNESS'), True)
+SCHEDULER_SMALLEST_FIRST = _parse_bool(os.environ.get('SCHEDULER_SMALLEST_FIRST'), False)
+# A queued task moves up one priority class per this many seconds of waiting (0 = never)
+SCHEDULER_AGING_SEC = float(os.environ.get('SCHEDULER_AGING_SEC', '600'))
 EXTRACT_ONLY_MEDIA = _parse_bool(os.environ.get('EXTRACT_ONLY_MEDIA'), False)
+# Persist per-member progress so an interrupted extraction resumes where it stopped
+EXTRACT_RESUME = _parse_bool(os.environ.get('EXTRACT_RESUME'), True)
+# Check free space before extracting; archives that don't fit wait until they do
+DISK_SPACE_CHECK = _parse_bool(os.environ.get('DISK_SPACE_CHECK'), True)
+# Free space always left on the destination filesystem
+DISK_RESERVE_MB = int(os.environ.get('DISK_RESERVE_MB', '1024'))
+DISK_RECHECK_SEC = float(os.environ.get('DISK_RECHECK_SEC', '60'))
+# Compressed tarballs are planned at this multiple of their size instead of being read twice
+DISK_COMPRESSED_RATIO = max(1.0, float(os.environ.get('DISK_COMPRESSED_RATIO', '3')))
+# Write throttling (MiB/s, 0 = unlimited): across all extractions, and per destination device
+IO_RATE_LIMIT_MBPS = float(os.environ.get('IO_RATE_LIMIT_MBPS', '0'))
+IO_DEVICE_RATE_LIMIT_MBPS = float(os.environ.get('IO_DEVICE_RATE_LIMIT_MBPS', '0'))
+# Per-device overrides as "path=MiBps,...", e.g. "/mnt/tank=40,/mnt/scratch=0"
+IO_DEVICE_RATE_LIMITS = os.environ.get('IO_DEVICE_RATE_LIMITS', '')
+# Back off when writes slow down (disk contention), measured in ms per MiB written
+IO_ADAPTIVE = _parse_bool(os.environ.get('IO_ADAPTIVE'), False)
+IO_LATENCY_TARGET_MS = float(os.environ.get('IO_LATENCY_TARGET_MS', '20'))
+IO_MIN_RATE_MBPS = float(os.environ.get('IO_MIN_RATE_MBPS', '5'))
+# Write buffer for decompressed members; stored members are copied in-kernel when possible
+EXTRACT_BUFFER_SIZE = max(64 * 1024, int(os.environ.get('EXTRACT_BUFFER_SIZE', str(4 * 1024 * 1024))))
+EXTRACT_ZERO_COPY = _parse_bool(os.environ.get('EXTRACT_ZERO_COPY'), True)
+# Total estimated decoder memory for concurrent 7z extractions; larger archives wait their turn
+SEVENZIP_MEMORY_BUDGET_MB = max(16, int(os.environ.get('SEVENZIP_MEMORY_BUDGET_MB', '512')))
 
 # Stability tuning
 STABILITY_WINDOW_SEC = int(os.environ.get('STABILITY_WINDOW_SEC', '10'))
 STABILITY_POLLS = int(os.environ.get('STABILITY_POLLS', '3'))
 MAX_WAIT_PER_ARCHIVE_SEC = int(os.environ.get('MAX_WAIT_PER_ARCHIVE_SEC', '300'))
+# Quiet period after the last filesystem event before a path is queued
+EVENT_DEBOUNCE_SEC = float(os.environ.get('EVENT_DEBOUNCE_SEC', '5'))
 
-# Backend selection (placeholder): 'python' or 'system_fast'
+# Webhook/UI extraction jobs waiting beyond this are rejected with HTTP 429
+JOB_QUEUE_MAX = int(os.environ.get('JOB_QUEUE_MAX', '100'))
+
+# Backend selection: 'python' (in-process) or 'system_fast' (unrar/7z/bsdtar subprocesses,
+# falling back to 'python' when no tool is available or the tool fails)
 EXTRACT_BACKEND = os.environ.get('EXTRACT_BACKEND', 'python').strip().lower()
 
+# Where extraction runs: 'thread' (default), 'process' (worker processes for every
+# format) or 'auto' (processes only for CPU-bound formats like 7z/zip/tar.gz)
+EXTRACT_POOL_MODE = os.environ.get('EXTRACT_POOL_MODE', 'thread').strip().lower()
+
 # Tracker file
 TRACKER_FILE = os.path.join(DOWNLOAD_DIR, '.extracted_files')
 
+# Directory scan cache: unchanged directories are not listed again on rescans
+DIRSTATE_FILE = os.environ.get('DIRSTATE_FILE', os.path.join(DOWNLOAD_DIR, '.dirstate.json'))
+SCAN_USE_DIRSTATE = _parse_bool(os.environ.get('SCAN_USE_DIRSTATE'), True)
+# Directory worker threads for scans; >1 hides readdir latency on NFS/SMB mounts
+SCAN_WORKERS = max(1, int(os.environ.get('SCAN_WORKERS', '4')))
+
+# Archive summaries (member count, sizes, media) shown in the browse UI
+ARCHIVE_INDEX_SIZE = int(os.environ.get('ARCHIVE_INDEX_SIZE', '2048'))
+# Compressed tarballs must be decompressed to be listed; skip bigger ones
+ARCHIVE_INDEX_MAX_SCAN_MB = int(os.environ.get('ARCHIVE_INDEX_MAX_SCAN_MB', '2048'))
+
+# Seconds a directory listing for the browse API is reused (file events invalidate it sooner)
+LISTING_CACHE_TTL_SEC = float(os.environ.get('LISTING_CACHE_TTL_SEC', '5'))
+
+# Tracker backend: 'file' (default, flat append log) or 'sqlite'
+TRACKER_BACKEND = os.environ.get('TRACKER_BACKEND', 'file').strip().lower()
+TRACKER_DB_FILE = os.environ.get('TRACKER_DB_FILE', os.path.join(DOWNLOAD_DIR, '.extracted_files.db'))
+# Tracker writes are batched: flushed every TRACKER_BATCH_SIZE records or TRACKER_FLUSH_SEC seconds
+TRACKER_BATCH_SIZE = int(os.environ.get('TRACKER_BATCH_SIZE', '50'))
+TRACKER_FLUSH_SEC = float(os.environ.get('TRACKER_FLUSH_SEC', '2'))
+# Skip archives whose content fingerprint matches one already extracted (moved/duplicate releases)
+FINGERPRINT_DEDUP = _parse_bool(os.environ.get('FINGERPRINT_DEDUP'), True)
+
+# Cross-instance archive leases for several extractors sharing one download directory
+LEASES_ENABLED = _parse_bool(os.environ.get('LEASES_ENABLED'), False)
+LEASE_DIR = os.environ.get('LEASE_DIR', os.path.join(DOWNLOAD_DIR, '.leases'))
+LEASE_TTL_SEC = float(os.environ.get('LEASE_TTL_SEC', '60'))
+LEASE_HEARTBEAT_SEC = float(os.environ.get('LEASE_HEARTBEAT_SEC', '15'))
+INSTANCE_ID = os.environ.get('INSTANCE_ID', '')
+
 # Logger (configured in main at runtime)
 logger = logging.getLogger('radarr_extractor')
@@ -1,12 +1,11 @@
 import os
+import shutil
 import time
 import threading
 import rarfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import requests
-from typing import List
+from contextlib import nullcontext
+from typing import List, Optional
 from watchdog.events import FileSystemEventHandler
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from radarr_extractor.config import (
     RADARR_API_KEY,
     RADARR_URL,
@@ -19,9 +18,78 @@ from radarr_extractor.config import (
     STABILITY_WINDOW_SEC,
     STABILITY_POLLS,
     MAX_WAIT_PER_ARCHIVE_SEC,
+    EVENT_DEBOUNCE_SEC,
+    EXTRACT_BACKEND,
+    EXTRACT_POOL_MODE,
+    NOTIFY_COALESCE_SEC,
+    NOTIFY_MAX_ATTEMPTS,
+    JOB_QUEUE_MAX,
+    DIRSTATE_FILE,
+    SCAN_USE_DIRSTATE,
+    SCAN_WORKERS,
+    FINGERPRINT_DEDUP,
+    EXTRACT_RESUME,
+    EXTRACT_BUFFER_SIZE,
+    EXTRACT_ZERO_COPY,
+    SEVENZIP_MEMORY_BUDGET_MB,
+    LEASES_ENABLED,
+    LEASE_DIR,
+    LEASE_TTL_SEC,
+    LEASE_HEARTBEAT_SEC,
+    INSTANCE_ID,
+    SCHEDULER_SMALLEST_FIRST,
+    SCHEDULER_AGING_SEC,
+    SCHEDULER_FAIRNESS,
+    IO_RATE_LIMIT_MBPS,
+    IO_DEVICE_RATE_LIMIT_MBPS,
+    IO_DEVICE_RATE_LIMITS,
+    IO_ADAPTIVE,
+    IO_LATENCY_TARGET_MS,
+    IO_MIN_RATE_MBPS,
+    ARCHIVE_INDEX_SIZE,
+    ARCHIVE_INDEX_MAX_SCAN_MB,
+    LISTING_CACHE_TTL_SEC,
+    DISK_SPACE_CHECK,
+    DISK_RESERVE_MB,
+    DISK_RECHECK_SEC,
+    DISK_COMPRESSED_RATIO,
     logger,
 )
-from radarr_extractor.tracker import record_extracted_file, is_file_extracted
+from radarr_extractor.archive_index import ArchiveIndex
+from radarr_extractor.backends import (
+    BackendUnavailable,
+    UnsafeArchiveError,
+    get_system_fast_backend,
+    record_backend_fallback,
+    record_backend_run,
+)
+from radarr_extractor import metrics
+from radarr_extractor.checkpoint import ExtractionCheckpoint, PARTIAL_SUFFIX, PROGRESS_SUFFIXES
+from radarr_extractor.debounce import EventDebouncer
+from radarr_extractor.dirstate import DirStateCache
+from radarr_extractor.diskspace import DiskSpacePlanner
+from radarr_extractor.fastcopy import copy_range, copy_stream, file_crc32, preallocate
+from radarr_extractor.inflight import InFlightRegistry
+from radarr_extractor.jobs import Job, JobQueue
+from radarr_extractor.leases import LeaseLost, LeaseManager
+from radarr_extractor.listing import ListingCache, SORT_ORDERS
+from radarr_extractor.membudget import MemoryBudget
+from radarr_extractor.notifier import RadarrNotifier
+from radarr_extractor.pool import ProcessExtractionPool, report_progress
+from radarr_extractor.scheduler import ExtractionScheduler, PRIORITY_CLASSES
+from radarr_extractor.stability import StabilityMonitor
+from radarr_extractor.throttle import IOThrottle
+from radarr_extractor.volumes import (
+    find_volume_set,
+    first_volume,
+    is_first_volume,
+    is_volume_file,
+    volume_info,
+    volume_set_probe,
+)
+from radarr_extractor.fingerprint import compute_fingerprint
+from radarr_extractor.tracker import record_extracted_file, is_file_extracted, find_by_fingerprint
+from radarr_extractor.walker import TreeWalker
 
 def is_temp_directory(path: str) -> bool:
     """Check if the path is within a temp directory using component-aware check."""
@@ -33,7 +101,8 @@ def is_temp_directory(path: str) -> bool:
 
 def is_compressed_file(filename: str) -> bool:
     """Check if file is a compressed archive."""
-    compressed_extensions = ['.rar', '.zip', '.7z', '.tar.gz', '.tar.bz2', '.tar', '.tgz', '.tbz2']
+    compressed_extensions = ['.rar', '.zip', '.7z', '.tar.gz', '.tar.bz2', '.tar.xz', '.tar.zst', '.tar',
+                             '.tgz', '.tbz2', '.txz', '.tzst']
     return any(filename.lower().endswith(ext) for ext in compressed_extensions)
 
 def _is_safe_path(base_dir: str, target_path: str) -> bool:
@@ -42,78 +111,262 @@ def _is_safe_path(base_dir: str, target_path: str) -> bool:
     return os.path.commonpath([base, target]) == base
 
 
+def _copy_stream(src, partial_path: str, size: Optional[int] = None) -> None:
+    with open(partial_path, 'wb') as dst:
+        preallocate(dst.fileno(), size)
+        # Stream through one reused buffer to avoid per-chunk allocations
+        copy_stream(src, dst, EXTRACT_BUFFER_SIZE, _account_bytes, _observe_write)
+
+
+def _copy_ranges(ranges, partial_path: str, size: int, crc=None) -> None:
+    """Write a stored member by copying raw (path, offset, length) ranges of the archive.
+
+    The kernel copy bypasses the library's CRC check, so when the header has a
+    CRC-32 the written file is read back and the member fails on a mismatch.
+    """
+    # Under a write limit, charge the throttle per buffer rather than per 1 GiB kernel copy
+    chunk = EXTRACT_BUFFER_SIZE if _THROTTLE.limited() else 1 << 30
+    with open(partial_path, 'wb') as dst:
+        preallocate(dst.fileno(), size)
+        for path, offset, length in ranges:
+            with open(path, 'rb') as src:
+                copy_range(src.fileno(), dst.fileno(), offset, length, _account_bytes, EXTRACT_BUFFER_SIZE,
+                           _observe_write, chunk_size=chunk)
+    if crc is not None:
+        actual = file_crc32(partial_path, EXTRACT_BUFFER_SIZE)
+        if actual != crc:
+            os.remove(partial_path)
+            raise Exception(f"CRC mismatch in {partial_path}: expected {crc:08x}, got {actual:08x}")
+
+
+def _zip_stored_ranges(zip_path: str, info):
+    """Byte range of an uncompressed, unencrypted zip member, or None."""
+    import struct
+    import zipfile
+    if not EXTRACT_ZERO_COPY or info.compress_type != zipfile.ZIP_STORED or info.flag_bits & 0x1:
+        return None
+    if info.compress_size != info.file_size:
+        return None
+    with open(zip_path, 'rb') as f:
+        f.seek(info.header_offset)
+        header = f.read(30)
+    if len(header) != 30 or header[:4] != b'PK\x03\x04':
+        return None
+    name_len, extra_len = struct.unpack('<HH', header[26:30])
+    return [(zip_path, info.header_offset + 30 + name_len + extra_len, info.file_size)]
+
+
+def _rar_stored_ranges(rar_path: str, info):
+    """Byte ranges (one per volume) of an uncompressed, unencrypted rar member, or None."""
+    if not EXTRACT_ZERO_COPY or info.compress_type != rarfile.RAR_M0:
+        return None
+    if info.flags & rarfile.RAR_FILE_PASSWORD or getattr(info, 'file_redir', None):
+        return None
+    if not info.flags & rarfile.RAR_FILE_SPLIT_AFTER:
+        if info.compress_size != info.file_size:
+            return None
+        return [(info.volume_file, info.data_offset, info.file_size)]
+    # Split across volumes: take this member's chunk from each volume in turn
+    ranges = []
+    for volume in find_volume_set(rar_path):
+        with rarfile.RarFile(volume, part_only=True) as part:
+            chunk = next((i for i in part.infolist() if i.filename == info.filename), None)
+        if chunk is None:
+            continue
+        ranges.append((volume, chunk.data_offset, chunk.compress_size))
+        if not chunk.flags & rarfile.RAR_FILE_SPLIT_AFTER:
+            break
+    if sum(r[2] for r in ranges) != info.file_size:
+        return None
+    return ranges
+
+
 def _safe_extract_zip(zip_path: str, dest_dir: str) -> None:
     import zipfile
-    with zipfile.ZipFile(zip_path, 'r') as zf:
-        for info in zf.infolist():
-            name = info.filename
-            if name.endswith('/'):
+    ckpt = ExtractionCheckpoint(zip_path, dest_dir, EXTRACT_RESUME)
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zf:
+            for info in zf.infolist():
+                name = info.filename
+                if name.endswith('/'):
+                    out_path = os.path.join(dest_dir, name)
+                    if not _is_safe_path(dest_dir, out_path):
+                        raise Exception(f"Unsafe zip member path: {name}")
+                    os.makedirs(out_path, exist_ok=True)
+                    continue
                 out_path = os.path.join(dest_dir, name)
                 if not _is_safe_path(dest_dir, out_path):
                     raise Exception(f"Unsafe zip member path: {name}")
-                os.makedirs(out_path, exist_ok=True)
-                continue
-            out_path = os.path.join(dest_dir, name)
-            if not _is_safe_path(dest_dir, out_path):
-                raise Exception(f"Unsafe zip member path: {name}")
-            if not _should_extract_member(name):
-                continue
-            os.makedirs(os.path.dirname(out_path), exist_ok=True)
-            with zf.open(info, 'r') as src, open(out_path, 'wb') as dst:
-                # Stream in chunks to reduce memory spikes
-                while True:
-                    chunk = src.read(1024 * 1024)
-                    if not chunk:
-                        break
-                    dst.write(chunk)
+                if not _should_extract_member(name):
+                    continue
+                if ckpt.is_done(name, out_path, info.file_size, info.CRC):
+                    continue
+                os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                partial = ckpt.partial_path(out_path)
+                ranges = _zip_stored_ranges(zip_path, info)
+                if ranges is not None:
+                    _copy_ranges(ranges, partial, info.file_size, info.CRC)
+                else:
+                    with zf.open(info, 'r') as src:
+                        _copy_stream(src, partial, info.file_size)
+                ckpt.commit(name, partial, out_path, info.file_size, info.CRC)
+    except BaseException:
+        ckpt.save()
+        raise
+    ckpt.complete()
+
+
+def _open_zstd_stream(path: str):
+    """Open a zstd-compressed file as a forward-only binary stream."""
+    try:
+        from compression import zstd  # Python 3.14+
+    except ImportError:
+        try:
+            from backports import zstd
+        except ImportError:
+            zstd = None
+    if zstd is not None:
+        return zstd.open(path, 'rb')
+    try:
+        import zstandard
+    except ImportError:
+        raise Exception("zstandard (or backports.zstd) library required for .tar.zst extraction")
+    return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
 
 
 def _safe_extract_tar(tar_path: str, dest_dir: str, mode: str) -> None:
+    """Extract a tarball in a single forward pass.
+
+    Stream modes (``r|gz``, ``r|bz2``, ``r|xz``, ``r|zst``) decompress the
+    archive exactly once: each member is validated and filtered as it is
+    reached and written immediately, instead of listing every member first
+    and seeking back for extraction.
+    """
     import tarfile
-    with tarfile.open(tar_path, mode) as tf:
-        members = []
-        for m in tf.getmembers():
-            if m.islnk() or m.issym():
-                raise Exception(f"Unsafe tar member (link): {m.name}")
-            out_path = os.path.join(dest_dir, m.name)
-            if not _is_safe_path(dest_dir, out_path):
-                raise Exception(f"Unsafe tar member path: {m.name}")
-            if _should_extract_member(m.name) or m.isdir():
-                members.append(m)
-        tf.extractall(dest_dir, members=members)
+    fileobj = None
+    if mode == 'r|zst':
+        fileobj = _open_zstd_stream(tar_path)
+        mode = 'r|'
+    try:
+        with tarfile.open(tar_path if fileobj is None else None, mode, fileobj=fileobj) as tf:
+            for m in tf:
+                if m.islnk() or m.issym():
+                    raise Exception(f"Unsafe tar member (link): {m.name}")
+                out_path = os.path.join(dest_dir, m.name)
+                if not _is_safe_path(dest_dir, out_path):
+                    raise Exception(f"Unsafe tar member path: {m.name}")
+                if m.isfile() and _should_extract_member(m.name):
+                    # Stream the member so writes are throttled and counted as they happen
+                    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+                    src = tf.extractfile(m)
+                    try:
+                        _copy_stream(src, out_path, m.size)
+                    finally:
+                        src.close()
+                    os.chmod(out_path, m.mode & 0o777)
+                    os.utime(out_path, (m.mtime, m.mtime))
+                elif m.isdir() or _should_extract_member(m.name):
+                    tf.extract(m, dest_dir)
+    finally:
+        if fileobj is not None:
+            fileobj.close()
 
 
 def _safe_extract_rar(rar_path: str, dest_dir: str) -> None:
-    with rarfile.RarFile(rar_path) as rf:
-        for info in rf.infolist():
-            name = info.filename
-            out_path = os.path.join(dest_dir, name)
-            if not _is_safe_path(dest_dir, out_path):
-                raise Exception(f"Unsafe rar member path: {name}")
-            if _should_extract_member(name):
+    ckpt = ExtractionCheckpoint(rar_path, dest_dir, EXTRACT_RESUME)
+    try:
+        with rarfile.RarFile(rar_path) as rf:
+            for info in rf.infolist():
+                name = info.filename
+                out_path = os.path.join(dest_dir, name)
+                if not _is_safe_path(dest_dir, out_path):
+                    raise Exception(f"Unsafe rar member path: {name}")
+                if info.isdir():
+                    os.makedirs(out_path, exist_ok=True)
+                    continue
+                if not _should_extract_member(name):
+                    continue
+                if ckpt.is_done(name, out_path, info.file_size, info.CRC):
+                    continue
                 os.makedirs(os.path.dirname(out_path), exist_ok=True)
-                rf.extract(info, path=dest_dir)
+                partial = ckpt.partial_path(out_path)
+                ranges = _rar_stored_ranges(rar_path, info)
+                if ranges is not None:
+                    _copy_ranges(ranges, partial, info.file_size, info.CRC)
+                else:
+                    with rf.open(info) as src:
+                        _copy_stream(src, partial, info.file_size)
+                ckpt.commit(name, partial, out_path, info.file_size, info.CRC)
+    except BaseException:
+        ckpt.save()
+        raise
+    ckpt.complete()
 
 
 def _safe_extract_7z(seven_path: str, dest_dir: str) -> None:
+    """Stream wanted 7z members to disk within the shared 7z memory budget.
+
+    The archive is opened through a file object, which makes py7zr decode one
+    folder (solid block) at a time, and each member is written chunk by chunk
+    through MemberWriterFactory. The decoder working set estimated from the
+    header is reserved from SEVENZIP_MEMORY_BUDGET_MB before decoding starts.
+    """
     try:
         import py7zr
+        from radarr_extractor.sevenzip import MemberWriterFactory, estimate_decoder_memory
     except ImportError:
         raise Exception("py7zr library required for 7z extraction")
-    with py7zr.SevenZipFile(seven_path, mode='r') as z:
-        names: List[str] = [n for n in z.getnames() if _should_extract_member(n)]
-        for name in names:
-            out_path = os.path.join(dest_dir, name)
-            if not _is_safe_path(dest_dir, out_path):
-                raise Exception(f"Unsafe 7z member path: {name}")
-        try:
-            z.extractall(path=dest_dir, targets=names)
-        except TypeError:
-            z.extractall(path=dest_dir)
+    ckpt = ExtractionCheckpoint(seven_path, dest_dir, EXTRACT_RESUME)
+    factory = None
+    try:
+        with open(seven_path, 'rb') as fp, py7zr.SevenZipFile(fp, mode='r') as z:
+            infos = {}
+            for info in z.list():
+                name = info.filename
+                out_path = os.path.join(dest_dir, name)
+                if not _is_safe_path(dest_dir, out_path):
+                    raise Exception(f"Unsafe 7z member path: {name}")
+                if info.is_directory:
+                    os.makedirs(out_path, exist_ok=True)
+                    continue
+                if info.is_symlink:
+                    logger.warning(f"Skipping 7z symlink member: {name}")
+                    continue
+                if not _should_extract_member(name):
+                    continue
+                if ckpt.is_done(name, out_path, info.uncompressed, info.crc32):
+                    continue
+                infos[name] = info
+            if infos:
+                estimate = estimate_decoder_memory(z)
+
+                def on_complete(name, partial, out_path, size):
+                    ckpt.commit(name, partial, out_path, size, infos[name].crc32 if name in infos else None)
 
+                factory = MemberWriterFactory(dest_dir, infos, on_bytes=_account_bytes, on_complete=on_complete,
+                                              on_write=_observe_write)
+                # A process-pool worker's budget is held by the parent (see extract_archive)
+                budget = (nullcontext() if getattr(_EXTRACT_STATS, 'memory_reserved', False)
+                          else _SEVENZIP_MEMORY.reserve(estimate, seven_path))
+                with budget:
+                    z.extract(path=dest_dir, targets=list(infos), factory=factory)
+                factory.finish()
+                stats = getattr(_EXTRACT_STATS, 'current', None)
+                if stats is not None:
+                    stats['memory_estimate'] = estimate
+                    stats['peak_rss'] = factory.peak_rss
+                logger.info(f"7z peak RSS ~{factory.peak_rss >> 20} MiB "
+                            f"(decoder estimate {estimate >> 20} MiB): {seven_path}")
+    except BaseException:
+        if factory is not None:
+            factory.abort()
+        ckpt.save()
+        raise
+    ckpt.complete()
 
 
 _MEDIA_EXTS = {'.mkv', '.mp4', '.avi', '.mov', '.mpg', '.mpeg', '.m4v', '.ts', '.srt', '.sub', '.idx', '.ass', '.sup'}
+_VIDEO_EXTS = {'.mkv', '.mp4', '.avi', '.mov', '.mpg', '.mpeg', '.m4v', '.ts'}
 _JUNK_EXTS = {'.nfo', '.jpg', '.jpeg', '.png', '.url', '.sfv', '.txt'}
 
 
@@ -129,6 +382,85 @@ def _should_extract_member(name: str) -> bool:
     return True
 
 
+# Per-thread statistics for the extraction currently running on this thread
+_EXTRACT_STATS = threading.local()
+
+# Estimated decoder memory of concurrent 7z extractions in this process
+_SEVENZIP_MEMORY = MemoryBudget(SEVENZIP_MEMORY_BUDGET_MB * 1024 * 1024)
+
+
+def _sevenzip_memory_estimate(seven_path: str) -> int:
+    """Decoder working set of a 7z archive, read from its header only."""
+    import py7zr
+    from radarr_extractor.sevenzip import estimate_decoder_memory
+    with open(seven_path, 'rb') as fp, py7zr.SevenZipFile(fp, mode='r') as z:
+        return estimate_decoder_memory(z)
+
+
+_MIB = 1024 * 1024
+
+
+def _parse_device_limits(spec: str) -> dict:
+    """Map "path=MiBps,..." to {st_dev: bytes per second}; unknown paths are skipped."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        path, _, rate = item.rpartition('=')
+        try:
+            limits[os.stat(path).st_dev] = float(rate) * _MIB
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring IO_DEVICE_RATE_LIMITS entry {item!r}: {e}")
+    return limits
+
+
+# Write throttle shared by every extraction in this process
+_THROTTLE = IOThrottle(
+    rate=IO_RATE_LIMIT_MBPS * _MIB,
+    device_rate=IO_DEVICE_RATE_LIMIT_MBPS * _MIB,
+    device_rates=_parse_device_limits(IO_DEVICE_RATE_LIMITS),
+    adaptive=IO_ADAPTIVE,
+    latency_target=IO_LATENCY_TARGET_MS / 1000.0,
+    min_rate=IO_MIN_RATE_MBPS * _MIB,
+)
+
+
+def _device_of(path: str):
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+
+def _account_bytes(n: int) -> None:
+    stats = getattr(_EXTRACT_STATS, 'current', None)
+    if stats is not None:
+        stats['bytes_written'] += n
+        stats['throttled'] = stats.get('throttled', 0.0) + _THROTTLE.consume(n, stats.get('device'))
+    reservation = getattr(_EXTRACT_STATS, 'reservation', None)
+    if reservation is not None:
+        reservation.written += n
+    on_bytes = getattr(_EXTRACT_STATS, 'on_bytes', None)
+    if on_bytes is not None:
+        on_bytes(n)
+    lease = getattr(_EXTRACT_STATS, 'lease', None)
+    if lease is not None and lease[0].is_lost(lease[1]):
+        raise LeaseLost(f"Lease on {lease[1]} was lost")
+
+
+def _observe_write(n: int, seconds: float) -> None:
+    stats = getattr(_EXTRACT_STATS, 'current', None)
+    _THROTTLE.observe_write(n, seconds, stats.get('device') if stats is not None else None)
+
+
+def get_io_stats() -> dict:
+    """Current write throughput, limits and adaptive back-offs, globally and per device."""
+    return _THROTTLE.stats()
+
+
+def get_last_extract_stats() -> dict:
+    """Return stats (archive, destination, bytes_written, duration) of this thread's last extraction."""
+    return dict(getattr(_EXTRACT_STATS, 'last', None) or {})
+
+
 def _compute_extract_dir(archive_path: str) -> str:
     if EXTRACT_MODE == 'extracted_dir':
         try:
@@ -146,184 +478,917 @@ def _compute_extract_dir(archive_path: str) -> str:
     return os.path.dirname(archive_path)
 
 
-def extract_archive(archive_path: str) -> str:
-    """Extract archive using safe extraction routines."""
-    logger.info(f"Starting archive extraction for: {archive_path}")
+# Archive formats by filename suffix; compound tar suffixes are listed before '.tar'
+_ARCHIVE_FORMATS = (
+    ('rar', ('.rar',)),
+    ('zip', ('.zip',)),
+    ('7z', ('.7z',)),
+    ('tar.gz', ('.tar.gz', '.tgz')),
+    ('tar.bz2', ('.tar.bz2', '.tbz2')),
+    ('tar.xz', ('.tar.xz', '.txz')),
+    ('tar.zst', ('.tar.zst', '.tzst')),
+    ('tar', ('.tar',)),
+)
+_TAR_MODES = {'tar': 'r|', 'tar.gz': 'r|gz', 'tar.bz2': 'r|bz2', 'tar.xz': 'r|xz', 'tar.zst': 'r|zst'}
+
+
+def _archive_format(archive_path: str) -> Optional[str]:
+    archive_lower = archive_path.lower()
+    for fmt, suffixes in _ARCHIVE_FORMATS:
+        if archive_lower.endswith(suffixes):
+            return fmt
+    return None
+
+
+def list_archive_members(archive_path: str) -> List[tuple]:
+    """(name, uncompressed size) of every file member, read from the archive headers.
+
+    zip/rar/7z and plain tar only read their directories; compressed tarballs
+    have no index and are decompressed once to list them.
+    """
+    fmt = _archive_format(archive_path)
+    if fmt == 'zip':
+        import zipfile
+        with zipfile.ZipFile(archive_path) as zf:
+            return [(i.filename, i.file_size) for i in zf.infolist() if not i.is_dir()]
+    if fmt == 'rar':
+        with rarfile.RarFile(archive_path) as rf:
+            return [(i.filename, i.file_size) for i in rf.infolist() if not i.is_dir()]
+    if fmt == '7z':
+        import py7zr
+        with py7zr.SevenZipFile(archive_path, mode='r') as z:
+            return [(i.filename, i.uncompressed) for i in z.list() if not i.is_directory]
+    if fmt is None:
+        raise Exception(f"Unsupported archive format: {archive_path}")
+    import tarfile
+    mode = _TAR_MODES[fmt]
+    fileobj = None
+    if mode == 'r|':
+        mode = 'r:'
+    elif mode == 'r|zst':
+        fileobj = _open_zstd_stream(archive_path)
+        mode = 'r|'
+    try:
+        with tarfile.open(archive_path if fileobj is None else None, mode, fileobj=fileobj) as tf:
+            return [(m.name, m.size) for m in tf if m.isfile()]
+    finally:
+        if fileobj is not None:
+            fileobj.close()
+
+
+def _archive_signature(archive_path: str, st: os.stat_result = None):
+    """What must stay unchanged for a cached index to be valid."""
+    if is_volume_file(archive_path):
+        return volume_set_probe(archive_path)
+    st = st or os.stat(archive_path)
+    return st.st_size, st.st_mtime_ns
+
+
+def _summarize_archive(archive_path: str) -> dict:
+    if not is_first_volume(archive_path):
+        first = first_volume(archive_path)
+        return {'part_of': os.path.basename(first) if first else None}
+    fmt = _archive_format(archive_path)
+    if fmt not in ('zip', 'rar', '7z', 'tar') and os.path.getsize(archive_path) > ARCHIVE_INDEX_MAX_SCAN_MB * _MIB:
+        return {'format': fmt, 'error': 'too large to list without decompressing'}
+    try:
+        members = list_archive_members(archive_path)
+    except Exception as e:
+        logger.debug(f"Cannot index {archive_path}: {e}")
+        return {'format': fmt, 'error': str(e)}
+    wanted = [(name, size) for name, size in members if _should_extract_member(name)]
+    return {
+        'format': fmt,
+        'members': len(members),
+        'size': sum(size for _, size in members),
+        'extract_members': len(wanted),
+        'extract_size': sum(size for _, size in wanted),
+        'has_media': any(os.path.splitext(name)[1].lower() in _VIDEO_EXTS for name, _ in members),
+    }
+
+
+# Per-archive summaries for the browse UI, re-read only when the archive changes
+_ARCHIVE_INDEX = ArchiveIndex(_summarize_archive, ARCHIVE_INDEX_SIZE)
+
+
+def get_archive_index(archive_path: str, st: os.stat_result = None, load: bool = True, signature=None):
+    """Cached summary of archive_path; with load=False only what is already cached (else None).
+    A known `signature` (see _listing_volume_signatures) saves re-probing the archive."""
+    if signature is None:
+        try:
+            signature = _archive_signature(archive_path, st)
+        except OSError:
+            return None
+    if not load:
+        return _ARCHIVE_INDEX.peek(archive_path, signature)
+    return _ARCHIVE_INDEX.get(archive_path, signature)
+
+
+# Bookkeeping files of ours (and macOS litter) that the browse UI never shows
+HIDDEN_NAMES = frozenset({'.DS_Store', '.extracted_files', '.extracted_files.db', '.dirstate.json', '.leases'})
+# Resume checkpoints and members still being written
+HIDDEN_SUFFIXES = PROGRESS_SUFFIXES + (PARTIAL_SUFFIX,)
+
+# Directory listings for /api/list; file events in a directory drop its entry
+_LISTINGS = ListingCache(LISTING_CACHE_TTL_SEC, hidden=HIDDEN_NAMES, hidden_suffixes=HIDDEN_SUFFIXES)
+
+
+def _listing_volume_signatures(directory: str, entries: list) -> dict:
+    """volume_set_probe() signatures of every RAR set in a cached listing, by set key.
+
+    Built once per listing, so a page of volume archives costs no extra
+    directory scans however large the directory is.
+    """
+    sets = {}
+    for entry in entries:
+        if entry['is_dir']:
+            continue
+        info = volume_info(os.path.join(directory, entry['name']))
+        if info is not None:
+            sets.setdefault(info[0], []).append((info[1], entry['name'], entry['size'], entry['mtime']))
+    signatures = {}
+    for key, members in sets.items():
+        members.sort()
+        signatures[key] = (tuple((name, size) for _, name, size, _ in members),
+                           max(0.0, max(mtime for *_, mtime in members)))
+    return signatures
+
+
+def list_directory(directory: str, sort: str = 'name', cursor: str = None, limit: int = 200,
+                   archives_only: bool = False, pending_only: bool = False) -> dict:
+    """One page of a directory listing; raises ValueError for a bad sort or cursor.
+
+    pending_only keeps archives the tracker has not recorded yet (and implies
+    archives_only). Archive entries carry their tracker state and whatever
+    archive summary is already cached.
+    """
+    if sort not in SORT_ORDERS:
+        raise ValueError(f"unknown sort order: {sort}")
+    archives_only = archives_only or pending_only
+
+    def wanted(entry):
+        if entry['is_dir'] or not is_compressed_file(entry['name']):
+            return False
+        return not pending_only or not is_file_extracted(os.path.join(directory, entry['name']))
+
+    listing = _LISTINGS.get(directory)
+    page = _LISTINGS.paginate(listing, sort, cursor, max(1, limit), wanted if archives_only else None)
+    volume_sets = None
+    entries = []
+    for entry in page['entries']:
+        item = dict(entry, is_archive=not entry['is_dir'] and is_compressed_file(entry['name']))
+        if item['is_archive']:
+            path = os.path.join(directory, entry['name'])
+            item['extracted'] = is_file_extracted(path)
+            info = volume_info(path)
+            if info is not None and info[1] == 0:
+                if volume_sets is None:
+                    volume_sets = listing.derived(
+                        'volume_sets', lambda found: _listing_volume_signatures(directory, found))
+                item['index'] = get_archive_index(path, load=False, signature=volume_sets.get(info[0]))
+            elif info is None:
+                item['index'] = get_archive_index(path, load=False)
+            else:
+                item['index'] = {'volume': True}  # later volume; the set is indexed via its first
+        entries.append(item)
+    page['entries'] = entries
+    return page
+
+
+def get_listing_stats() -> dict:
+    return _LISTINGS.stats()
+
+
+def _extract_python(archive_path: str, extract_dir: str, fmt: str) -> None:
+    """In-process extraction through rarfile/zipfile/py7zr/tarfile."""
+    if fmt == 'rar':
+        _safe_extract_rar(archive_path, extract_dir)
+    elif fmt == 'zip':
+        _safe_extract_zip(archive_path, extract_dir)
+    elif fmt == '7z':
+        _safe_extract_7z(archive_path, extract_dir)
+    else:
+        _safe_extract_tar(archive_path, extract_dir, _TAR_MODES[fmt])
+
+
+def _system_fast_enabled() -> bool:
+    """system_fast unless a write limit is set: the external tools write outside
+    our copy loops, so their output could only be charged after the fact."""
+    return EXTRACT_BACKEND == 'system_fast' and not _THROTTLE.limited()
+
+
+def _extract_system_fast(archive_path: str, extract_dir: str, fmt: str) -> bool:
+    """Try the external-tool backend; False means the caller should fall back to Python."""
+    try:
+        get_system_fast_backend().extract(
+            archive_path, extract_dir, fmt, _should_extract_member, _is_safe_path, on_bytes=_account_bytes)
+        return True
+    except UnsafeArchiveError:
+        raise
+    except BackendUnavailable as e:
+        logger.info(f"{e}; using python backend")
+    except Exception as e:
+        logger.warning(f"system_fast backend failed for {archive_path}: {e}; falling back to python backend")
+        record_backend_run('system_fast', 0, 0.0, ok=False)
+        stats = getattr(_EXTRACT_STATS, 'current', None)
+        if stats is not None:
+            stats['bytes_written'] = 0
+        # The python backend writes everything again; don't count the failed attempt twice
+        reservation = getattr(_EXTRACT_STATS, 'reservation', None)
+        if reservation is not None:
+            reservation.written = 0
+    record_backend_fallback('system_fast')
+    return False
+
+
+def _extract_local(archive_path: str) -> str:
+    """Extract on the current thread/process; stats end up in _EXTRACT_STATS.last."""
     extract_dir = _compute_extract_dir(archive_path)
     logger.info(f"Extracting to: {extract_dir}")
+    fmt = _archive_format(archive_path)
+    stats = {'archive': archive_path, 'destination': extract_dir, 'format': fmt,
+             'backend': 'python', 'pool': 'thread', 'bytes_written': 0, 'duration': 0.0,
+             'device': _device_of(extract_dir), 'throttled': 0.0}
+    _EXTRACT_STATS.current = stats
+    started = time.monotonic()
     try:
-        archive_lower = archive_path.lower()
-        if archive_lower.endswith('.rar'):
-            logger.info("Detected RAR archive")
-            _safe_extract_rar(archive_path, extract_dir)
-        elif archive_lower.endswith('.zip'):
-            logger.info("Detected ZIP archive")
-            _safe_extract_zip(archive_path, extract_dir)
-        elif archive_lower.endswith('.7z'):
-            logger.info("Detected 7Z archive")
-            _safe_extract_7z(archive_path, extract_dir)
-        elif archive_lower.endswith(('.tar.gz', '.tgz')):
-            logger.info("Detected TAR.GZ archive")
-            _safe_extract_tar(archive_path, extract_dir, 'r:gz')
-        elif archive_lower.endswith(('.tar.bz2', '.tbz2')):
-            logger.info("Detected TAR.BZ2 archive")
-            _safe_extract_tar(archive_path, extract_dir, 'r:bz2')
-        elif archive_lower.endswith('.tar'):
-            logger.info("Detected TAR archive")
-            _safe_extract_tar(archive_path, extract_dir, 'r')
-        else:
+        if fmt is None:
             logger.warning(f"Unsupported archive format: {archive_path}")
             raise Exception(f"Unsupported archive format: {archive_path}")
-        logger.info(f"Extraction completed successfully to: {extract_dir}")
+        logger.info(f"Detected {fmt.upper()} archive")
+        if _system_fast_enabled() and _extract_system_fast(archive_path, extract_dir, fmt):
+            stats['backend'] = 'system_fast'
+        else:
+            _extract_python(archive_path, extract_dir, fmt)
         return extract_dir
+    finally:
+        stats['duration'] = time.monotonic() - started
+        _EXTRACT_STATS.current = None
+        _EXTRACT_STATS.last = stats
+
+
+def _extract_archive_worker(archive_path: str, memory_reserved: bool = False):
+    """Process-pool entry point: extract and hand the stats back to the parent."""
+    # Each worker process has its own throttle; split the limits between them
+    _THROTTLE.set_share(1.0 / max(1, MAX_CONCURRENT_EXTRACTS))
+    _EXTRACT_STATS.memory_reserved = memory_reserved
+    # Relayed to the parent, which applies it to the reservation and job (_pool_progress)
+    _EXTRACT_STATS.on_bytes = report_progress
+    extract_dir = _extract_local(archive_path)
+    return extract_dir, get_last_extract_stats()
+
+
+# Formats whose decoding is CPU-bound in Python (zlib/bz2/lzma/zstd); RAR and plain
+# tar are mostly I/O or already run in an external unrar process.
+_CPU_BOUND_FORMATS = {'zip', '7z', 'tar.gz', 'tar.bz2', 'tar.xz', 'tar.zst'}
+
+_PROCESS_POOL = ProcessExtractionPool(max(1, MAX_CONCURRENT_EXTRACTS))
+
+
+def _pool_progress():
+    """Callback applying a worker's relayed bytes to this thread's reservation and job."""
+    reservation = getattr(_EXTRACT_STATS, 'reservation', None)
+    on_bytes = getattr(_EXTRACT_STATS, 'on_bytes', None)
+    if reservation is None and on_bytes is None:
+        return None
+
+    def relay(n: int) -> None:
+        if reservation is not None:
+            reservation.written += n
+        if on_bytes is not None:
+            on_bytes(n)
+    return relay
+
+
+def _use_process_pool(fmt: Optional[str]) -> bool:
+    if fmt is None or EXTRACT_POOL_MODE == 'thread':
+        return False
+    if EXTRACT_POOL_MODE == 'process':
+        return True
+    # auto: subprocess backends already run outside the GIL
+    return not _system_fast_enabled() and fmt in _CPU_BOUND_FORMATS
+
+
+def extract_archive(archive_path: str) -> str:
+    """Extract archive using safe extraction routines on the configured backend."""
+    logger.info(f"Starting archive extraction for: {archive_path}")
+    fmt = _archive_format(archive_path)
+    use_pool = _use_process_pool(fmt)
+    try:
+        if use_pool and fmt == '7z':
+            # Workers each import their own budget, so it is enforced here in the parent
+            with _SEVENZIP_MEMORY.reserve(_sevenzip_memory_estimate(archive_path), archive_path):
+                extract_dir, stats = _PROCESS_POOL.run(_extract_archive_worker, archive_path, True,
+                                                       on_progress=_pool_progress())
+        elif use_pool:
+            extract_dir, stats = _PROCESS_POOL.run(_extract_archive_worker, archive_path,
+                                                   on_progress=_pool_progress())
+        if use_pool:
+            stats['pool'] = 'process'
+            _EXTRACT_STATS.last = stats
+            _THROTTLE.record(stats['bytes_written'], stats.get('device'))
+        else:
+            extract_dir = _extract_local(archive_path)
+            stats = get_last_extract_stats()
     except Exception as e:
+        if use_pool:
+            record_backend_run(EXTRACT_BACKEND, 0, 0.0, ok=False)
+        elif get_last_extract_stats().get('format') is not None:
+            record_backend_run(get_last_extract_stats()['backend'], 0, 0.0, ok=False)
         logger.error(f"Extraction failed: {str(e)}")
         raise
+    record_backend_run(stats['backend'], stats['bytes_written'], stats['duration'])
+    metrics.ARCHIVES_EXTRACTED.inc(format=stats['format'])
+    metrics.EXTRACTION_SECONDS.observe(stats['duration'], format=stats['format'])
+    if stats.get('peak_rss'):
+        metrics.EXTRACTION_PEAK_RSS_BYTES.observe(stats['peak_rss'], format=stats['format'])
+    if stats['duration'] > 0:
+        metrics.EXTRACTION_BYTES_PER_SECOND.observe(stats['bytes_written'] / stats['duration'],
+                                                    format=stats['format'])
+    logger.info(f"Extraction completed successfully to: {extract_dir}")
+    return extract_dir
+
+
+def get_pool_stats() -> dict:
+    """Utilization of the extractor thread pool and the optional process pool."""
+    with _ACTIVE_LOCK:
+        active = _ACTIVE_WORKERS[0]
+    workers = max(1, MAX_CONCURRENT_EXTRACTS)
+    return {
+        'mode': EXTRACT_POOL_MODE,
+        'threads': {'workers': workers, 'busy': active, 'utilization': active / workers},
+        'scheduler': _SCHEDULER.stats(),
+        'processes': _PROCESS_POOL.stats(),
+    }
+
+_NOTIFIER = None
+_NOTIFIER_LOCK = threading.Lock()
+
+
+def _get_notifier() -> RadarrNotifier:
+    global _NOTIFIER
+    with _NOTIFIER_LOCK:
+        if _NOTIFIER is None:
+            _NOTIFIER = RadarrNotifier(
+                RADARR_URL,
+                RADARR_API_KEY,
+                coalesce_sec=NOTIFY_COALESCE_SEC,
+                max_attempts=NOTIFY_MAX_ATTEMPTS,
+            )
+        return _NOTIFIER
+
 
 def notify_radarr(extracted_path: str) -> None:
-    """Notify Radarr about the new extracted files with retries and toggle."""
+    """Queue a Radarr rescan for the extracted files; sending happens in the background."""
     if not RADARR_NOTIFY:
         logger.info("RADARR_NOTIFY disabled; skipping Radarr notification")
         return
     if not RADARR_URL or not RADARR_API_KEY:
         logger.warning("RADARR_URL or RADARR_API_KEY not set; skipping Radarr notification")
         return
-    headers = {
-        'X-Api-Key': RADARR_API_KEY,
-        'Content-Type': 'application/json'
-    }
-    endpoint = f"{RADARR_URL}/api/v3/command"
-    payload = {"name": "RescanMovie", "path": extracted_path}
-    last_err = None
-    for attempt in range(3):
-        try:
-            resp = requests.post(endpoint, json=payload, headers=headers, timeout=10)
-            resp.raise_for_status()
-            logger.info(f"Notified Radarr to rescan: {extracted_path}")
+    logger.info(f"Queued Radarr rescan for: {extracted_path}")
+    _get_notifier().enqueue(extracted_path)
+
+
+def get_notify_stats() -> dict:
+    """Counters of the background Radarr notifier (empty until first use)."""
+    with _NOTIFIER_LOCK:
+        return _NOTIFIER.stats() if _NOTIFIER is not None else {}
+
+# Archives currently being processed; entries exist only while held or awaited
+_IN_FLIGHT = InFlightRegistry()
+
+_LEASES = None
+_LEASES_LOCK = threading.Lock()
+
+
+def _get_leases():
+    """Shared-directory lease manager, or None when running as a single instance."""
+    global _LEASES
+    if not LEASES_ENABLED:
+        return None
+    with _LEASES_LOCK:
+        if _LEASES is None:
+            _LEASES = LeaseManager(LEASE_DIR, INSTANCE_ID or None, LEASE_TTL_SEC, LEASE_HEARTBEAT_SEC)
+            logger.info(f"Archive leases enabled in {LEASE_DIR} as instance {_LEASES.instance_id}")
+        return _LEASES
+
+# Extraction workers. Always present (one worker by default) so the stability
+# monitor thread only ever hands off and never extracts itself. Work is picked
+# by priority class (webhook > ui > watchdog > scan), folder fairness and age.
+_SCHEDULER = ExtractionScheduler(
+    max(1, MAX_CONCURRENT_EXTRACTS),
+    smallest_first=SCHEDULER_SMALLEST_FIRST,
+    aging_sec=SCHEDULER_AGING_SEC,
+    fairness=SCHEDULER_FAIRNESS,
+)
+
+
+_ACTIVE_LOCK = threading.Lock()
+_ACTIVE_WORKERS = [0]
+
+# Priority class of paths waiting in the stability monitor (the best one wins)
+_PENDING_PRIORITY = {}
+
+
+def _fairness_group(path: str) -> str:
+    """Top-level folder under DOWNLOAD_DIR, so one huge release folder can't hog the workers."""
+    try:
+        rel = os.path.relpath(path, DOWNLOAD_DIR)
+    except ValueError:
+        return os.path.dirname(path)
+    if rel.startswith(os.pardir):
+        return os.path.dirname(path)
+    parts = rel.split(os.sep)
+    return parts[0] if len(parts) > 1 else ''
+
+
+def _archive_size(path: str):
+    try:
+        return sum(os.path.getsize(v) for v in find_volume_set(path))
+    except OSError:
+        return None
+
+
+def _submit_to_executor(fn, path: str, *args, priority: str = 'watchdog'):
+    """Queue fn(path, *args) on the scheduler under the given priority class."""
+    size = _archive_size(path) if SCHEDULER_SMALLEST_FIRST else None
+    return _SCHEDULER.submit(fn, path, *args, priority=priority, group=_fairness_group(path), size=size)
+
+
+def _process_tracked(path: str, source: str = 'watchdog'):
+    with _ACTIVE_LOCK:
+        _ACTIVE_WORKERS[0] += 1
+    # Remembered so a deferral for disk space requeues under the same priority class
+    _EXTRACT_STATS.source = source
+    try:
+        return process_file(path)
+    finally:
+        _EXTRACT_STATS.source = None
+        with _ACTIVE_LOCK:
+            _ACTIVE_WORKERS[0] -= 1
+
+
+# Webhook/UI jobs parked in the stability monitor until their file settles
+_WAITING_JOBS = {}
+
+
+def _dispatch_process(path: str):
+    with _ACTIVE_LOCK:
+        priority = _PENDING_PRIORITY.pop(path, 'watchdog')
+        jobs = _WAITING_JOBS.pop(path, ())
+    if jobs:
+        # The job covers any watchdog/scan request for the same path
+        for job in jobs:
+            _JOBS.release(job)
+        return
+    _submit_to_executor(_process_tracked, path, priority, priority=priority)
+
+
+def _drop_vanished(path: str):
+    with _ACTIVE_LOCK:
+        _PENDING_PRIORITY.pop(path, None)
+        jobs = _WAITING_JOBS.pop(path, ())
+    for job in jobs:
+        _JOBS.drop(job, {'status': 'skipped', 'reason': 'file disappeared'})
+
+
+# Candidate archives wait here (polled from one thread) until their size settles
+_STABILITY = StabilityMonitor(
+    _dispatch_process,
+    window_sec=max(1, STABILITY_WINDOW_SEC),
+    polls=max(1, STABILITY_POLLS),
+    max_wait_sec=max(5, MAX_WAIT_PER_ARCHIVE_SEC),
+    probe=volume_set_probe,
+    on_wait=metrics.STABILITY_WAIT_SECONDS.observe,
+    on_vanish=_drop_vanished,
+)
+
+
+def _submit_process(path: str, source: str = 'watchdog'):
+    """Queue a path for extraction once it is stable; cheap checks happen up front.
+
+    `source` is the scheduler priority class the extraction runs under.
+    """
+    if is_temp_directory(path):
+        logger.debug(f"Ignoring temp path: {path}")
+        return
+    if is_volume_file(path):
+        # Any volume of a multi-part RAR set (including .rNN) re-arms the whole set
+        first = first_volume(path)
+        if first is None:
+            logger.debug(f"First volume not present yet for: {path}")
             return
-        except Exception as e:
-            last_err = e
-            wait = 2 ** attempt
-            logger.warning(f"Radarr notify failed (attempt {attempt+1}/3): {e}; retrying in {wait}s")
-            time.sleep(wait)
-    logger.error(f"Failed to notify Radarr after retries: {last_err}")
-
-_PROCESS_LOCKS = {}
-
-# Global executor for concurrency (optional)
-_EXECUTOR = None
-try:
-    if MAX_CONCURRENT_EXTRACTS and MAX_CONCURRENT_EXTRACTS > 1:
-        _EXECUTOR = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_EXTRACTS, thread_name_prefix="extractor")
-except Exception:
-    _EXECUTOR = None
-
-
-def _submit_process(path: str):
-    if _EXECUTOR is None:
-        process_file(path)
+        path = first
+    elif not is_compressed_file(path):
+        logger.debug(f"Ignoring non-archive path: {path}")
+        return
+    if is_file_extracted(path):
+        logger.debug(f"File already processed, not queueing: {path}")
+        metrics.ARCHIVES_SKIPPED_TRACKED.inc()
+        return
+    with _ACTIVE_LOCK:
+        current = _PENDING_PRIORITY.get(path)
+        if current is None or PRIORITY_CLASSES.get(source, 99) < PRIORITY_CLASSES.get(current, 99):
+            _PENDING_PRIORITY[path] = source
+    _STABILITY.watch(path)
+
+
+# Watchdog events are coalesced per path and only queued once the path goes quiet
+_DEBOUNCER = EventDebouncer(_submit_process, EVENT_DEBOUNCE_SEC)
+
+
+def get_event_stats() -> dict:
+    """Return debounce and stability-monitor counters."""
+    return {'debounce': _DEBOUNCER.stats(), 'stability': _STABILITY.stats()}
+
+
+def get_in_flight() -> list:
+    """Archives being processed right now (path, thread, since, seconds, waiters)."""
+    return _IN_FLIGHT.snapshot()
+
+
+# Jobs whose archive is waiting for disk space; they are requeued as themselves
+# so /jobs/<id> follows the archive to its final state
+_DEFERRED_JOBS = {}
+
+
+def _resubmit_deferred(path: str, source: str) -> None:
+    with _ACTIVE_LOCK:
+        job = _DEFERRED_JOBS.pop(path, None)
+    if job is not None:
+        _JOBS.requeue(job)
     else:
-        _EXECUTOR.submit(process_file, path)
+        _submit_process(path, source)
 
 
-def _get_lock(path: str) -> threading.Lock:
-    key = os.path.realpath(path)
-    lock = _PROCESS_LOCKS.get(key)
-    if lock is None:
-        lock = threading.Lock()
-        _PROCESS_LOCKS[key] = lock
-    return lock
+# Free-space admission for extraction output; deferred archives are requeued once they fit
+_DISK = DiskSpacePlanner(DISK_RESERVE_MB * _MIB, DISK_RECHECK_SEC, resubmit=_resubmit_deferred)
 
 
-def _wait_for_file_stable(path: str, interval: float = 2.0, timeout: float = 60.0) -> bool:
-    """Wait until file size is unchanged for configured stability window or timeout."""
-    deadline = time.time() + max(5, MAX_WAIT_PER_ARCHIVE_SEC)
-    last = None
-    stable_count = 0
-    while time.time() < deadline:
-        try:
-            size = os.path.getsize(path)
-        except Exception:
-            return False
-        if last is not None and size == last:
-            stable_count += 1
-            if stable_count >= max(1, STABILITY_POLLS):
-                return True
-        else:
-            stable_count = 0
-        last = size
-        time.sleep(max(1, STABILITY_WINDOW_SEC))
-    return False
+def _planned_size(archive_path: str):
+    """(bytes the extraction will write, exact?).
+
+    Formats with a member directory (zip, rar, 7z, plain tar) are planned from
+    their headers. Compressed tarballs would have to be decompressed once just
+    to be listed, so unless the browse UI already indexed them they are
+    estimated at DISK_COMPRESSED_RATIO times their size.
+    """
+    fmt = _archive_format(archive_path)
+    if fmt in _TAR_MODES and fmt != 'tar':
+        summary = get_archive_index(archive_path, load=False) or {}
+        if 'extract_size' in summary:
+            return summary['extract_size'], True
+        return int((_archive_size(archive_path) or 0) * DISK_COMPRESSED_RATIO), False
+    summary = get_archive_index(archive_path) or {}
+    if 'extract_size' in summary:
+        return summary['extract_size'], True
+    return _archive_size(archive_path) or 0, True
+
+
+def _reserve_space(file_path: str):
+    """(reservation, result); result is a deferred/failed result dict when it does not fit."""
+    dest = _compute_extract_dir(file_path)
+    needed, exact = _planned_size(file_path)
+    try:
+        capacity = _DISK.capacity(dest)
+    except OSError:
+        capacity = None
+    if not exact and capacity is not None:
+        # An estimate alone never fails an archive; at worst it waits for an empty disk
+        needed = min(needed, max(0, capacity))
+    reservation, available = _DISK.reserve(file_path, dest, needed)
+    if reservation is not None:
+        return reservation, None
+    if capacity is not None and needed > capacity:
+        logger.error(f"{file_path} needs {needed >> 20} MiB but {dest} can hold at most {capacity >> 20} MiB")
+        return None, {'status': 'failed', 'error': f'needs {needed >> 20} MiB, more than {dest} can hold'}
+    logger.warning(f"Not enough free space for {file_path}: needs {needed >> 20} MiB, "
+                   f"{max(0, available) >> 20} MiB available on {dest}; deferring")
+    _DISK.defer(file_path, dest, needed, getattr(_EXTRACT_STATS, 'source', None) or 'watchdog')
+    job = getattr(_EXTRACT_STATS, 'job', None)
+    if job is not None:
+        with _ACTIVE_LOCK:
+            _DEFERRED_JOBS[file_path] = job
+    metrics.ARCHIVES_DEFERRED.inc()
+    return None, {'status': 'deferred', 'reason': f'waiting for {needed >> 20} MiB of free space'}
 
 
-def process_file(file_path: str) -> None:
-    """Process a downloaded file if it's compressed with locking and stability check."""
+def get_disk_stats() -> dict:
+    stats = _DISK.stats()
+    stats['deferred'] = _DISK.deferred()
+    return stats
+
+
+def get_lease_stats() -> dict:
+    leases = _get_leases()
+    return leases.stats() if leases is not None else {}
+
+
+def process_file(file_path: str) -> dict:
+    """Process a downloaded file if it's compressed, with per-path locking.
+
+    Stability is established before this runs (see _submit_process), so worker
+    threads only spend time on actual extraction. Returns a small result dict
+    with a 'status' of extracted, skipped, busy, deferred (not enough disk
+    space yet) or failed.
+    """
     if is_file_extracted(file_path):
         logger.info(f"File already processed, skipping: {file_path}")
-        return
+        metrics.ARCHIVES_SKIPPED_TRACKED.inc()
+        return {'status': 'skipped', 'reason': 'already extracted'}
 
     if is_temp_directory(file_path):
         logger.debug(f"Skipping file in temp directory: {file_path}")
-        return
+        return {'status': 'skipped', 'reason': 'temp directory'}
 
     if not is_compressed_file(file_path):
         logger.info(f"File is not compressed, skipping: {file_path}")
-        return
+        return {'status': 'skipped', 'reason': 'not an archive'}
 
-    lock = _get_lock(file_path)
-    if not lock.acquire(blocking=False):
+    if not is_first_volume(file_path):
+        logger.info(f"Skipping non-first volume of multi-part set: {file_path}")
+        return {'status': 'skipped', 'reason': 'non-first volume'}
+
+    key = os.path.realpath(file_path)
+    if not _IN_FLIGHT.acquire(key, archive=file_path):
         logger.info(f"Extraction already in progress for: {file_path}")
-        return
+        return {'status': 'busy', 'reason': 'extraction already in progress'}
+    leases = _get_leases()
+    if leases is not None and not leases.claim(key):
+        _IN_FLIGHT.release(key)
+        owner = leases.owner(key) or 'another instance'
+        logger.info(f"Extraction of {file_path} is claimed by {owner}")
+        return {'status': 'busy', 'reason': f'claimed by {owner}'}
+    reservation = None
+    if leases is not None:
+        # Writes stop as soon as the heartbeat reports the lease lost
+        _EXTRACT_STATS.lease = (leases, key)
     try:
-        logger.info(f"Checking file for extraction: {file_path}")
-        if not _wait_for_file_stable(file_path):
-            logger.warning(f"File did not become stable in time: {file_path}")
+        if leases is not None and is_file_extracted(file_path):
+            # Another instance finished it between our first check and the claim
+            logger.info(f"File already processed, skipping: {file_path}")
+            return {'status': 'skipped', 'reason': 'already extracted'}
         logger.info(f"Starting extraction: {file_path}")
+        try:
+            st = os.stat(file_path)
+            details = {'size': st.st_size, 'mtime': st.st_mtime}
+        except OSError:
+            st, details = None, {}
+        if FINGERPRINT_DEDUP and st is not None:
+            try:
+                details['fingerprint'] = compute_fingerprint(file_path, st)
+            except OSError as e:
+                logger.warning(f"Could not fingerprint {file_path}: {e}")
+            original = find_by_fingerprint(details.get('fingerprint'))
+            if original is not None and original != file_path:
+                logger.info(f"Skipping {file_path}: same content as already extracted {original}")
+                record_extracted_file(file_path, **details)
+                metrics.ARCHIVES_SKIPPED_DUPLICATE.inc()
+                return {'status': 'skipped', 'reason': f'duplicate of {original}'}
+        if DISK_SPACE_CHECK:
+            reservation, result = _reserve_space(file_path)
+            if result is not None:
+                return result
+            _EXTRACT_STATS.reservation = reservation
         extracted_path = extract_archive(file_path)
+        if leases is not None and leases.is_lost(key):
+            # A process-pool worker cannot see the lease; leave the archive to its new owner
+            raise LeaseLost(f"Lease on {key} was lost")
         logger.info(f"Successfully extracted to: {extracted_path}")
-        record_extracted_file(file_path)
+        stats = get_last_extract_stats()
+        if stats.get('archive') == file_path:
+            details.update(duration=stats['duration'], bytes_written=stats['bytes_written'])
+        details['destination'] = extracted_path
+        record_extracted_file(file_path, **details)
+        # Record the remaining volumes so their events and scans are skipped cheaply
+        for volume in find_volume_set(file_path)[1:]:
+            record_extracted_file(volume, destination=extracted_path)
         notify_radarr(extracted_path)
+        return {'status': 'extracted', 'destination': extracted_path,
+                'bytes_written': details.get('bytes_written')}
+    except LeaseLost:
+        owner = leases.owner(key) or 'another instance'
+        logger.warning(f"Stopped extracting {file_path}: lease lost to {owner}")
+        return {'status': 'busy', 'reason': f'lease lost to {owner}'}
     except Exception as e:
         logger.error(f"Failed to process file {file_path}: {str(e)}")
+        metrics.ARCHIVES_FAILED.inc()
+        return {'status': 'failed', 'error': str(e)}
     finally:
-        try:
-            lock.release()
-        except Exception:
-            pass
+        if reservation is not None:
+            _EXTRACT_STATS.reservation = None
+            _DISK.release(reservation)
+        if leases is not None:
+            _EXTRACT_STATS.lease = None
+            leases.release(key)
+        _IN_FLIGHT.release(key)
 
-def scan_directory(directory):
-    """Recursively scan directory for compressed files with optional concurrency."""
-    logger.info(f"Scanning directory: {directory}")
-    tasks = []
+
+def _process_for_job(job: Job) -> dict:
+    _EXTRACT_STATS.on_bytes = job.add_bytes
+    _EXTRACT_STATS.job = job
     try:
-        for root, dirs, files in os.walk(directory):
-            if is_temp_directory(root):
-                logger.debug(f"Skipping temp directory: {root}")
-                dirs[:] = []  # Clear the dirs list to prevent recursion
-                continue
-                
+        return _process_tracked(job.path, job.source)
+    finally:
+        _EXTRACT_STATS.on_bytes = None
+        _EXTRACT_STATS.job = None
+
+
+def _job_task(path: str, job: Job) -> dict:
+    return _process_for_job(job)
+
+
+def _run_job(job: Job) -> dict:
+    """Run a queued job on the shared extractor pool (at its source's priority) and wait."""
+    return _submit_to_executor(_job_task, job.path, job, priority=job.source).result()
+
+
+# Requested extractions (webhook, UI). One job worker per extractor slot keeps
+# at most MAX_CONCURRENT_EXTRACTS jobs on the executor at a time.
+JOB_PRIORITIES = {'webhook': 0, 'ui': 1}
+_JOBS = JobQueue(_run_job, workers=max(1, MAX_CONCURRENT_EXTRACTS), capacity=JOB_QUEUE_MAX)
+
+
+def _hold_for_stability(job: Job) -> None:
+    """Park a 'waiting' job until the stability monitor promotes (or drops) its path."""
+    with _ACTIVE_LOCK:
+        _WAITING_JOBS.setdefault(job.path, []).append(job)
+    _STABILITY.watch(job.path)
+
+
+def submit_job(path: str, source: str) -> Job:
+    """Queue an extraction job; raises QueueFull when the queue is at capacity.
+
+    Archives wait in the 'waiting' state until their size settles, without
+    holding a job worker; the stability callback then queues them.
+    """
+    hold = is_compressed_file(path)
+    job = _JOBS.submit(path, source, JOB_PRIORITIES.get(source, len(JOB_PRIORITIES)), hold=hold)
+    if hold:
+        _hold_for_stability(job)
+    return job
+
+
+def get_job(job_id: str):
+    return _JOBS.get(job_id)
+
+
+def list_jobs(limit: int = 50):
+    return _JOBS.list(limit)
+
+
+def get_job_stats() -> dict:
+    return _JOBS.stats()
+
+
+_DIRSTATE = DirStateCache(DIRSTATE_FILE)
+_WALKER = TreeWalker(SCAN_WORKERS)
+
+
+def _skip_scan_dir(path: str) -> bool:
+    if is_temp_directory(path):
+        logger.debug(f"Skipping temp directory: {path}")
+        return True
+    return False
+
+
+def scan_directory(directory, force: bool = False) -> dict:
+    """Recursively scan directory and queue compressed files for extraction.
+
+    Directories are walked in parallel (SCAN_WORKERS) and each archive is
+    queued as soon as it is found. Directories whose stat signature matches
+    the persisted dirstate cache are not listed again; their subdirectories
+    and archives come from the cache. `force` (or SCAN_USE_DIRSTATE=false)
+    lists every directory.
+    """
+    logger.info(f"Scanning directory: {directory}")
+    use_cache = SCAN_USE_DIRSTATE and not force
+    summary = {'dirs': 0, 'listed': 0, 'cached': 0, 'archives': 0, 'errors': 0}
+    seen = set()
+    lock = threading.Lock()
+
+    def visit(root):
+        try:
+            st = os.stat(root)
+        except OSError as e:
+            logger.warning(f"Cannot stat directory {root}: {e}")
+            with lock:
+                summary['errors'] += 1
+            return ()
+        entry = _DIRSTATE.lookup(root, st) if use_cache else None
+        if entry is not None:
+            subdirs, archives = entry['subdirs'], entry['archives']
+        else:
             logger.info(f"Checking subfolder: {root}")
-            for file in files:
-                full_path = os.path.join(root, file)
-                if is_compressed_file(full_path):
-                    logger.info(f"Found compressed file: {full_path}")
-                    if _EXECUTOR is None:
-                        process_file(full_path)
-                    else:
-                        tasks.append(_EXECUTOR.submit(process_file, full_path))
-        if tasks:
-            for _ in as_completed(tasks):
-                pass
+            subdirs, archives, count = [], [], 0
+            try:
+                with os.scandir(root) as it:
+                    for e in it:
+                        count += 1
+                        # d_type from readdir; no extra stat on filesystems that report it
+                        if e.is_dir(follow_symlinks=False):
+                            subdirs.append(e.name)
+                        elif is_compressed_file(e.name) and is_first_volume(e.name):
+                            archives.append(e.name)
+            except OSError as e:
+                logger.warning(f"Cannot list directory {root}: {e}")
+                with lock:
+                    summary['errors'] += 1
+                return ()
+            _DIRSTATE.store(root, st, count, subdirs, archives)
+        with lock:
+            seen.add(root)
+            summary['dirs'] += 1
+            summary['cached' if entry is not None else 'listed'] += 1
+            summary['archives'] += len(archives)
+        for name in archives:
+            full_path = os.path.join(root, name)
+            if entry is None:
+                logger.info(f"Found compressed file: {full_path}")
+            _submit_process(full_path, source='scan')
+        return [os.path.join(root, d) for d in subdirs]
+
+    try:
+        walk_stats = _WALKER.walk(directory, visit, prune=_skip_scan_dir)
+        summary['errors'] += walk_stats['errors']
+        summary['stolen'] = walk_stats['stolen']
+        if summary['errors'] == 0:
+            _DIRSTATE.prune(directory, seen)
+        _DIRSTATE.save()
     except Exception as e:
         logger.error(f"Error scanning directory {directory}: {e}")
+    logger.info(f"Scan of {directory} finished: {summary['dirs']} dirs "
+                f"({summary['listed']} listed, {summary['cached']} unchanged), {summary['archives']} archives")
+    return summary
+
+
+def _queued_tasks() -> int:
+    return _SCHEDULER.queued()
+
+
+def _active_workers() -> int:
+    with _ACTIVE_LOCK:
+        return _ACTIVE_WORKERS[0]
+
+
+# Queue depths and in-flight work, read from the live structures at scrape time
+metrics.Gauge('radarr_extractor_executor_queue_depth',
+              'Extraction tasks waiting for an executor thread.', fn=_queued_tasks)
+metrics.Gauge('radarr_extractor_extractions_in_progress',
+              'Executor threads currently processing an archive.', fn=_active_workers)
+metrics.Gauge('radarr_extractor_locks_in_flight',
+              'Per-archive locks currently held.', fn=lambda: _IN_FLIGHT.stats()['in_flight'])
+metrics.Gauge('radarr_extractor_debounce_queue_depth',
+              'Paths waiting for their filesystem events to go quiet.',
+              fn=lambda: _DEBOUNCER.stats()['queue_depth'])
+metrics.Gauge('radarr_extractor_stability_pending',
+              'Paths waiting for their size to settle.', fn=lambda: _STABILITY.stats()['pending'])
+metrics.Gauge('radarr_extractor_job_queue_depth',
+              'Webhook/UI jobs waiting to run.', fn=lambda: _JOBS.stats()['queued'])
+metrics.Gauge('radarr_extractor_process_pool_busy',
+              'Extraction worker processes currently busy.', fn=lambda: _PROCESS_POOL.stats()['busy'])
+metrics.Gauge('radarr_extractor_notify_queue_depth',
+              'Radarr rescans waiting to be sent.', fn=lambda: get_notify_stats().get('queue_depth', 0))
+metrics.Gauge('radarr_extractor_write_bytes_per_second',
+              'Extraction write throughput over the last few seconds.',
+              fn=lambda: _THROTTLE.stats()['bytes_per_second'])
+metrics.Counter('radarr_extractor_write_throttled_seconds_total',
+                'Time extraction workers slept to stay under the I/O limits.',
+                fn=lambda: _THROTTLE.stats()['slept_seconds'])
+metrics.Gauge('radarr_extractor_disk_deferred',
+              'Archives waiting for free space on their destination.', fn=lambda: _DISK.stats()['waiting'])
+metrics.Gauge('radarr_extractor_sevenzip_memory_reserved_bytes',
+              'Estimated decoder memory reserved by running 7z extractions.',
+              fn=lambda: _SEVENZIP_MEMORY.stats()['used'])
+metrics.Counter('radarr_extractor_notify_retries_total',
+                'Radarr rescan attempts that failed and were retried.',
+                fn=lambda: get_notify_stats().get('retries', 0))
+metrics.Counter('radarr_extractor_notify_failed_total',
+                'Radarr rescans dropped after exhausting retries.',
+                fn=lambda: get_notify_stats().get('failed', 0))
+
 
 class DownloadHandler(FileSystemEventHandler):
+    def on_any_event(self, event):
+        # Any change to a directory's entries makes its cached listing stale
+        _LISTINGS.invalidate(os.path.dirname(event.src_path))
+        dest = getattr(event, 'dest_path', '')
+        if dest:
+            _LISTINGS.invalidate(os.path.dirname(dest))
+
     def on_created(self, event):
         if not event.is_directory and not is_temp_directory(event.src_path) and not event.src_path.endswith('.DS_Store'):
-            logger.info(f"File system event - New file detected: {event.src_path}")
-            _submit_process(event.src_path)
+            logger.debug(f"File system event - New file detected: {event.src_path}")
+            _DEBOUNCER.touch(event.src_path)
 
     def on_modified(self, event):
         if not event.is_directory and not is_temp_directory(event.src_path) and not event.src_path.endswith('.DS_Store'):
-            logger.info(f"File system event - File modified: {event.src_path}")
-            _submit_process(event.src_path)
+            logger.debug(f"File system event - File modified: {event.src_path}")
+            _DEBOUNCER.touch(event.src_path)
+
+    def on_moved(self, event):
+        # Finished files are often renamed into place (download clients, our own .partial files)
+        if not event.is_directory and not is_temp_directory(event.dest_path) and not event.dest_path.endswith('.DS_Store'):
+            logger.debug(f"File system event - File moved into place: {event.dest_path}")
+            _DEBOUNCER.touch(event.dest_path)
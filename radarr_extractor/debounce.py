@@ -0,0 +1,94 @@
+import heapq
+import threading
+import time
+from radarr_extractor.config import logger
+
+
+class EventDebouncer:
+    """Coalesce bursts of filesystem events per path.
+
+    Every touch() re-arms the path's quiet timer; the callback runs once per
+    path after no new events arrived for `quiet_sec`. A single daemon thread
+    services all paths from a heap holding one entry per pending path.
+    """
+
+    def __init__(self, callback, quiet_sec: float):
+        self._callback = callback
+        self.quiet_sec = max(0.0, float(quiet_sec))
+        self._cond = threading.Condition()
+        self._deadlines = {}
+        self._heap = []
+        self._thread = None
+        self._stopped = False
+        self._stats = {'events': 0, 'coalesced': 0, 'dispatched': 0, 'errors': 0}
+
+    def touch(self, path: str) -> None:
+        with self._cond:
+            self._stats['events'] += 1
+            deadline = time.monotonic() + self.quiet_sec
+            if path in self._deadlines:
+                # Heap entry already exists; the worker re-queues it with the new deadline
+                self._stats['coalesced'] += 1
+                self._deadlines[path] = deadline
+                return
+            self._deadlines[path] = deadline
+            heapq.heappush(self._heap, (deadline, path))
+            if self._thread is None:
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name="event-debouncer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _next_due(self):
+        """Block until a path has been quiet long enough; None once stopped."""
+        with self._cond:
+            while not self._stopped:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                deadline, path = self._heap[0]
+                now = time.monotonic()
+                if deadline > now:
+                    self._cond.wait(deadline - now)
+                    continue
+                heapq.heappop(self._heap)
+                current = self._deadlines.get(path)
+                if current is None:
+                    continue
+                if current > deadline:
+                    heapq.heappush(self._heap, (current, path))
+                    continue
+                del self._deadlines[path]
+                self._stats['dispatched'] += 1
+                return path
+            return None
+
+    def _run(self) -> None:
+        while True:
+            path = self._next_due()
+            if path is None:
+                return
+            try:
+                self._callback(path)
+            except Exception as e:
+                with self._cond:
+                    self._stats['errors'] += 1
+                logger.error(f"Debounced dispatch failed for {path}: {e}")
+
+    def pending(self):
+        with self._cond:
+            return sorted(self._deadlines)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats['queue_depth'] = len(self._deadlines)
+            return stats
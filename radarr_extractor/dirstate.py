@@ -0,0 +1,92 @@
+import json
+import os
+import threading
+from radarr_extractor.config import logger
+
+
+class DirStateCache:
+    """Persisted per-directory scan state.
+
+    For every scanned directory we keep its stat signature (mtime_ns, size,
+    inode), the entry count, its subdirectory names and the archives found in
+    it. A directory whose signature is unchanged does not need another readdir:
+    its subdirectories and archives are taken from the cache. Directory mtimes
+    only reflect direct children, so each directory is still stat()ed, but
+    unchanged ones cost one stat instead of a listing plus per-file checks.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirs = None
+        self._dirty = False
+
+    def _load(self) -> None:
+        if self._dirs is not None:
+            return
+        self._dirs = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self._dirs = data.get('dirs', {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable dirstate cache {self.path}: {e}")
+
+    @staticmethod
+    def signature(st) -> list:
+        return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+    def lookup(self, directory: str, st):
+        """Return the cached entry if the directory is unchanged, else None."""
+        with self._lock:
+            self._load()
+            entry = self._dirs.get(directory)
+            if entry is not None and entry['sig'] == self.signature(st):
+                return entry
+            return None
+
+    def store(self, directory: str, st, entries: int, subdirs, archives) -> None:
+        with self._lock:
+            self._load()
+            self._dirs[directory] = {
+                'sig': self.signature(st),
+                'entries': entries,
+                'subdirs': sorted(subdirs),
+                'archives': sorted(archives),
+            }
+            self._dirty = True
+
+    def prune(self, root: str, seen) -> int:
+        """Forget directories under root that were not visited by the last walk."""
+        prefix = root.rstrip(os.sep) + os.sep
+        with self._lock:
+            self._load()
+            stale = [d for d in self._dirs if (d == root or d.startswith(prefix)) and d not in seen]
+            for d in stale:
+                del self._dirs[d]
+            if stale:
+                self._dirty = True
+            return len(stale)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = f"{self.path}.tmp"
+            try:
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump({'version': self.VERSION, 'dirs': self._dirs}, f, separators=(',', ':'))
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except Exception as e:
+                logger.warning(f"Cannot save dirstate cache {self.path}: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._dirs)
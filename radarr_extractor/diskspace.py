@@ -0,0 +1,149 @@
+import os
+import threading
+import time
+from radarr_extractor.config import logger
+
+
+class Reservation:
+    """Space promised to one running extraction; `written` grows as it writes."""
+
+    __slots__ = ('key', 'device', 'amount', 'written')
+
+    def __init__(self, key: str, device, amount: int):
+        self.key = key
+        self.device = device
+        self.amount = amount
+        self.written = 0
+
+    def outstanding(self) -> int:
+        return max(0, self.amount - self.written)
+
+
+class DiskSpacePlanner:
+    """Admission control for extraction output against free disk space.
+
+    Before an extraction starts it reserves its planned output size on the
+    destination filesystem. It is admitted only if statvfs free space, minus
+    what running extractions on the same device still have to write, minus
+    `reserve_bytes`, covers it. Archives that do not fit are deferred with the
+    source (priority class) they were queued under and handed back to
+    `resubmit(key, source)` once a recheck (every `recheck_sec`, or when an
+    extraction finishes) finds room for them.
+    """
+
+    def __init__(self, reserve_bytes: int, recheck_sec: float = 60.0, resubmit=None, statvfs=os.statvfs):
+        self.reserve_bytes = max(0, int(reserve_bytes))
+        self.recheck_sec = max(1.0, float(recheck_sec))
+        self._resubmit = resubmit
+        self._statvfs = statvfs
+        self._cond = threading.Condition()
+        self._active = []
+        self._deferred = {}  # key -> (dest, amount, deferred_at, source)
+        self._thread = None
+        self._stats = {'admitted': 0, 'deferred': 0, 'resubmitted': 0, 'unknown': 0}
+
+    def free_bytes(self, path: str) -> int:
+        st = self._statvfs(path)
+        return st.f_bavail * st.f_frsize
+
+    def capacity(self, path: str) -> int:
+        """Largest output the filesystem could ever take (its size minus the reserve)."""
+        st = self._statvfs(path)
+        return st.f_blocks * st.f_frsize - self.reserve_bytes
+
+    def _available(self, device, path: str) -> int:
+        outstanding = sum(r.outstanding() for r in self._active if r.device == device)
+        return self.free_bytes(path) - outstanding - self.reserve_bytes
+
+    def reserve(self, key: str, dest: str, amount: int):
+        """(Reservation, available bytes); the reservation is None if amount does not fit."""
+        amount = max(0, int(amount))
+        with self._cond:
+            try:
+                device = os.stat(dest).st_dev
+                available = self._available(device, dest)
+            except OSError as e:
+                # Can't tell; let the extraction run rather than block it forever
+                logger.debug(f"Cannot check free space on {dest}: {e}")
+                self._stats['unknown'] += 1
+                device, available = None, None
+            if available is not None and amount > available:
+                return None, available
+            reservation = Reservation(key, device, amount)
+            self._active.append(reservation)
+            self._deferred.pop(key, None)
+            self._stats['admitted'] += 1
+            return reservation, available
+
+    def release(self, reservation: Reservation) -> None:
+        with self._cond:
+            if reservation in self._active:
+                self._active.remove(reservation)
+            if self._deferred:
+                self._cond.notify_all()
+
+    def defer(self, key: str, dest: str, amount: int, source: str = 'watchdog') -> None:
+        with self._cond:
+            if key not in self._deferred:
+                self._stats['deferred'] += 1
+            self._deferred[key] = (dest, amount, time.time(), source)
+            if self._resubmit is not None and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name="disk-space-recheck", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait(self.recheck_sec)
+                if not self._deferred:
+                    continue
+            for key, source in self._recheck():
+                try:
+                    self._resubmit(key, source)
+                except Exception as e:
+                    logger.error(f"Failed to requeue deferred archive {key}: {e}")
+
+    def recheck(self) -> list:
+        """Remove and return deferred keys that now fit, oldest first.
+
+        Space handed to earlier keys in the same pass is counted, so a burst of
+        freed space does not release more archives than it can hold.
+        """
+        return [key for key, _ in self._recheck()]
+
+    def _recheck(self) -> list:
+        """recheck() as (key, source) pairs."""
+        ready = []
+        with self._cond:
+            promised = {}
+            for key, (dest, amount, _, source) in sorted(self._deferred.items(), key=lambda item: item[1][2]):
+                try:
+                    device = os.stat(dest).st_dev
+                    available = self._available(device, dest) - promised.get(device, 0)
+                except OSError:
+                    continue
+                if amount <= available:
+                    promised[device] = promised.get(device, 0) + amount
+                    ready.append((key, source))
+            for key, _ in ready:
+                del self._deferred[key]
+            self._stats['resubmitted'] += len(ready)
+        for key, _ in ready:
+            logger.info(f"Enough free space now, requeueing deferred archive: {key}")
+        return ready
+
+    def deferred(self) -> list:
+        now = time.time()
+        with self._cond:
+            return [{'path': key, 'destination': dest, 'needed': amount, 'source': source,
+                     'seconds': round(now - since, 3)}
+                    for key, (dest, amount, since, source) in self._deferred.items()]
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats['running'] = len(self._active)
+            stats['reserved'] = sum(r.outstanding() for r in self._active)
+            stats['waiting'] = len(self._deferred)
+            stats['reserve_bytes'] = self.reserve_bytes
+            return stats
@@ -0,0 +1,108 @@
+import errno
+import os
+import time
+import zlib
+
+# Errors meaning "this kernel/filesystem can't do it", not "the copy failed"
+_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+
+def preallocate(fd: int, size) -> bool:
+    """Reserve `size` bytes for a file about to be written; False if not supported."""
+    if not size or not hasattr(os, 'posix_fallocate'):
+        return False
+    try:
+        os.posix_fallocate(fd, 0, size)
+        return True
+    except OSError:
+        return False
+
+
+def _pread_write(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    data = os.pread(src_fd, count, offset)
+    view = memoryview(data)
+    while view:
+        view = view[os.write(dst_fd, view):]
+    return len(data)
+
+
+def copy_range(src_fd: int, dst_fd: int, offset: int, count: int, on_bytes=None,
+               buffer_size: int = 1024 * 1024, on_write=None, chunk_size: int = 1 << 30) -> None:
+    """Copy `count` bytes from src_fd at `offset` to dst_fd's current position.
+
+    Tries copy_file_range (in-kernel, reflink-capable), then sendfile, then a
+    pread/write loop; each later method picks up where the previous stopped.
+    In-kernel calls move at most `chunk_size` bytes, so on_bytes is called at
+    least that often. on_write(n, seconds) receives the duration of every copy call.
+    """
+    chunk = max(1, chunk_size)
+    methods = []
+    if hasattr(os, 'copy_file_range'):
+        methods.append(lambda pos, n: os.copy_file_range(src_fd, dst_fd, min(n, chunk), offset_src=pos))
+    if hasattr(os, 'sendfile'):
+        methods.append(lambda pos, n: os.sendfile(dst_fd, src_fd, pos, min(n, chunk)))
+    methods.append(lambda pos, n: _pread_write(src_fd, dst_fd, pos, min(n, buffer_size)))
+    done = 0
+    for i, method in enumerate(methods):
+        try:
+            while done < count:
+                started = time.monotonic()
+                n = method(offset + done, count - done)
+                if not n:
+                    break
+                if on_write is not None:
+                    on_write(n, time.monotonic() - started)
+                done += n
+                if on_bytes is not None:
+                    on_bytes(n)
+        except OSError as e:
+            if i == len(methods) - 1 or e.errno not in _UNSUPPORTED:
+                raise
+        if done >= count:
+            return
+    raise OSError(errno.EIO, f"Short copy: {done} of {count} bytes")
+
+
+def file_crc32(path: str, buffer_size: int = 1024 * 1024) -> int:
+    """CRC-32 of a whole file, read through one reused buffer."""
+    buf = bytearray(buffer_size)
+    view = memoryview(buf)
+    crc = 0
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                return crc
+            crc = zlib.crc32(view[:n], crc)
+
+
+def copy_stream(src, dst, buffer_size: int, on_bytes=None, on_write=None) -> int:
+    """Copy a decompressing stream into dst through one reused buffer.
+
+    on_write(n, seconds) receives the duration of every dst.write call.
+    """
+    buf = bytearray(buffer_size)
+    view = memoryview(buf)
+    readinto = getattr(src, 'readinto', None)
+    total = 0
+    while True:
+        if readinto is not None:
+            n = readinto(buf)
+            if not n:
+                break
+            data = view[:n]
+        else:
+            data = src.read(buffer_size)
+            if not data:
+                break
+            n = len(data)
+        if on_write is not None:
+            started = time.monotonic()
+            dst.write(data)
+            on_write(n, time.monotonic() - started)
+        else:
+            dst.write(data)
+        total += n
+        if on_bytes is not None:
+            on_bytes(n)
+    return total
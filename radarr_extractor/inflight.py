@@ -0,0 +1,117 @@
+import threading
+import time
+
+
+class _Entry:
+    __slots__ = ('lock', 'refs', 'held', 'since', 'thread', 'info')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.refs = 0
+        self.held = False
+        self.since = None
+        self.thread = None
+        self.info = {}
+
+
+class InFlightRegistry:
+    """Refcounted per-key locks for archives currently being processed.
+
+    Keys are spread over `stripes` independently locked maps, so threads
+    working on different paths rarely contend. An entry exists only while
+    someone holds or waits for it and is dropped on the last release; the
+    registry therefore never grows beyond the work actually in flight.
+    """
+
+    def __init__(self, stripes: int = 16):
+        self._stripes = [(threading.Lock(), {}) for _ in range(max(1, int(stripes)))]
+        self._stats_lock = threading.Lock()
+        self._stats = {'acquired': 0, 'contended': 0, 'released': 0}
+
+    def _stripe(self, key: str):
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def acquire(self, key: str, blocking: bool = False, timeout: float = -1, **info) -> bool:
+        """Take the lock for key; with blocking=False return False if it is in flight."""
+        guard, entries = self._stripe(key)
+        with guard:
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = _Entry()
+            entry.refs += 1
+        ok = entry.lock.acquire(False)
+        if not ok:
+            self._count('contended')
+            if blocking:
+                ok = entry.lock.acquire(True, timeout)
+        with guard:
+            if ok:
+                entry.held = True
+                entry.since = time.time()
+                entry.thread = threading.current_thread().name
+                entry.info = info
+            else:
+                self._unref(entries, key, entry)
+        if ok:
+            self._count('acquired')
+        return ok
+
+    def _unref(self, entries: dict, key: str, entry: _Entry) -> None:
+        entry.refs -= 1
+        if entry.refs == 0 and entries.get(key) is entry:
+            del entries[key]
+
+    def release(self, key: str) -> None:
+        guard, entries = self._stripe(key)
+        with guard:
+            entry = entries.get(key)
+            if entry is None or not entry.held:
+                raise RuntimeError(f"release of {key} which is not in flight")
+            entry.held = False
+            entry.since = entry.thread = None
+            entry.info = {}
+            entry.lock.release()
+            self._unref(entries, key, entry)
+        self._count('released')
+
+    def is_held(self, key: str) -> bool:
+        guard, entries = self._stripe(key)
+        with guard:
+            entry = entries.get(key)
+            return entry is not None and entry.held
+
+    def snapshot(self) -> list:
+        """In-flight keys with holder thread, start time and waiters, oldest first."""
+        now = time.time()
+        items = []
+        for guard, entries in self._stripes:
+            with guard:
+                for key, entry in entries.items():
+                    if entry.held:
+                        items.append(dict(entry.info, path=key, thread=entry.thread, since=entry.since,
+                                          seconds=round(now - entry.since, 3), waiters=entry.refs - 1))
+        return sorted(items, key=lambda item: item['since'])
+
+    def __len__(self) -> int:
+        total = 0
+        for guard, entries in self._stripes:
+            with guard:
+                total += len(entries)
+        return total
+
+    def stats(self) -> dict:
+        held = waiters = entries_total = 0
+        for guard, entries in self._stripes:
+            with guard:
+                entries_total += len(entries)
+                for entry in entries.values():
+                    held += entry.held
+                    waiters += entry.refs - (1 if entry.held else 0)
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats.update(in_flight=held, waiters=waiters, entries=entries_total)
+        return stats
@@ -0,0 +1,222 @@
+import heapq
+import itertools
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from radarr_extractor.config import logger
+
+
+class QueueFull(Exception):
+    """The job queue is at capacity; callers should back off and retry."""
+
+
+class Job:
+    """One requested extraction and its progress, as reported by /jobs/<id>."""
+
+    def __init__(self, path: str, source: str, priority: int):
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.source = source
+        self.priority = priority
+        self.state = 'queued'
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.requeued_at = None
+        self.requeues = 0
+        self.bytes_extracted = 0
+        self.destination = None
+        self.error = None
+        self._lock = threading.Lock()
+
+    def add_bytes(self, n: int) -> None:
+        with self._lock:
+            self.bytes_extracted += n
+
+    def set_state(self, state: str) -> None:
+        with self._lock:
+            self.state = state
+
+    def start(self) -> None:
+        with self._lock:
+            self.state = 'running'
+            self.started_at = time.time()
+
+    def finish(self, result: dict) -> None:
+        result = result or {}
+        with self._lock:
+            self.finished_at = time.time()
+            states = {'extracted': 'done', 'failed': 'failed', 'deferred': 'deferred'}
+            self.state = states.get(result.get('status'), 'skipped')
+            self.destination = result.get('destination', self.destination)
+            self.error = result.get('error') or result.get('reason')
+            if result.get('bytes_written') is not None:
+                self.bytes_extracted = result['bytes_written']
+
+    def mark_requeued(self) -> None:
+        """A deferred job's archive now fits; it runs again and finishes anew."""
+        with self._lock:
+            self.state = 'queued'
+            self.requeued_at = time.time()
+            self.requeues += 1
+            self.finished_at = None
+            self.error = None
+
+    def fail(self, error: str) -> None:
+        with self._lock:
+            self.finished_at = time.time()
+            self.state = 'failed'
+            self.error = error
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            now = time.time()
+            queued_until = self.started_at or self.finished_at or now
+            run_end = self.finished_at or now
+            return {
+                'id': self.id,
+                'path': self.path,
+                'source': self.source,
+                'priority': self.priority,
+                'state': self.state,
+                'bytes_extracted': self.bytes_extracted,
+                'destination': self.destination,
+                'error': self.error,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'requeued_at': self.requeued_at,
+                'requeues': self.requeues,
+                'queue_seconds': round(queued_until - self.created_at, 3),
+                'run_seconds': round(run_end - self.started_at, 3) if self.started_at else None,
+            }
+
+
+class JobQueue:
+    """Bounded priority queue of extraction jobs serviced by a few worker threads.
+
+    Lower priority values run first; equal priorities run in submission order.
+    submit(hold=True) parks a job in the 'waiting' state (e.g. until its file
+    stops growing) without occupying a worker; release() queues it and
+    drop() finishes it unrun. submit() raises QueueFull once `capacity` jobs
+    are queued or waiting. Finished jobs are kept (up to `history`) so their
+    status can still be queried.
+    """
+
+    def __init__(self, runner, workers: int, capacity: int, history: int = 500):
+        self._runner = runner
+        self.workers = max(1, int(workers))
+        self.capacity = max(1, int(capacity))
+        self.history = max(1, int(history))
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._jobs = OrderedDict()
+        self._threads = []
+        self._waiting = set()
+        self._requeue_after = set()
+        self._stats = {'submitted': 0, 'rejected': 0, 'completed': 0, 'failed': 0}
+
+    def submit(self, path: str, source: str, priority: int, hold: bool = False) -> Job:
+        with self._cond:
+            if len(self._heap) + len(self._waiting) >= self.capacity:
+                self._stats['rejected'] += 1
+                raise QueueFull(f"Job queue full ({self.capacity} waiting)")
+            job = Job(path, source, priority)
+            self._jobs[job.id] = job
+            self._trim_history()
+            self._stats['submitted'] += 1
+            if hold:
+                job.set_state('waiting')
+                self._waiting.add(job)
+            else:
+                self._push(job)
+            return job
+
+    def _push(self, job: Job) -> None:
+        heapq.heappush(self._heap, (job.priority, next(self._seq), job))
+        if not self._threads:
+            for i in range(self.workers):
+                t = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+        self._cond.notify()
+
+    def release(self, job: Job) -> None:
+        """Queue a job that was submitted with hold=True."""
+        with self._cond:
+            if job not in self._waiting:
+                return
+            self._waiting.discard(job)
+            job.set_state('queued')
+            self._push(job)
+
+    def requeue(self, job: Job) -> None:
+        """Run a finished (deferred) job again; it is not counted against capacity."""
+        with self._cond:
+            if job.state == 'running':
+                # Still reporting its deferral; _run requeues it once that is recorded
+                self._requeue_after.add(job)
+                return
+            job.mark_requeued()
+            self._jobs.setdefault(job.id, job)
+            self._push(job)
+
+    def drop(self, job: Job, result: dict) -> None:
+        """Finish a held job with `result` without running it."""
+        with self._cond:
+            if job not in self._waiting:
+                return
+            self._waiting.discard(job)
+        job.finish(result)
+        with self._cond:
+            self._stats['failed' if job.state == 'failed' else 'completed'] += 1
+
+    def _trim_history(self) -> None:
+        excess = len(self._jobs) - self.history
+        if excess <= 0:
+            return
+        for job_id in [j.id for j in self._jobs.values() if j.finished][:excess]:
+            del self._jobs[job_id]
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                _, _, job = heapq.heappop(self._heap)
+            job.start()
+            try:
+                job.finish(self._runner(job))
+            except Exception as e:
+                logger.error(f"Job {job.id} for {job.path} failed: {e}")
+                job.fail(str(e))
+            with self._cond:
+                self._stats['failed' if job.state == 'failed' else 'completed'] += 1
+                if job in self._requeue_after:
+                    self._requeue_after.discard(job)
+                    job.mark_requeued()
+                    self._push(job)
+
+    def get(self, job_id: str):
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def list(self, limit: int = 50):
+        with self._cond:
+            jobs = list(self._jobs.values())[-limit:]
+        return [j.to_dict() for j in reversed(jobs)]
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats['queued'] = len(self._heap)
+            stats['waiting'] = len(self._waiting)
+            stats['capacity'] = self.capacity
+            stats['running'] = sum(1 for j in self._jobs.values() if j.state == 'running')
+            return stats
@@ -0,0 +1,260 @@
+import errno
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from radarr_extractor.config import logger
+
+
+def default_instance_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class LeaseLost(Exception):
+    """The lease on an archive expired or was taken over while it was being extracted."""
+
+
+class LeaseManager:
+    """Exclusive per-archive leases shared by every instance through a directory.
+
+    A lease is a `<sha1(path)>.lease` file created with O_CREAT|O_EXCL, so only
+    one instance can create it. The holder refreshes its mtime every
+    `heartbeat_sec`; a lease whose mtime is more than `ttl_sec` old belongs to
+    a crashed instance and may be taken over, by atomically renaming a new
+    lease over it while holding a `.reclaim` guard file (itself O_EXCL). Ages
+    are measured against the filesystem's own clock (the mtime of this
+    instance's `.clock-<id>` file), so clock skew between hosts sharing an
+    NFS/SMB export does not matter. A holder that sees its lease replaced, or
+    cannot renew it for `ttl_sec`, marks it lost so the extraction can stop.
+    """
+
+    def __init__(self, directory: str, instance_id: str = None, ttl_sec: float = 60.0,
+                 heartbeat_sec: float = 15.0):
+        self.directory = directory
+        self.instance_id = instance_id or default_instance_id()
+        self.ttl_sec = max(1.0, float(ttl_sec))
+        self.heartbeat_sec = max(0.1, min(float(heartbeat_sec), self.ttl_sec / 2))
+        self._lock = threading.Lock()
+        self._held = {}  # key -> (lease path, token, acquired_at)
+        self._renewed = {}  # key -> monotonic time of the last successful claim/renewal
+        self._lost = set()
+        self._thread = None
+        self._stop = threading.Event()
+        self._stats = {'claimed': 0, 'busy': 0, 'reclaimed': 0, 'renewals': 0, 'lost': 0}
+        os.makedirs(directory, exist_ok=True)
+        self._prune_clocks()
+
+    def _lease_path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode('utf-8', errors='surrogateescape')).hexdigest()
+        return os.path.join(self.directory, f"{digest}.lease")
+
+    def _clock_path(self) -> str:
+        return os.path.join(self.directory, f".clock-{self.instance_id}")
+
+    def _fs_now(self) -> float:
+        # Through the open descriptor, so another instance pruning the file cannot break it
+        with open(self._clock_path(), 'a') as f:
+            os.utime(f.fileno() if os.utime in os.supports_fd else f.name, None)
+            return os.fstat(f.fileno()).st_mtime
+
+    def _prune_clocks(self) -> None:
+        """Remove clock files of other instances untouched for longer than the TTL.
+
+        A live instance simply recreates its clock file on its next claim.
+        """
+        try:
+            now = self._fs_now()
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.startswith('.clock-') or entry.path == self._clock_path():
+                        continue
+                    try:
+                        if now - entry.stat().st_mtime > self.ttl_sec:
+                            os.remove(entry.path)
+                    except OSError:
+                        pass
+        except OSError as e:
+            logger.debug(f"Cannot prune lease clocks in {self.directory}: {e}")
+
+    @staticmethod
+    def _read(path: str):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, fd: int, key: str, token: str) -> None:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({'path': key, 'owner': self.instance_id, 'token': token,
+                       'acquired_at': time.time()}, f)
+
+    def _create(self, path: str, key: str, token: str) -> bool:
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+        except FileExistsError:
+            return False
+        self._write(fd, key, token)
+        return True
+
+    def _age(self, path: str) -> float:
+        return self._fs_now() - os.stat(path).st_mtime
+
+    def _take_over_if_stale(self, path: str, key: str, token: str):
+        """Replace an expired lease with ours.
+
+        True if taken over, False if the lease is live (or another instance is
+        taking it over), None if it vanished and a plain claim may be retried.
+        """
+        try:
+            if self._age(path) <= self.ttl_sec:
+                return False
+        except FileNotFoundError:
+            return None
+        guard = f"{path}.reclaim"
+        if not self._create(guard, key, token):
+            # Someone else is reclaiming; a guard left behind by a crash expires like a lease
+            try:
+                if self._age(guard) > self.ttl_sec:
+                    os.remove(guard)
+            except OSError:
+                pass
+            return False
+        try:
+            stale = self._read(path) or {}
+            try:
+                # Between the first check and the guard the lease may have been renewed or replaced
+                age = self._age(path)
+            except FileNotFoundError:
+                return None
+            if age <= self.ttl_sec:
+                return False
+            tmp = f"{path}.{token}.tmp"
+            self._write(os.open(tmp, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644), key, token)
+            os.replace(tmp, path)
+        finally:
+            try:
+                os.remove(guard)
+            except OSError:
+                pass
+        logger.warning(f"Reclaimed stale lease of {stale.get('owner', 'unknown')} "
+                       f"for {stale.get('path', key)} ({age:.0f}s without heartbeat)")
+        with self._lock:
+            self._stats['reclaimed'] += 1
+        return True
+
+    def claim(self, key: str) -> bool:
+        """Claim key for this instance; False if another live instance holds it."""
+        path = self._lease_path(key)
+        token = uuid.uuid4().hex
+        for _ in range(3):
+            claimed = self._create(path, key, token) or self._take_over_if_stale(path, key, token)
+            if claimed:
+                with self._lock:
+                    self._held[key] = (path, token, time.time())
+                    self._renewed[key] = time.monotonic()
+                    self._lost.discard(key)
+                    self._stats['claimed'] += 1
+                    self._ensure_heartbeat()
+                return True
+            if claimed is False:
+                break
+        with self._lock:
+            self._stats['busy'] += 1
+        return False
+
+    def owner(self, key: str):
+        lease = self._read(self._lease_path(key))
+        return lease.get('owner') if lease else None
+
+    def is_lost(self, key: str) -> bool:
+        """True once a lease this instance held was taken over or could not be renewed."""
+        return key in self._lost
+
+    def release(self, key: str) -> None:
+        with self._lock:
+            held = self._held.pop(key, None)
+            self._renewed.pop(key, None)
+            self._lost.discard(key)
+        if held is None:
+            return
+        path, token, _ = held
+        lease = self._read(path)
+        if lease is not None and lease.get('token') == token:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        else:
+            logger.warning(f"Lease for {key} was taken over by {lease.get('owner') if lease else 'nobody'} "
+                           f"before release")
+
+    def _ensure_heartbeat(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._heartbeat, name="lease-heartbeat", daemon=True)
+            self._thread.start()
+
+    def _heartbeat(self) -> None:
+        while not self._stop.wait(self.heartbeat_sec):
+            self.renew()
+
+    def renew(self) -> None:
+        """Refresh every held lease.
+
+        Leases that were taken over, or that could not be renewed for `ttl_sec`
+        (so another instance may take them over), are dropped and marked lost.
+        """
+        with self._lock:
+            held = list(self._held.items())
+        for key, (path, token, _) in held:
+            lease = self._read(path)
+            if lease is not None and lease.get('token') == token:
+                try:
+                    os.utime(path, None)
+                    with self._lock:
+                        self._renewed[key] = time.monotonic()
+                        self._stats['renewals'] += 1
+                    continue
+                except OSError as e:
+                    if e.errno != errno.ENOENT:
+                        with self._lock:
+                            failing = time.monotonic() - self._renewed.get(key, 0.0)
+                        logger.warning(f"Cannot renew lease for {key}: {e}")
+                        if failing <= self.ttl_sec:
+                            continue
+            logger.error(f"Lost lease for {key}; stopping its extraction")
+            with self._lock:
+                if self._held.get(key, (None, None))[1] == token:
+                    del self._held[key]
+                    self._renewed.pop(key, None)
+                    self._lost.add(key)
+                self._stats['lost'] += 1
+
+    def held(self) -> list:
+        now = time.time()
+        with self._lock:
+            return [{'path': key, 'seconds': round(now - acquired, 3)}
+                    for key, (_, _, acquired) in self._held.items()]
+
+    def stop(self) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        for key in [item['path'] for item in self.held()]:
+            self.release(key)
+        try:
+            os.remove(self._clock_path())
+        except OSError:
+            pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['held'] = len(self._held)
+            stats['instance'] = self.instance_id
+            return stats
@@ -0,0 +1,149 @@
+import base64
+import bisect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Sort orders: directories first, then the field (largest/newest first), then name
+_SORT_KEYS = {
+    'name': lambda e: (not e['is_dir'], e['name'].lower(), e['name']),
+    'size': lambda e: (not e['is_dir'], -e['size'], e['name'].lower(), e['name']),
+    'mtime': lambda e: (not e['is_dir'], -e['mtime'], e['name'].lower(), e['name']),
+}
+SORT_ORDERS = tuple(_SORT_KEYS)
+
+
+def encode_cursor(key: tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(key).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        key = json.loads(raw)
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {e}")
+    if not isinstance(key, list) or not key:
+        raise ValueError("invalid cursor")
+    return tuple(key)
+
+
+class _Listing:
+    def __init__(self, entries: list):
+        self.entries = entries
+        self.built_at = time.monotonic()
+        self._orders = {}
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def ordered(self, sort: str):
+        """(sort keys, entries) in `sort` order; each order is built once per listing."""
+        with self._lock:
+            order = self._orders.get(sort)
+            if order is None:
+                key = _SORT_KEYS[sort]
+                pairs = sorted(((key(e), e) for e in self.entries), key=lambda pair: pair[0])
+                order = self._orders[sort] = ([k for k, _ in pairs], [e for _, e in pairs])
+            return order
+
+    def derived(self, name: str, build):
+        """build(entries), computed once per listing and cached under name."""
+        with self._lock:
+            value = self._derived.get(name)
+            if value is None:
+                value = self._derived[name] = build(self.entries)
+            return value
+
+
+class ListingCache:
+    """Short-lived cache of directory listings for the paginated browse API.
+
+    A directory is read with one scandir pass (name, type, size, mtime) and
+    served from memory for `ttl_sec`, or until a filesystem event in it calls
+    invalidate(). Pages are cut with keyset cursors (the sort key of the last
+    entry returned), so entries appearing or vanishing between requests never
+    shift a page.
+    """
+
+    def __init__(self, ttl_sec: float = 5.0, capacity: int = 64, hidden=(), hidden_suffixes=()):
+        self.ttl_sec = ttl_sec
+        self.capacity = max(1, int(capacity))
+        self.hidden = frozenset(hidden)
+        self.hidden_suffixes = tuple(hidden_suffixes)
+        self._lock = threading.Lock()
+        self._listings = OrderedDict()  # directory -> _Listing
+        self._stats = {'hits': 0, 'misses': 0, 'invalidated': 0}
+
+    def _read(self, directory: str) -> list:
+        entries = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name in self.hidden or (self.hidden_suffixes and entry.name.endswith(self.hidden_suffixes)):
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                    st = entry.stat()
+                except OSError:
+                    continue  # vanished while listing
+                entries.append({'name': entry.name, 'is_dir': is_dir,
+                                'size': 0 if is_dir else st.st_size, 'mtime': st.st_mtime})
+        return entries
+
+    def get(self, directory: str) -> _Listing:
+        now = time.monotonic()
+        with self._lock:
+            listing = self._listings.get(directory)
+            if listing is not None and now - listing.built_at < self.ttl_sec:
+                self._listings.move_to_end(directory)
+                self._stats['hits'] += 1
+                return listing
+            self._stats['misses'] += 1
+        listing = _Listing(self._read(directory))
+        with self._lock:
+            self._listings[directory] = listing
+            self._listings.move_to_end(directory)
+            while len(self._listings) > self.capacity:
+                self._listings.popitem(last=False)
+        return listing
+
+    def page(self, directory: str, sort: str = 'name', cursor: str = None, limit: int = 200,
+             predicate=None) -> dict:
+        """One page of entries after `cursor` that satisfy predicate(entry)."""
+        return self.paginate(self.get(directory), sort, cursor, limit, predicate)
+
+    def paginate(self, listing: _Listing, sort: str = 'name', cursor: str = None, limit: int = 200,
+                 predicate=None) -> dict:
+        """page() over a listing already fetched with get()."""
+        keys, entries = listing.ordered(sort)
+        start = 0
+        if cursor:
+            try:
+                start = bisect.bisect_right(keys, decode_cursor(cursor))
+            except TypeError:
+                raise ValueError("cursor does not belong to this sort order")
+        items = []
+        next_cursor = None
+        last = None
+        for i in range(start, len(entries)):
+            if predicate is not None and not predicate(entries[i]):
+                continue
+            if len(items) == limit:
+                next_cursor = encode_cursor(keys[last])
+                break
+            items.append(entries[i])
+            last = i
+        return {'entries': items, 'next_cursor': next_cursor, 'total': len(entries)}
+
+    def invalidate(self, directory: str) -> None:
+        with self._lock:
+            if self._listings.pop(directory, None) is not None:
+                self._stats['invalidated'] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['directories'] = len(self._listings)
+            return stats
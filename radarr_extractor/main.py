@@ -3,10 +3,32 @@ import sys
 import threading
 import logging
 from urllib.parse import quote
-from flask import Flask, request, jsonify, render_template, redirect, url_for
+from flask import Flask, Response, request, jsonify, render_template, redirect, url_for
 from watchdog.observers import Observer
 from radarr_extractor.config import DOWNLOAD_DIR, WEBHOOK_PORT, EXTRACT_MODE, EXTRACTED_DIR, logger
-from radarr_extractor.core import scan_directory, DownloadHandler, process_file, is_compressed_file
+from radarr_extractor.core import (
+    scan_directory,
+    DownloadHandler,
+    is_compressed_file,
+    submit_job,
+    get_job,
+    list_jobs,
+    get_job_stats,
+    get_in_flight,
+    get_lease_stats,
+    get_disk_stats,
+    get_io_stats,
+    get_pool_stats,
+    get_event_stats,
+    get_listing_stats,
+    get_notify_stats,
+    get_archive_index,
+    list_directory,
+)
+from radarr_extractor.jobs import QueueFull
+from radarr_extractor.backends import get_backend_stats
+from radarr_extractor.tracker import get_tracker_stats
+from radarr_extractor import metrics
 app = Flask(__name__)
 
 @app.route('/', methods=['GET'])
@@ -16,7 +38,8 @@ def health_check():
         'status': 'healthy',
         'service': 'radarr-extractor',
         'monitored_directory': DOWNLOAD_DIR,
-        'browse_ui': '/browse'
+        'browse_ui': '/browse',
+        'io': get_io_stats(),
     }), 200
 
 @app.route('/webhook', methods=['POST'])
@@ -38,18 +61,60 @@ def webhook():
             logger.info(f"Processing {event_type} for movie '{movie_title}': {file_path}")
             
             if os.path.exists(file_path):
-                process_file(file_path)
+                try:
+                    job = submit_job(file_path, source='webhook')
+                except QueueFull as e:
+                    logger.warning(f"Rejecting webhook for {file_path}: {e}")
+                    return jsonify({'status': 'busy', 'error': str(e)}), 429
                 return jsonify({
-                    'status': 'processing',
+                    'status': 'queued',
+                    'job_id': job.id,
+                    'job_url': url_for('job_status', job_id=job.id),
                     'file': file_path,
                     'movie': movie_title,
                     'event': event_type
-                }), 200
+                }), 202
             else:
                 logger.info(f"File either doesn't exist or is not compressed: {file_path}")
     
     return jsonify({'status': 'ignored', 'event': event_type}), 200
 
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus text-format metrics."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/jobs', methods=['GET'])
+def jobs_index():
+    """Recent extraction jobs, newest first."""
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({'stats': get_job_stats(), 'jobs': list_jobs(limit)}), 200
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """State, bytes extracted and timing of one job."""
+    job = get_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+@app.route('/inflight', methods=['GET'])
+def in_flight():
+    """Archives being extracted right now, oldest first, and those waiting for disk space."""
+    return jsonify({'in_flight': get_in_flight(), 'leases': get_lease_stats(), 'disk': get_disk_stats()}), 200
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    """Internal counters: backends, worker pools, events, listing cache, tracker and notifier."""
+    return jsonify({
+        'backends': get_backend_stats(),
+        'pools': get_pool_stats(),
+        'events': get_event_stats(),
+        'listing': get_listing_stats(),
+        'tracker': get_tracker_stats(),
+        'notify': get_notify_stats(),
+    }), 200
+
 # ---- Simple LAN-only UI for manual extraction ----
 def _resolve_safe_path(user_path: str) -> str:
     """Resolve a user-supplied path safely inside DOWNLOAD_DIR.
@@ -96,29 +161,8 @@ def browse():
     if not os.path.exists(abs_path):
         return jsonify({"error": "Path not found"}), 404
 
-    entries = []
-    try:
-        with os.scandir(abs_path) as it:
-            for entry in it:
-                # Hide some noisy files
-                if entry.name in {'.', '..', '.DS_Store', '.extracted_files'}:
-                    continue
-                epath = os.path.join(abs_path, entry.name)
-                item = {
-                    'name': entry.name,
-                    'is_dir': entry.is_dir(),
-                    'path': epath,
-                    'rel': os.path.relpath(epath, DOWNLOAD_DIR),
-                    'is_archive': False
-                }
-                if entry.is_file():
-                    item['is_archive'] = is_compressed_file(entry.name)
-                entries.append(item)
-    except PermissionError:
-        return jsonify({"error": "Permission denied"}), 403
-
-    # Sort: directories first, then files alphabetically
-    entries.sort(key=lambda x: (not x['is_dir'], x['name'].lower()))
+    if not os.path.isdir(abs_path):
+        return jsonify({"error": "Not a directory"}), 400
 
     crumbs = _breadcrumbs(abs_path)
     at_root = os.path.realpath(abs_path) == os.path.realpath(DOWNLOAD_DIR)
@@ -127,13 +171,62 @@ def browse():
     return render_template(
         'browse.html',
         current_path=abs_path,
-        entries=entries,
+        current_rel=_relative_dir(abs_path),
         breadcrumbs=crumbs,
         at_root=at_root,
         parent_rel=parent_rel,
         message=message,
     )
 
+def _relative_dir(abs_path: str) -> str:
+    rel = os.path.relpath(abs_path, os.path.realpath(DOWNLOAD_DIR))
+    return '' if rel == '.' else rel
+
+@app.route('/api/list', methods=['GET'])
+def api_list():
+    """One page of a directory listing, sorted and filtered server-side.
+
+    Query: path, sort (name|size|mtime), filter (archives|pending), limit
+    (max 1000) and cursor (next_cursor of the previous page).
+    """
+    try:
+        abs_path = _resolve_safe_path(request.args.get('path', ''))
+    except ValueError:
+        return jsonify({"error": "Invalid path"}), 400
+    if not os.path.isdir(abs_path):
+        return jsonify({"error": "Path not found"}), 404
+    show = request.args.get('filter', '')
+    limit = min(1000, max(1, request.args.get('limit', 200, type=int)))
+    try:
+        page = list_directory(
+            abs_path,
+            sort=request.args.get('sort', 'name'),
+            cursor=request.args.get('cursor') or None,
+            limit=limit,
+            archives_only=show == 'archives',
+            pending_only=show == 'pending',
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except PermissionError:
+        return jsonify({"error": "Permission denied"}), 403
+    rel_dir = _relative_dir(abs_path)
+    for entry in page['entries']:
+        entry['rel'] = os.path.join(rel_dir, entry['name'])
+    page['path'] = rel_dir
+    return jsonify(page), 200
+
+@app.route('/archive-index', methods=['GET'])
+def archive_index():
+    """Member count, uncompressed size and media detection for one archive (cached)."""
+    try:
+        abs_path = _resolve_safe_path(request.args.get('path', ''))
+    except ValueError:
+        return jsonify({"error": "Invalid path"}), 400
+    if not os.path.isfile(abs_path) or not is_compressed_file(abs_path):
+        return jsonify({"error": "Not an archive file"}), 400
+    return jsonify(get_archive_index(abs_path) or {"error": "Archive vanished"}), 200
+
 @app.route('/extract', methods=['POST'])
 def extract_route():
     target = request.form.get('path', '')
@@ -146,13 +239,13 @@ def extract_route():
     if not os.path.isfile(abs_target) or not is_compressed_file(abs_target):
         return jsonify({"error": "Not an archive file"}), 400
 
-    def _bg():
-        logger.info(f"UI-triggered extraction for: {abs_target}")
-        process_file(abs_target)
-
-    threading.Thread(target=_bg, daemon=True).start()
     current_dir = os.path.dirname(abs_target)
     rel = os.path.relpath(current_dir, DOWNLOAD_DIR)
+    logger.info(f"UI-triggered extraction for: {abs_target}")
+    try:
+        submit_job(abs_target, source='ui')
+    except QueueFull:
+        return redirect(url_for('browse', path=rel, msg="Extraction queue is full, try again shortly"))
     return redirect(url_for('browse', path=rel, msg=f"Extraction queued for {os.path.basename(abs_target)}"))
 
 @app.route('/rescan', methods=['POST'])
@@ -216,6 +309,14 @@ def main():
         logger.info("Tracker file is accessible")
     except Exception as e:
         logger.warning(f"Cannot access tracker file {TRACKER_FILE}: {e}")
+
+    # Open the tracker backend up front so migration/compaction happens before scanning
+    try:
+        from radarr_extractor.tracker import open_tracker
+        store = open_tracker()
+        logger.info(f"Tracker backend: {store.name}")
+    except Exception as e:
+        logger.warning(f"Cannot open tracker backend: {e}")
     
     try:
         # Start the file system observer first
@@ -0,0 +1,62 @@
+import os
+import resource
+import sys
+import threading
+from contextlib import contextmanager
+from radarr_extractor.config import logger
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == 'darwin' else rss * 1024
+
+
+class MemoryBudget:
+    """Weighted semaphore over an estimated number of bytes.
+
+    Callers reserve their estimated working set before starting and block while
+    it would push the total over `capacity`. A reservation larger than the whole
+    budget still runs, but only once nothing else holds memory.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, int(capacity))
+        self._cond = threading.Condition()
+        self._used = 0
+        self._stats = {'reservations': 0, 'waits': 0, 'oversized': 0, 'peak_used': 0}
+
+    @contextmanager
+    def reserve(self, amount: int, label: str = ''):
+        amount = max(0, int(amount))
+        with self._cond:
+            self._stats['reservations'] += 1
+            if amount > self.capacity:
+                self._stats['oversized'] += 1
+                logger.warning(f"{label or 'Extraction'} needs ~{amount >> 20} MiB, more than the "
+                               f"{self.capacity >> 20} MiB budget; running it alone")
+            if self._used and self._used + amount > self.capacity:
+                self._stats['waits'] += 1
+                logger.info(f"Waiting for memory budget ({self._used >> 20}/{self.capacity >> 20} MiB in use): "
+                            f"{label}")
+                while self._used and self._used + amount > self.capacity:
+                    self._cond.wait()
+            self._used += amount
+            self._stats['peak_used'] = max(self._stats['peak_used'], self._used)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._used -= amount
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats['used'] = self._used
+            stats['capacity'] = self.capacity
+            return stats
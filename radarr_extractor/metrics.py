@@ -0,0 +1,203 @@
+"""Minimal Prometheus text-format metrics (no client library dependency).
+
+Metrics are module-level objects updated from the hot path; ``render()``
+produces the exposition served at ``/metrics``. Gauges and counters may be
+backed by a function so existing stats() dicts are read at scrape time.
+"""
+import math
+import threading
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format_value(value) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Registry:
+    """Set of metrics rendered together; metrics join REGISTRY unless given another."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = []
+
+    def register(self, metric) -> None:
+        with self._lock:
+            self._metrics.append(metric)
+
+    def unregister(self, metric) -> None:
+        with self._lock:
+            if metric in self._metrics:
+                self._metrics.remove(metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames=(), fn=None, registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._fn = fn
+        self._lock = threading.Lock()
+        self._values = {}
+        (REGISTRY if registry is None else registry).register(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, '')) for n in self.labelnames)
+
+    def _samples(self):
+        if self._fn is not None:
+            try:
+                return [(self.name, (), float(self._fn()))]
+            except Exception:
+                return []
+        with self._lock:
+            return [(self.name, key, value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, value, *extra in self._samples():
+            lines.append(f"{name}{_format_labels(self.labelnames, key, *extra)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, buckets, labelnames=(), registry=None):
+        super().__init__(name, documentation, labelnames, registry=registry)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][i] += 1
+                    break
+            entry[1] += value
+            entry[2] += 1
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            items = sorted(self._values.items())
+            for key, (counts, total, count) in items:
+                cumulative = 0
+                for bound, n in zip(self.buckets, counts):
+                    cumulative += n
+                    samples.append((f"{self.name}_bucket", key, cumulative, ('le', _format_value(float(bound)))))
+                samples.append((f"{self.name}_sum", key, total))
+                samples.append((f"{self.name}_count", key, count))
+        return samples
+
+
+def render() -> str:
+    """Prometheus text exposition of every metric in the default registry."""
+    return REGISTRY.render()
+
+
+# ---- Extraction hot-path metrics ----
+STABILITY_WAIT_SECONDS = Histogram(
+    'radarr_extractor_stability_wait_seconds',
+    'Time from a path being queued until it was considered stable.',
+    buckets=(1, 5, 10, 30, 60, 120, 300, 600),
+)
+EXTRACTION_SECONDS = Histogram(
+    'radarr_extractor_extraction_seconds',
+    'Wall time spent extracting one archive.',
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+    labelnames=('format',),
+)
+EXTRACTION_BYTES_PER_SECOND = Histogram(
+    'radarr_extractor_extraction_bytes_per_second',
+    'Write throughput of one archive extraction.',
+    buckets=(1e6, 1e7, 2.5e7, 5e7, 1e8, 2.5e8, 5e8, 1e9),
+    labelnames=('format',),
+)
+EXTRACTION_PEAK_RSS_BYTES = Histogram(
+    'radarr_extractor_extraction_peak_rss_bytes',
+    'Peak resident memory sampled while extracting one archive (7z only).',
+    buckets=(6.4e7, 1.28e8, 2.56e8, 5.12e8, 1.024e9, 2.048e9, 4.096e9),
+    labelnames=('format',),
+)
+ARCHIVES_EXTRACTED = Counter(
+    'radarr_extractor_archives_extracted_total',
+    'Archives extracted successfully.',
+    labelnames=('format',),
+)
+ARCHIVES_SKIPPED_TRACKED = Counter(
+    'radarr_extractor_archives_skipped_tracked_total',
+    'Archives skipped because the tracker already lists them.',
+)
+ARCHIVES_SKIPPED_DUPLICATE = Counter(
+    'radarr_extractor_archives_skipped_duplicate_total',
+    'Archives skipped because an identical archive (by fingerprint) was already extracted.',
+)
+ARCHIVES_DEFERRED = Counter(
+    'radarr_extractor_archives_deferred_total',
+    'Extractions postponed because the destination lacked free space.',
+)
+ARCHIVES_FAILED = Counter(
+    'radarr_extractor_archives_failed_total',
+    'Archives whose extraction failed.',
+)
@@ -0,0 +1,128 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from radarr_extractor.config import logger
+
+
+class RadarrNotifier:
+    """Background Radarr rescan queue.
+
+    Extraction threads only enqueue. Rescans are debounced: requests for the
+    same folder that arrive within `coalesce_sec` are merged into one. Folders
+    that come due together are drained in one pass, one RescanMovie command
+    each, over a persistent keep-alive session, and failures are re-queued
+    with bounded exponential backoff plus jitter instead of sleeping on a worker.
+    """
+
+    def __init__(self, base_url: str, api_key: str, coalesce_sec: float = 5.0,
+                 max_attempts: int = 3, backoff_sec: float = 1.0, max_backoff_sec: float = 60.0,
+                 timeout: float = 10.0):
+        self.endpoint = f"{base_url.rstrip('/')}/api/v3/command"
+        self.coalesce_sec = max(0.0, float(coalesce_sec))
+        self.max_attempts = max(1, int(max_attempts))
+        self.backoff_sec = max(0.0, float(backoff_sec))
+        self.max_backoff_sec = max(self.backoff_sec, float(max_backoff_sec))
+        self.timeout = timeout
+        self._session = requests.Session()
+        self._session.headers.update({'X-Api-Key': api_key, 'Content-Type': 'application/json'})
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._pending = {}  # path -> attempts made so far
+        self._thread = None
+        self._stopped = False
+        self._stats = {'enqueued': 0, 'coalesced': 0, 'batches': 0, 'sent': 0,
+                       'retries': 0, 'failed': 0}
+
+    def enqueue(self, path: str) -> None:
+        with self._cond:
+            self._stats['enqueued'] += 1
+            if path in self._pending:
+                self._stats['coalesced'] += 1
+                return
+            self._pending[path] = 0
+            heapq.heappush(self._heap, (time.monotonic() + self.coalesce_sec, next(self._seq), path))
+            if self._thread is None:
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name="radarr-notifier", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _next_batch(self):
+        """Block until at least one rescan is due; return all due paths (None once stopped)."""
+        with self._cond:
+            while not self._stopped:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                due = self._heap[0][0]
+                if due > now:
+                    self._cond.wait(due - now)
+                    continue
+                batch = []
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, path = heapq.heappop(self._heap)
+                    batch.append((path, self._pending.pop(path)))
+                self._stats['batches'] += 1
+                return batch
+            return None
+
+    def _send(self, path: str) -> None:
+        resp = self._session.post(self.endpoint, json={"name": "RescanMovie", "path": path},
+                                  timeout=self.timeout)
+        resp.raise_for_status()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            for path, attempts in batch:
+                try:
+                    self._send(path)
+                except Exception as e:
+                    self._retry_or_drop(path, attempts + 1, e)
+                    continue
+                with self._cond:
+                    self._stats['sent'] += 1
+                logger.info(f"Notified Radarr to rescan: {path}")
+
+    def _retry_or_drop(self, path: str, attempts: int, err: Exception) -> None:
+        with self._cond:
+            if path in self._pending:
+                # A fresh request for this folder is already queued and covers the retry
+                return
+            if attempts >= self.max_attempts:
+                self._stats['failed'] += 1
+                logger.error(f"Failed to notify Radarr after {attempts} attempts for {path}: {err}")
+                return
+            delay = min(self.max_backoff_sec, self.backoff_sec * (2 ** (attempts - 1)))
+            delay *= random.uniform(0.5, 1.5)
+            self._pending[path] = attempts
+            self._stats['retries'] += 1
+            heapq.heappush(self._heap, (time.monotonic() + delay, next(self._seq), path))
+            self._cond.notify()
+        logger.warning(f"Radarr notify failed (attempt {attempts}/{self.max_attempts}): {err}; "
+                       f"retrying in {delay:.1f}s")
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats['queue_depth'] = len(self._pending)
+            return stats
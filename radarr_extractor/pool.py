@@ -0,0 +1,187 @@
+import itertools
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from radarr_extractor.config import logger
+
+
+# Worker-side progress relay: bytes are sent to the parent in batches
+_PROGRESS_BATCH = 4 * 1024 * 1024
+_PROGRESS_INTERVAL = 0.5
+_WORKER = {'queue': None, 'token': None, 'pending': 0, 'flushed': 0.0}
+
+
+def _init_worker(level: int, progress=None) -> None:
+    """Give worker processes the same log format as the parent."""
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(levelname)s - [pid %(process)d] %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    _WORKER['queue'] = progress
+
+
+def _flush_progress(now: float) -> None:
+    if _WORKER['pending'] and _WORKER['queue'] is not None:
+        _WORKER['queue'].put((_WORKER['token'], _WORKER['pending']))
+    _WORKER['pending'] = 0
+    _WORKER['flushed'] = now
+
+
+def report_progress(n: int) -> None:
+    """In a worker: pass n written bytes on to the on_progress callback of run()."""
+    if _WORKER['token'] is None:
+        return
+    _WORKER['pending'] += n
+    now = time.monotonic()
+    if _WORKER['pending'] >= _PROGRESS_BATCH or now - _WORKER['flushed'] >= _PROGRESS_INTERVAL:
+        _flush_progress(now)
+
+
+def _run_task(token: int, fn, *args):
+    _WORKER['token'] = token
+    _WORKER['pending'] = 0
+    _WORKER['flushed'] = time.monotonic()
+    try:
+        return fn(*args)
+    finally:
+        _flush_progress(time.monotonic())
+        if _WORKER['queue'] is not None:
+            _WORKER['queue'].put((token, None))  # end marker: everything before it was delivered
+        _WORKER['token'] = None
+
+
+def _mp_context():
+    # forkserver/spawn avoid forking a parent that runs watchdog and Flask threads
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class ProcessExtractionPool:
+    """Lazily started process pool that runs CPU-bound extraction off the GIL.
+
+    Callers block on run() from their own (extractor) thread, so tracker writes
+    and notifications stay in the parent. Bytes a task reports through
+    report_progress() reach run()'s on_progress callback on a relay thread,
+    batched every few MiB or half second. Busy/submitted counters give pool
+    utilization; a crashed worker (e.g. OOM-killed) resets the pool.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max(1, int(max_workers))
+        self._lock = threading.Lock()
+        self._executor = None
+        self._queue = None
+        self._tokens = itertools.count(1)
+        self._listeners = {}
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'broken': 0,
+                       'busy': 0, 'busy_seconds': 0.0}
+        self._started_at = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                ctx = _mp_context()
+                # A fresh queue per executor: a killed worker may leave the old one unusable
+                self._queue = ctx.Queue()
+                threading.Thread(target=self._relay, args=(self._queue,), name="pool-progress",
+                                 daemon=True).start()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=ctx,
+                    initializer=_init_worker,
+                    initargs=(logging.getLogger().getEffectiveLevel(), self._queue),
+                )
+                if self._started_at is None:
+                    self._started_at = time.monotonic()
+                logger.info(f"Started extraction process pool with {self.max_workers} worker(s)")
+            return self._executor
+
+    def _relay(self, queue) -> None:
+        while True:
+            try:
+                item = queue.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                return
+            token, n = item
+            with self._lock:
+                listener = self._listeners.get(token)
+            if listener is None:
+                continue
+            callback, done = listener
+            if n is None:
+                done.set()
+                continue
+            try:
+                callback(n)
+            except Exception as e:
+                logger.debug(f"Progress callback failed: {e}")
+
+    def _close_queue(self, queue) -> None:
+        if queue is not None:
+            try:
+                queue.put(None)
+            except (OSError, ValueError):
+                pass
+
+    def run(self, fn, *args, on_progress=None):
+        """Run fn(*args) in a worker process and return its result.
+        on_progress(n) receives what the task passes to report_progress()."""
+        executor = self._get_executor()
+        token = next(self._tokens)
+        done = threading.Event()
+        with self._lock:
+            self._stats['submitted'] += 1
+            self._stats['busy'] += 1
+            if on_progress is not None:
+                self._listeners[token] = (on_progress, done)
+        started = time.monotonic()
+        ok = False
+        try:
+            result = executor.submit(_run_task, token, fn, *args).result()
+            if on_progress is not None:
+                done.wait(5)  # let the relay catch up with the final batch
+            ok = True
+            return result
+        except BrokenProcessPool:
+            logger.error("Extraction process pool broke (worker died); restarting on next use")
+            with self._lock:
+                self._stats['broken'] += 1
+                queue = None
+                if self._executor is executor:
+                    self._executor, queue, self._queue = None, self._queue, None
+            executor.shutdown(wait=False)
+            self._close_queue(queue)
+            raise
+        finally:
+            with self._lock:
+                self._listeners.pop(token, None)
+                self._stats['busy'] -= 1
+                self._stats['busy_seconds'] += time.monotonic() - started
+                self._stats['completed' if ok else 'failed'] += 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            queue, self._queue = self._queue, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        self._close_queue(queue)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['workers'] = self.max_workers
+            stats['running'] = self._executor is not None
+            stats['utilization'] = stats['busy'] / self.max_workers
+            if self._started_at is not None:
+                elapsed = max(1e-9, time.monotonic() - self._started_at)
+                stats['avg_utilization'] = min(1.0, stats['busy_seconds'] / (elapsed * self.max_workers))
+            else:
+                stats['avg_utilization'] = 0.0
+            return stats
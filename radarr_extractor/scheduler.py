@@ -0,0 +1,180 @@
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from radarr_extractor.config import logger
+
+# Lower runs first: someone is waiting on a webhook or UI request; watchdog
+# events are fresh downloads; scan results are backfill.
+PRIORITY_CLASSES = {'webhook': 0, 'ui': 1, 'watchdog': 2, 'scan': 3}
+
+
+class _Task:
+    __slots__ = ('fn', 'args', 'future', 'cls', 'rank', 'group', 'size', 'seq', 'queued_at')
+
+    def __init__(self, fn, args, cls, rank, group, size, seq):
+        self.fn = fn
+        self.args = args
+        self.future = Future()
+        self.cls = cls
+        self.rank = rank
+        self.group = group
+        self.size = size
+        self.seq = seq
+        self.queued_at = time.monotonic()
+
+
+class ExtractionScheduler:
+    """Worker pool that picks the next extraction by priority class, fairness and age.
+
+    Tasks are bucketed per (class, group), where the group is normally the
+    top-level download folder. The next task comes from the bucket whose head
+    has the best effective class; a head that has waited `aging_sec` moves up
+    one class per period, so backfill never starves completely. Ties go to the
+    group served least recently (round-robin across folders), then to the
+    smallest archive when `smallest_first` is set, else to submission order.
+    """
+
+    # Idle groups remembered beyond the queued ones before _served is pruned
+    SERVED_SLACK = 64
+
+    def __init__(self, workers: int, smallest_first: bool = False, aging_sec: float = 600.0,
+                 fairness: bool = True, name: str = 'extractor'):
+        self.workers = max(1, int(workers))
+        self.smallest_first = smallest_first
+        self.aging_sec = max(0.0, float(aging_sec))
+        self.fairness = fairness
+        self.name = name
+        self._cond = threading.Condition()
+        self._buckets = {}  # (rank, group) -> deque of tasks (FIFO)
+        self._served = {}  # group -> counter value when last served
+        self._tick = itertools.count(1)
+        self._seq = itertools.count()
+        self._queued = 0
+        self._threads = []
+        self._shutdown = False
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'aged': 0}
+        self._per_class = {cls: {'submitted': 0, 'started': 0, 'max_wait': 0.0} for cls in PRIORITY_CLASSES}
+
+    def submit(self, fn, *args, priority: str = 'watchdog', group: str = '', size: int = None) -> Future:
+        rank = PRIORITY_CLASSES.get(priority, len(PRIORITY_CLASSES))
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("scheduler is shut down")
+            task = _Task(fn, args, priority, rank, group if self.fairness else '', size, next(self._seq))
+            bucket = self._buckets.get((rank, task.group))
+            if bucket is None:
+                bucket = self._buckets[(rank, task.group)] = deque()
+            bucket.append(task)
+            self._queued += 1
+            self._stats['submitted'] += 1
+            self._per_class.setdefault(priority, {'submitted': 0, 'started': 0, 'max_wait': 0.0})
+            self._per_class[priority]['submitted'] += 1
+            if not self._threads:
+                for i in range(self.workers):
+                    t = threading.Thread(target=self._run, name=f"{self.name}-{i}", daemon=True)
+                    t.start()
+                    self._threads.append(t)
+            self._cond.notify()
+            return task.future
+
+    def _effective_rank(self, task: _Task, now: float) -> int:
+        if not self.aging_sec:
+            return task.rank
+        return max(0, task.rank - int((now - task.queued_at) // self.aging_sec))
+
+    def _head(self, bucket: deque) -> _Task:
+        if self.smallest_first:
+            return min(bucket, key=lambda t: (t.size if t.size is not None else float('inf'), t.seq))
+        return bucket[0]
+
+    def _pick(self) -> _Task:
+        now = time.monotonic()
+        best_key = best = None
+        for key, bucket in self._buckets.items():
+            head = self._head(bucket)
+            order = (self._effective_rank(head, now), self._served.get(head.group, 0),
+                     head.size if self.smallest_first and head.size is not None else float('inf'),
+                     head.seq)
+            if best is None or order < best:
+                best_key, best = key, order
+        bucket = self._buckets[best_key]
+        task = self._head(bucket)
+        if self.smallest_first:
+            bucket.remove(task)
+        else:
+            bucket.popleft()
+        if not bucket:
+            del self._buckets[best_key]
+        self._queued -= 1
+        self._served[task.group] = next(self._tick)
+        if len(self._served) > self.SERVED_SLACK + 2 * len(self._buckets):
+            self._prune_served()
+        if best[0] < task.rank:
+            self._stats['aged'] += 1
+        waited = now - task.queued_at
+        per_class = self._per_class[task.cls]
+        per_class['started'] += 1
+        per_class['max_wait'] = max(per_class['max_wait'], waited)
+        return task
+
+    def _prune_served(self) -> None:
+        """Forget idle groups last served before every queued group.
+
+        Such a group sorts ahead of all queued groups whether it keeps its
+        counter or falls back to 0, so dropping it does not change the order.
+        """
+        pending = {group for _, group in self._buckets}
+        floor = min((self._served.get(group, 0) for group in pending), default=None)
+        self._served = {group: tick for group, tick in self._served.items()
+                        if group in pending or (floor is not None and tick > floor)}
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._buckets and not self._shutdown:
+                    self._cond.wait()
+                if not self._buckets:
+                    return
+                task = self._pick()
+            if not task.future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = task.fn(*task.args)
+            except BaseException as e:
+                logger.error(f"Scheduled task failed: {e}")
+                task.future.set_exception(e)
+                ok = False
+            else:
+                task.future.set_result(result)
+                ok = True
+            with self._cond:
+                self._stats['completed' if ok else 'failed'] += 1
+
+    def queued(self) -> int:
+        with self._cond:
+            return self._queued
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+            threads = list(self._threads)
+        if wait:
+            for t in threads:
+                if t is not threading.current_thread():
+                    t.join()
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats['queued'] = self._queued
+            stats['workers'] = self.workers
+            stats['queued_by_class'] = {}
+            for (rank, _), bucket in self._buckets.items():
+                for task in bucket:
+                    stats['queued_by_class'][task.cls] = stats['queued_by_class'].get(task.cls, 0) + 1
+            stats['groups'] = len({group for _, group in self._buckets})
+            stats['classes'] = {cls: dict(v) for cls, v in self._per_class.items()}
+            return stats
@@ -0,0 +1,148 @@
+"""Streaming 7z member writers for py7zr.
+
+py7zr hands each decompressed chunk to a writer obtained from a
+WriterFactory. Writing straight to a `.partial` file per member keeps memory
+at the decoder's own working set instead of buffering whole members.
+"""
+import os
+import time
+from py7zr.io import Py7zIO, WriterFactory
+from radarr_extractor.checkpoint import PARTIAL_SUFFIX
+from radarr_extractor.fastcopy import preallocate
+from radarr_extractor.membudget import current_rss
+
+_LZMA = b'\x03\x01\x01'
+_LZMA2 = b'\x21'
+_PPMD = b'\x03\x04\x01'
+_BZIP2 = b'\x04\x02\x02'
+# Fixed per-coder allowance (I/O buffers, filters, Python objects)
+_CODER_OVERHEAD = 4 * 1024 * 1024
+_RSS_SAMPLE_BYTES = 32 * 1024 * 1024
+
+
+def _coder_memory(coder: dict) -> int:
+    method = coder.get('method') or b''
+    props = coder.get('properties') or b''
+    if method == _LZMA2 and props:
+        bits = props[0] & 0x3F
+        return 0xFFFFFFFF if bits >= 40 else (2 | (bits & 1)) << (bits // 2 + 11)
+    if method == _LZMA and len(props) >= 5:
+        return int.from_bytes(props[1:5], 'little')
+    if method == _PPMD and len(props) >= 5:
+        return int.from_bytes(props[1:5], 'little')
+    if method == _BZIP2:
+        return 8 * 1024 * 1024
+    return 0
+
+
+def estimate_decoder_memory(z) -> int:
+    """Largest per-folder decoder working set, from the coder properties in the header.
+
+    Folders are decoded one after another (see _safe_extract_7z), so the
+    maximum, not the sum, bounds memory.
+    """
+    streams = getattr(getattr(z, 'header', None), 'main_streams', None)
+    if streams is None or streams.unpackinfo is None:
+        return _CODER_OVERHEAD
+    peak = 0
+    for folder in streams.unpackinfo.folders:
+        coders = folder.coders or []
+        peak = max(peak, sum(_coder_memory(c) + _CODER_OVERHEAD for c in coders))
+    return peak or _CODER_OVERHEAD
+
+
+class _MemberWriter(Py7zIO):
+    def __init__(self, factory, name: str, out_path: str, size):
+        self._factory = factory
+        self.name = name
+        self.out_path = out_path
+        self.partial = out_path + PARTIAL_SUFFIX
+        os.makedirs(os.path.dirname(out_path), exist_ok=True)
+        self._f = open(self.partial, 'wb')
+        preallocate(self._f.fileno(), size)
+        self._size = 0
+        self.closed = False
+
+    def write(self, s) -> int:
+        started = time.monotonic()
+        n = self._f.write(s)
+        self._size += n
+        self._factory._written(n, time.monotonic() - started)
+        return n
+
+    def read(self, size=None) -> bytes:
+        return b''
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return 0
+
+    def seekable(self) -> bool:
+        return False
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def size(self) -> int:
+        return self._size
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        self._f.close()
+        self._factory._completed(self)
+
+
+class MemberWriterFactory(WriterFactory):
+    """Stream wanted members to `<dest>/<name>.partial` and report each completed member.
+
+    on_complete(name, partial_path, out_path, size) is called once per member,
+    normally from py7zr's close hook; finish() covers py7zr versions without it.
+    on_write(n, seconds) receives the duration of every chunk write.
+    """
+
+    def __init__(self, dest_dir: str, infos: dict, on_bytes=None, on_complete=None, on_write=None):
+        self.dest_dir = dest_dir
+        self.infos = infos
+        self._on_bytes = on_bytes
+        self._on_complete = on_complete
+        self._on_write = on_write
+        self._writers = []
+        self._since_sample = 0
+        self.peak_rss = current_rss()
+
+    def create(self, filename: str) -> Py7zIO:
+        name = os.path.relpath(filename, self.dest_dir).replace(os.sep, '/')
+        info = self.infos.get(name)
+        writer = _MemberWriter(self, name, os.path.join(self.dest_dir, name),
+                               getattr(info, 'uncompressed', None))
+        self._writers.append(writer)
+        return writer
+
+    def _written(self, n: int, seconds: float) -> None:
+        if self._on_write is not None:
+            self._on_write(n, seconds)
+        if self._on_bytes is not None:
+            self._on_bytes(n)
+        self._since_sample += n
+        if self._since_sample >= _RSS_SAMPLE_BYTES:
+            self._since_sample = 0
+            self.peak_rss = max(self.peak_rss, current_rss())
+
+    def _completed(self, writer: _MemberWriter) -> None:
+        self.peak_rss = max(self.peak_rss, current_rss())
+        if self._on_complete is not None:
+            self._on_complete(writer.name, writer.partial, writer.out_path, writer.size())
+
+    def finish(self) -> None:
+        for writer in self._writers:
+            writer.close()
+        self._writers = []
+
+    def abort(self) -> None:
+        """Close open member files without committing them (extraction failed)."""
+        for writer in self._writers:
+            if not writer.closed:
+                writer.closed = True
+                writer._f.close()
+        self._writers = []
@@ -0,0 +1,177 @@
+import heapq
+import itertools
+import os
+import threading
+import time
+from radarr_extractor.config import logger
+
+
+def _size_probe(path: str):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime
+
+
+class StabilityMonitor:
+    """Poll file sizes for all pending paths from one thread.
+
+    A path is promoted (callback invoked) once its size has been unchanged for
+    `polls` consecutive polls spaced `window_sec` apart, or straight away when
+    its mtime is already older than that whole window. Paths still changing
+    after `max_wait_sec` are promoted anyway with a warning, matching the
+    previous in-worker wait; paths that disappear are dropped.
+
+    `probe(path)` returns (signature, newest_mtime) and raises OSError when the
+    path is gone; the default compares the file size alone. `on_wait(seconds)`
+    receives how long each promoted path waited, `on_vanish(path)` is told
+    about paths dropped because they disappeared.
+    """
+
+    def __init__(self, callback, window_sec: float, polls: int, max_wait_sec: float, probe=None,
+                 on_wait=None, on_vanish=None):
+        self._callback = callback
+        self._probe = probe or _size_probe
+        self._on_wait = on_wait
+        self._on_vanish = on_vanish
+        self.window_sec = max(0.0, float(window_sec))
+        self.polls = max(1, int(polls))
+        self.max_wait_sec = max(0.0, float(max_wait_sec))
+        self._cond = threading.Condition()
+        self._heap = []
+        self._seq = itertools.count()
+        self._pending = {}
+        self._thread = None
+        self._stopped = False
+        self._stats = {'watched': 0, 'duplicates': 0, 'polls': 0, 'promoted': 0,
+                       'timed_out': 0, 'vanished': 0, 'errors': 0}
+
+    def watch(self, path: str) -> None:
+        with self._cond:
+            if path in self._pending:
+                self._stats['duplicates'] += 1
+                return
+            now = time.monotonic()
+            self._stats['watched'] += 1
+            self._pending[path] = {'last': None, 'stable': 0, 'since': now, 'deadline': now + self.max_wait_sec}
+            heapq.heappush(self._heap, (now, next(self._seq), path))
+            if self._thread is None:
+                self._stopped = False
+                self._thread = threading.Thread(target=self._run, name="stability-monitor", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _evaluate(self, state: dict, probed, now: float):
+        """Apply one probe result to a path's state.
+        Return 'stable', 'timeout', 'vanished' or None (keep waiting)."""
+        if probed is None:
+            return 'vanished'
+        signature, mtime = probed
+        if state['last'] is None and time.time() - mtime >= self.window_sec * self.polls:
+            return 'stable'
+        if state['last'] is not None and signature == state['last']:
+            state['stable'] += 1
+            if state['stable'] >= self.polls:
+                return 'stable'
+        else:
+            state['stable'] = 0
+        state['last'] = signature
+        if now >= state['deadline']:
+            return 'timeout'
+        return None
+
+    def _next_due(self):
+        """Block until paths are due for a poll and pop them all; None once stopped."""
+        with self._cond:
+            while not self._stopped:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                if self._heap[0][0] > now:
+                    self._cond.wait(self._heap[0][0] - now)
+                    continue
+                due = []
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, path = heapq.heappop(self._heap)
+                    if path in self._pending:
+                        due.append(path)
+                if due:
+                    return due, now
+            return None
+
+    def _settle(self, probed: list, now: float):
+        """Fold (path, probe result) pairs into the pending state.
+        Returns ([(path, waited)] to promote, [vanished paths])."""
+        ready = []
+        vanished = []
+        with self._cond:
+            for path, result in probed:
+                state = self._pending.get(path)
+                if state is None:
+                    continue
+                self._stats['polls'] += 1
+                outcome = self._evaluate(state, result, now)
+                if outcome is None:
+                    heapq.heappush(self._heap, (now + self.window_sec, next(self._seq), path))
+                    continue
+                del self._pending[path]
+                if outcome == 'vanished':
+                    self._stats['vanished'] += 1
+                    logger.debug(f"File disappeared while waiting for stability: {path}")
+                    vanished.append(path)
+                    continue
+                if outcome == 'timeout':
+                    self._stats['timed_out'] += 1
+                    logger.warning(f"File did not become stable in time: {path}")
+                self._stats['promoted'] += 1
+                ready.append((path, now - state['since']))
+        return ready, vanished
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_due()
+            if batch is None:
+                return
+            paths, now = batch
+            # Probe without the lock so slow stats (network mounts, big volume
+            # sets) never block watch(), pending() or stats()
+            probed = []
+            for path in paths:
+                try:
+                    probed.append((path, self._probe(path)))
+                except OSError:
+                    probed.append((path, None))
+            ready, vanished = self._settle(probed, now)
+            for path in vanished:
+                if self._on_vanish is None:
+                    break
+                try:
+                    self._on_vanish(path)
+                except Exception as e:
+                    logger.error(f"Failed to drop vanished file {path}: {e}")
+            for path, waited in ready:
+                try:
+                    if self._on_wait is not None:
+                        self._on_wait(waited)
+                    self._callback(path)
+                except Exception as e:
+                    with self._cond:
+                        self._stats['errors'] += 1
+                    logger.error(f"Failed to promote stable file {path}: {e}")
+
+    def pending(self):
+        with self._cond:
+            return sorted(self._pending)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            thread, self._thread = self._thread, None
+            self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def stats(self) -> dict:
+        with self._cond:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+            return stats
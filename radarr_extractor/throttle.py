@@ -0,0 +1,189 @@
+import threading
+import time
+from radarr_extractor.config import logger
+
+_MIB = 1024 * 1024
+
+
+class TokenBucket:
+    """Byte-rate limiter; rate 0 means unlimited.
+
+    take(n) charges n bytes and returns how long the caller must sleep. The
+    balance may go negative, so concurrent callers queue up behind each other
+    and the long-run rate holds even for chunks larger than the burst.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = 0.0
+        self.burst = 0.0
+        self._tokens = 0.0
+        self._last = time.monotonic()
+        self.set_rate(rate, burst)
+        self._tokens = self.burst
+
+    def set_rate(self, rate: float, burst: float = None) -> None:
+        self.rate = max(0.0, float(rate or 0))
+        self.burst = float(burst) if burst else max(self.rate, 4 * _MIB)
+        self._tokens = min(self._tokens, self.burst)
+
+    def take(self, n: int, now: float) -> float:
+        if not self.rate:
+            return 0.0
+        if now > self._last:
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+        self._tokens -= n
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+class _Meter:
+    """Bytes per second over the last `window` seconds, in one-second slots."""
+
+    def __init__(self, window: int = 5):
+        self.window = window
+        self._slots = {}
+        self.total = 0
+
+    def add(self, n: int, now: float) -> None:
+        slot = int(now)
+        self._slots[slot] = self._slots.get(slot, 0) + n
+        self.total += n
+        if len(self._slots) > self.window + 1:
+            for old in [s for s in self._slots if s <= slot - self.window]:
+                del self._slots[old]
+
+    def rate(self, now: float) -> float:
+        slot = int(now)
+        return sum(n for s, n in self._slots.items() if slot - self.window < s <= slot) / self.window
+
+
+class _Device:
+    def __init__(self, rate: float, window: int):
+        self.cap = rate
+        self.bucket = TokenBucket(rate)
+        self.meter = _Meter(window)
+        self.latency = None  # EWMA of write seconds per MiB
+        self.adaptive_rate = None  # None while adaptive mode is not holding it back
+        self.adjusted_at = 0.0
+        self.backoffs = 0
+
+
+class IOThrottle:
+    """Token-bucket write throttle shared by all extraction workers of a process.
+
+    Every written chunk is charged to a global bucket and to the bucket of its
+    destination device (st_dev). In adaptive mode, write latency per device is
+    tracked as an EWMA of seconds per MiB; above `latency_target` the device
+    rate is cut to 70% of its measured throughput, below it the rate grows
+    again by 10% of the cap (or of the measured rate) per second until the
+    static limit is back in charge.
+    """
+
+    def __init__(self, rate: float = 0, device_rate: float = 0, device_rates: dict = None,
+                 adaptive: bool = False, latency_target: float = 0.02, min_rate: float = 5 * _MIB,
+                 window: int = 5):
+        self.adaptive = adaptive
+        self.latency_target = latency_target
+        self.min_rate = min_rate
+        self.window = window
+        self.device_rate = device_rate
+        self.device_rates = dict(device_rates or {})
+        self.share = 1.0
+        self._lock = threading.Lock()
+        self._global = TokenBucket(rate)
+        self._global_cap = rate
+        self._meter = _Meter(window)
+        self._devices = {}
+        self._stats = {'throttled': 0, 'slept_seconds': 0.0}
+
+    def set_share(self, share: float) -> None:
+        """Scale every limit, e.g. to split them across worker processes."""
+        with self._lock:
+            self.share = max(0.01, min(1.0, share))
+            self._global.set_rate(self._global_cap * self.share)
+            for dev in self._devices.values():
+                self._apply(dev)
+
+    def _device(self, key) -> _Device:
+        dev = self._devices.get(key)
+        if dev is None:
+            dev = self._devices[key] = _Device(self.device_rates.get(key, self.device_rate), self.window)
+            self._apply(dev)
+        return dev
+
+    def _apply(self, dev: _Device) -> None:
+        rates = [r for r in (dev.cap * self.share, dev.adaptive_rate) if r]
+        dev.bucket.set_rate(min(rates) if rates else 0)
+
+    def limited(self) -> bool:
+        """True when any limit (global, per device or adaptive) can hold writes back."""
+        return bool(self._global_cap or self.device_rate or any(self.device_rates.values()) or self.adaptive)
+
+    def record(self, n: int, device=None) -> None:
+        """Count bytes written elsewhere (e.g. by a worker process) without throttling."""
+        now = time.monotonic()
+        with self._lock:
+            self._meter.add(n, now)
+            self._device(device).meter.add(n, now)
+
+    def consume(self, n: int, device=None) -> float:
+        """Charge n written bytes and sleep as long as the limits require; return the delay."""
+        now = time.monotonic()
+        with self._lock:
+            self._meter.add(n, now)
+            dev = self._device(device)
+            dev.meter.add(n, now)
+            delay = max(self._global.take(n, now), dev.bucket.take(n, now))
+            if delay > 0:
+                self._stats['throttled'] += 1
+                self._stats['slept_seconds'] += delay
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def observe_write(self, n: int, seconds: float, device=None) -> None:
+        """Feed the latency of one write call (n bytes in `seconds`) to adaptive mode."""
+        if not self.adaptive or n <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            dev = self._device(device)
+            sample = seconds * _MIB / n
+            dev.latency = sample if dev.latency is None else 0.8 * dev.latency + 0.2 * sample
+            if now - dev.adjusted_at < 1.0:
+                return
+            dev.adjusted_at = now
+            measured = dev.meter.rate(now)
+            if dev.latency > self.latency_target:
+                current = [r for r in (dev.adaptive_rate, measured) if r]
+                if current:
+                    dev.adaptive_rate = max(self.min_rate, min(current) * 0.7)
+                    dev.backoffs += 1
+                    logger.info(f"Write latency {dev.latency * 1000:.0f} ms/MiB on device {device}; "
+                                f"throttling extraction to {dev.adaptive_rate / _MIB:.1f} MiB/s")
+            elif dev.adaptive_rate is not None:
+                cap = dev.cap * self.share
+                dev.adaptive_rate += max(self.min_rate, 0.1 * (cap or dev.adaptive_rate))
+                if dev.adaptive_rate >= (cap or 2 * measured):
+                    dev.adaptive_rate = None
+            self._apply(dev)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self._stats)
+            stats['bytes_per_second'] = self._meter.rate(now)
+            stats['bytes_total'] = self._meter.total
+            stats['limit'] = self._global.rate
+            stats['adaptive'] = self.adaptive
+            stats['devices'] = {
+                str(key): {
+                    'bytes_per_second': dev.meter.rate(now),
+                    'bytes_total': dev.meter.total,
+                    'limit': dev.bucket.rate,
+                    'latency_ms_per_mib': None if dev.latency is None else round(dev.latency * 1000, 3),
+                    'backoffs': dev.backoffs,
+                }
+                for key, dev in self._devices.items()
+            }
+            return stats
@@ -1,6 +1,17 @@
 import os
+import time
+import atexit
+import sqlite3
+import threading
 from contextlib import contextmanager
-from radarr_extractor.config import TRACKER_FILE, logger
+from radarr_extractor.config import (
+    TRACKER_FILE,
+    TRACKER_BACKEND,
+    TRACKER_DB_FILE,
+    TRACKER_BATCH_SIZE,
+    TRACKER_FLUSH_SEC,
+    logger,
+)
 
 try:
     import fcntl  # POSIX-only
@@ -28,26 +39,460 @@ def _locked_file(path: str, mode: str, lock_type: int):
         finally:
             f.close()
 
+
+# Metadata columns accepted by record_extracted_file(); the flat-file store keeps
+# only the path, the SQLite store persists all of them.
+DETAIL_FIELDS = ('size', 'mtime', 'fingerprint', 'duration', 'bytes_written', 'destination')
+
+
+# Flat-file lines carrying a fingerprint: "#fp\t<fingerprint>\t<path>". Older
+# versions read them as an (unmatchable) path, so the format stays compatible.
+_FP_PREFIX = '#fp\t'
+
+
+def _stat_sig(st):
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class FileTrackerStore:
+    """Append-only `.extracted_files` log with a process-wide in-memory index.
+
+    We keep the byte offset we have consumed and only read the new tail when
+    another process appends. A different inode (file replaced) or a shrink
+    forces a full reload. Fingerprints are kept as tagged lines alongside the
+    plain path lines.
+    """
+
+    name = 'file'
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = set()
+        self._fingerprints = {}
+        self._sig = None  # (st_dev, st_ino, st_size, st_mtime_ns) at last sync
+        self._offset = 0
+        self._stats = {'lookups': 0, 'hits': 0, 'misses': 0, 'full_reloads': 0, 'tail_reads': 0}
+
+    def _read_from(self, offset: int) -> int:
+        """Read complete lines from offset into the index; return the new offset."""
+        lock = fcntl.LOCK_SH if fcntl is not None else 0
+        with _locked_file(self.path, 'rb', lock) as f:
+            f.seek(offset)
+            data = f.read()
+            sig = _stat_sig(os.fstat(f.fileno()))
+        # Only consume up to the last newline; a torn final line is picked up later
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            entry = line.decode('utf-8', errors='replace').strip()
+            if entry.startswith(_FP_PREFIX):
+                fingerprint, _, path = entry[len(_FP_PREFIX):].partition('\t')
+                if path:
+                    self._fingerprints.setdefault(fingerprint, path)
+            elif entry:
+                self._entries.add(entry)
+        # Remember a torn tail as a smaller size so the next check re-reads from there
+        self._sig = sig if end == len(data) else sig[:2] + (offset + end, None)
+        return offset + end
+
+    def _refresh(self) -> bool:
+        """Bring the index in line with the file. Returns True when it was already current."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            if self._sig is not None or self._entries:
+                self._entries.clear()
+                self._fingerprints.clear()
+                self._sig = None
+                self._offset = 0
+            return True
+        sig = _stat_sig(st)
+        if sig == self._sig:
+            return True
+        same_file = self._sig is not None and self._sig[:2] == sig[:2]
+        if same_file and st.st_size > self._offset:
+            self._stats['tail_reads'] += 1
+            self._offset = self._read_from(self._offset)
+        else:
+            self._stats['full_reloads'] += 1
+            logger.debug(f"Reloading tracker file: {self.path}")
+            self._entries.clear()
+            self._fingerprints.clear()
+            self._offset = self._read_from(0)
+        return False
+
+    def load(self):
+        with self._lock:
+            self._refresh()
+            return set(self._entries)
+
+    def contains(self, file_path: str) -> bool:
+        with self._lock:
+            self._stats['lookups'] += 1
+            if self._refresh():
+                self._stats['hits'] += 1
+            else:
+                self._stats['misses'] += 1
+            return file_path in self._entries
+
+    def find_fingerprint(self, fingerprint: str):
+        with self._lock:
+            self._refresh()
+            return self._fingerprints.get(fingerprint)
+
+    def record(self, file_path: str, details: dict) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        line = file_path + '\n'
+        fingerprint = details.get('fingerprint')
+        if fingerprint:
+            line += f"{_FP_PREFIX}{fingerprint}\t{file_path}\n"
+        data = line.encode('utf-8')
+        lock = fcntl.LOCK_EX if fcntl is not None else 0
+        with self._lock:
+            with _locked_file(self.path, 'ab', lock) as f:
+                f.seek(0, os.SEEK_END)
+                start = f.tell()
+                f.write(data)
+                f.flush()
+                sig = _stat_sig(os.fstat(f.fileno()))
+            self._entries.add(file_path)
+            if fingerprint:
+                self._fingerprints.setdefault(fingerprint, file_path)
+            # If nobody else appended since our last sync we can advance in place;
+            # otherwise leave the signature stale so the next lookup reads the tail.
+            if self._sig is not None and self._sig[:2] == sig[:2] and start == self._offset:
+                self._offset = start + len(data)
+                self._sig = sig
+
+    def compact(self) -> None:
+        """Drop duplicate lines in place under an exclusive lock.
+        Rewriting in place (not rename) keeps other writers on the same inode."""
+        if not os.path.exists(self.path):
+            return
+        lock = fcntl.LOCK_EX if fcntl is not None else 0
+        with self._lock:
+            with _locked_file(self.path, 'r+b', lock) as f:
+                lines = f.read().splitlines()
+                seen = set()
+                unique = []
+                for line in lines:
+                    key = line.strip()
+                    if key and key not in seen:
+                        seen.add(key)
+                        unique.append(key)
+                if len(unique) == len(lines):
+                    return
+                f.seek(0)
+                f.write(b''.join(u + b'\n' for u in unique))
+                f.truncate()
+                f.flush()
+            logger.info(f"Compacted tracker file: {len(lines)} -> {len(unique)} lines")
+            self._entries.clear()
+            self._fingerprints.clear()
+            self._sig = None
+            self._offset = 0
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['fingerprints'] = len(self._fingerprints)
+            stats['backend'] = self.name
+            return stats
+
+
+class SqliteTrackerStore:
+    """SQLite (WAL) tracker with per-archive metadata and batched inserts.
+
+    Records are buffered and written in one transaction once TRACKER_BATCH_SIZE
+    rows are pending or TRACKER_FLUSH_SEC has passed; lookups consult the
+    buffer first so a pending record is never reported as missing.
+    """
+
+    name = 'sqlite'
+    _COMPACT_EVERY = 5000
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS extracted_files (
+            path TEXT PRIMARY KEY,
+            size INTEGER,
+            mtime REAL,
+            fingerprint TEXT,
+            duration REAL,
+            bytes_written INTEGER,
+            destination TEXT,
+            recorded_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_extracted_files_fingerprint
+            ON extracted_files (fingerprint) WHERE fingerprint IS NOT NULL;
+        CREATE TABLE IF NOT EXISTS tracker_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+    _COLUMNS = ('path',) + DETAIL_FIELDS + ('recorded_at',)
+
+    def __init__(self, db_path: str, legacy_path: str = None,
+                 batch_size: int = TRACKER_BATCH_SIZE, flush_sec: float = TRACKER_FLUSH_SEC):
+        self.path = db_path
+        self.legacy_path = legacy_path
+        self.batch_size = max(1, batch_size)
+        self.flush_sec = max(0.0, flush_sec)
+        self._lock = threading.RLock()
+        self._pending = {}
+        self._timer = None
+        self._since_compact = 0
+        self._stats = {'lookups': 0, 'pending_hits': 0, 'flushes': 0, 'rows_written': 0,
+                       'migrated': 0, 'compactions': 0}
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        # auto_vacuum only takes effect before the first table is created
+        self._conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        if legacy_path:
+            self._migrate_legacy(legacy_path)
+        self.compact()
+
+    def _meta_get(self, key: str):
+        row = self._conn.execute("SELECT value FROM tracker_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _meta_set(self, key: str, value) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO tracker_meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _migrate_legacy(self, legacy_path: str) -> None:
+        """Import paths (and their fingerprint lines) from the flat tracker file,
+        resuming from the last imported offset. The legacy file is left in place so flat-file instances keep working."""
+        try:
+            st = os.stat(legacy_path)
+        except FileNotFoundError:
+            return
+        ident = f"{st.st_dev}:{st.st_ino}"
+        offset = 0
+        if self._meta_get('legacy_ident') == ident:
+            offset = int(self._meta_get('legacy_offset') or 0)
+        if offset > st.st_size:
+            offset = 0
+        if offset == st.st_size:
+            return
+        lock = fcntl.LOCK_SH if fcntl is not None else 0
+        with _locked_file(legacy_path, 'rb', lock) as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b'\n') + 1
+        now = time.time()
+        rows = []
+        fingerprints = []
+        for line in data[:end].splitlines():
+            entry = line.decode('utf-8', errors='replace').strip()
+            if entry.startswith(_FP_PREFIX):
+                fingerprint, _, path = entry[len(_FP_PREFIX):].partition('\t')
+                if path:
+                    fingerprints.append((fingerprint, path))
+            elif entry:
+                rows.append((entry, now))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO extracted_files (path, recorded_at) VALUES (?, ?)", rows)
+                self._conn.executemany(
+                    "UPDATE extracted_files SET fingerprint = ? WHERE path = ? AND fingerprint IS NULL",
+                    fingerprints)
+                self._meta_set('legacy_ident', ident)
+                self._meta_set('legacy_offset', offset + end)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._stats['migrated'] += len(rows)
+        logger.info(f"Migrated {len(rows)} entries from legacy tracker {legacy_path}")
+
+    def load(self):
+        with self._lock:
+            self.flush()
+            return {row[0] for row in self._conn.execute("SELECT path FROM extracted_files")}
+
+    def contains(self, file_path: str) -> bool:
+        with self._lock:
+            self._stats['lookups'] += 1
+            if file_path in self._pending:
+                self._stats['pending_hits'] += 1
+                return True
+            row = self._conn.execute(
+                "SELECT 1 FROM extracted_files WHERE path = ? LIMIT 1", (file_path,)).fetchone()
+            return row is not None
+
+    def get(self, file_path: str):
+        """Return the stored metadata for a path as a dict, or None."""
+        with self._lock:
+            if file_path in self._pending:
+                return dict(zip(self._COLUMNS, self._pending[file_path]))
+            row = self._conn.execute(
+                f"SELECT {', '.join(self._COLUMNS)} FROM extracted_files WHERE path = ?",
+                (file_path,)).fetchone()
+            return dict(zip(self._COLUMNS, row)) if row else None
+
+    def find_fingerprint(self, fingerprint: str):
+        fp_index = self._COLUMNS.index('fingerprint')
+        with self._lock:
+            for row in self._pending.values():
+                if row[fp_index] == fingerprint:
+                    return row[0]
+            row = self._conn.execute(
+                "SELECT path FROM extracted_files WHERE fingerprint = ? ORDER BY recorded_at LIMIT 1",
+                (fingerprint,)).fetchone()
+            return row[0] if row else None
+
+    def record(self, file_path: str, details: dict) -> None:
+        row = (file_path,) + tuple(details.get(k) for k in DETAIL_FIELDS) + (time.time(),)
+        with self._lock:
+            self._pending[file_path] = row
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_sec, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            rows = list(self._pending.values())
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO extracted_files ({', '.join(self._COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(self._COLUMNS))})", rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._pending.clear()
+            self._stats['flushes'] += 1
+            self._stats['rows_written'] += len(rows)
+            self._since_compact += len(rows)
+            if self._since_compact >= self._COMPACT_EVERY:
+                self.compact()
+
+    def compact(self) -> None:
+        """Online compaction: fold the WAL back into the main file and release free pages."""
+        with self._lock:
+            self.flush()
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.execute("PRAGMA incremental_vacuum")
+                self._conn.execute("PRAGMA optimize")
+                self._stats['compactions'] += 1
+            except sqlite3.Error as e:
+                logger.warning(f"Tracker compaction failed: {e}")
+            self._since_compact = 0
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self.flush()
+            finally:
+                self._conn.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+            stats['entries'] = self._conn.execute("SELECT COUNT(*) FROM extracted_files").fetchone()[0]
+            stats['backend'] = self.name
+            return stats
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def _get_store():
+    global _STORE
+    store = _STORE
+    if store is not None:
+        return store
+    with _STORE_LOCK:
+        if _STORE is None:
+            if TRACKER_BACKEND == 'sqlite':
+                _STORE = SqliteTrackerStore(TRACKER_DB_FILE, legacy_path=TRACKER_FILE)
+            else:
+                if TRACKER_BACKEND != 'file':
+                    logger.warning(f"Unknown TRACKER_BACKEND '{TRACKER_BACKEND}'; using flat file")
+                _STORE = FileTrackerStore(TRACKER_FILE)
+        return _STORE
+
+
+def open_tracker():
+    """Open the configured tracker backend (runs migration/compaction) and return it."""
+    store = _get_store()
+    if store.name == 'file':
+        store.compact()
+    return store
+
+
+def close_tracker():
+    """Flush pending records and release the backend."""
+    global _STORE
+    with _STORE_LOCK:
+        store, _STORE = _STORE, None
+    if store is not None:
+        store.close()
+
+
+atexit.register(close_tracker)
+
+
 def load_extracted_files():
     """Load the list of extracted files from the tracker file."""
-    extracted_files = set()
-    if os.path.exists(TRACKER_FILE):
-        lock = fcntl.LOCK_SH if fcntl is not None else 0
-        with _locked_file(TRACKER_FILE, 'r', lock) as f:
-            for line in f:
-                extracted_files.add(line.strip())
-    return extracted_files
+    return _get_store().load()
+
+
+def record_extracted_file(file_path, **details):
+    """Record a successfully extracted file.
 
-def record_extracted_file(file_path):
-    """Record a successfully extracted file."""
+    Optional keyword details (see DETAIL_FIELDS) are stored by backends that
+    support them and ignored by the flat-file tracker.
+    """
     logger.info(f"Recording extracted file: {file_path}")
-    # Ensure tracker directory exists
-    os.makedirs(os.path.dirname(TRACKER_FILE), exist_ok=True)
-    lock = fcntl.LOCK_EX if fcntl is not None else 0
-    with _locked_file(TRACKER_FILE, 'a', lock) as f:
-        f.write(file_path + '\n')
+    _get_store().record(file_path, details)
+
 
 def is_file_extracted(file_path):
     """Check if a file has already been extracted."""
-    extracted_files = load_extracted_files()
-    return file_path in extracted_files
+    return _get_store().contains(file_path)
+
+
+def find_by_fingerprint(fingerprint):
+    """Return a tracked path recorded with this content fingerprint, or None."""
+    if not fingerprint:
+        return None
+    return _get_store().find_fingerprint(fingerprint)
+
+
+def compact_tracker():
+    """Run compaction on the active backend."""
+    _get_store().compact()
+
+
+def get_tracker_stats():
+    """Return cache counters and current size for status/diagnostics."""
+    return _get_store().stats()
+
+
+def reset_tracker_cache():
+    """Drop the in-memory view so the next lookup reloads from disk."""
+    close_tracker()
@@ -0,0 +1,129 @@
+"""Multi-volume RAR set detection.
+
+Two naming schemes are recognised:
+  * new style: ``movie.part01.rar``, ``movie.part02.rar``, ...
+  * old style: ``movie.rar``, ``movie.r00``, ... ``movie.r99``, ``movie.s00``, ...
+The ``.s00``-``.z99`` continuation is only taken as RAR when ``movie.rar`` is
+present, since split zips (``movie.z01``) and others use the same pattern.
+Only the first volume is ever extracted; the rest of the set is read by the
+RAR reader through it.
+"""
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+_PART_RE = re.compile(r'^(?P<base>.+)\.part(?P<num>\d+)\.rar$', re.IGNORECASE)
+_OLD_RE = re.compile(r'^(?P<base>.+)\.(?P<letter>[r-z])(?P<num>\d{2})$', re.IGNORECASE)
+_RAR_RE = re.compile(r'^(?P<base>.+)\.rar$', re.IGNORECASE)
+
+# Volume sets per directory, reused while the directory's mtime is unchanged
+_SETS_CAPACITY = 64
+# A listing is only cached once the directory mtime is this old, so an entry
+# added within the filesystem's timestamp granularity is never missed
+_SETS_SETTLE_SEC = 2.0
+_SETS = OrderedDict()  # directory -> (mtime_ns, {set key: [(index, path)]})
+_SETS_LOCK = threading.Lock()
+
+
+def _has_rar_head(directory: str, base: str) -> bool:
+    return any(os.path.isfile(os.path.join(directory, base + ext)) for ext in ('.rar', '.RAR'))
+
+
+def volume_info(path: str) -> Optional[Tuple[tuple, int]]:
+    """Return ((dir, base, style), index) for a RAR volume, or None.
+    Index 0 is the first volume of the set."""
+    directory, name = os.path.split(path)
+    m = _PART_RE.match(name)
+    if m:
+        return (directory, m.group('base').lower(), 'part'), max(0, int(m.group('num')) - 1)
+    m = _OLD_RE.match(name)
+    if m and (m.group('letter') in 'rR' or _has_rar_head(directory, m.group('base'))):
+        letter = m.group('letter').lower()
+        index = (ord(letter) - ord('r')) * 100 + int(m.group('num')) + 1
+        return (directory, m.group('base').lower(), 'old'), index
+    m = _RAR_RE.match(name)
+    if m:
+        return (directory, m.group('base').lower(), 'old'), 0
+    return None
+
+
+def is_volume_file(path: str) -> bool:
+    return volume_info(path) is not None
+
+
+def is_first_volume(path: str) -> bool:
+    """True for non-RAR files and for the first volume of a RAR set."""
+    info = volume_info(path)
+    return info is None or info[1] == 0
+
+
+def find_volume_set(path: str) -> List[str]:
+    """Return every volume belonging to path's set, first volume first.
+    Non-RAR paths (or unreadable directories) yield just [path]."""
+    info = volume_info(path)
+    if info is None:
+        return [path]
+    key = info[0]
+    try:
+        members = _volume_sets(key[0]).get(key)
+    except OSError:
+        return [path]
+    if not members:
+        return [path]
+    return [p for _, p in members]
+
+
+def _volume_sets(directory: str) -> dict:
+    """Every RAR set in a directory, from one scandir pass cached by directory mtime."""
+    st = os.stat(directory or '.')
+    with _SETS_LOCK:
+        cached = _SETS.get(directory)
+        if cached is not None and cached[0] == st.st_mtime_ns:
+            _SETS.move_to_end(directory)
+            return cached[1]
+    sets = {}
+    with os.scandir(directory or '.') as it:
+        for entry in it:
+            candidate = os.path.join(directory, entry.name)
+            info = volume_info(candidate)
+            if info is not None and entry.is_file():
+                sets.setdefault(info[0], []).append((info[1], candidate))
+    for members in sets.values():
+        members.sort()
+    if time.time() - st.st_mtime >= _SETS_SETTLE_SEC:
+        with _SETS_LOCK:
+            _SETS[directory] = (st.st_mtime_ns, sets)
+            _SETS.move_to_end(directory)
+            while len(_SETS) > _SETS_CAPACITY:
+                _SETS.popitem(last=False)
+    return sets
+
+
+def first_volume(path: str) -> Optional[str]:
+    """Map any volume to its set's first volume; None if that is not present yet."""
+    info = volume_info(path)
+    if info is None or info[1] == 0:
+        return path
+    members = find_volume_set(path)
+    first = members[0]
+    first_info = volume_info(first)
+    if first_info is not None and first_info[1] == 0:
+        return first
+    return None
+
+
+def volume_set_probe(path: str):
+    """Stability probe covering a whole set: (per-volume sizes, newest mtime).
+    A new volume appearing or any volume growing changes the signature."""
+    os.stat(path)  # the watched volume itself vanishing must surface as OSError
+    members = find_volume_set(path)
+    sizes = []
+    newest = 0.0
+    for member in members:
+        st = os.stat(member)
+        sizes.append((os.path.basename(member), st.st_size))
+        newest = max(newest, st.st_mtime)
+    return tuple(sizes), newest
@@ -0,0 +1,88 @@
+import threading
+from collections import deque
+from radarr_extractor.config import logger
+
+
+class TreeWalker:
+    """Parallel directory walker with per-worker work-stealing deques.
+
+    visit(path) is called once per directory from one of `workers` threads and
+    returns the subdirectories to descend into; it is expected to emit whatever
+    it finds (archives) itself, so consumers start before the walk ends. Each
+    worker pushes and pops its own deque LIFO (depth-first, good locality) and
+    steals FIFO from the others when it runs dry, which keeps every worker busy
+    on trees with a few very large subtrees. On network filesystems this hides
+    the per-readdir round-trip latency that makes a serial os.walk slow.
+    """
+
+    def __init__(self, workers: int = 4):
+        self.workers = max(1, int(workers))
+
+    def walk(self, root: str, visit, prune=None) -> dict:
+        """Walk root; prune(path) -> True skips a directory and its subtree."""
+        queues = [deque() for _ in range(self.workers)]
+        cond = threading.Condition()
+        state = {'outstanding': 1, 'visited': 0, 'stolen': 0, 'pruned': 0, 'errors': 0}
+        queues[0].append(root)
+
+        def take(i):
+            try:
+                return queues[i].pop()
+            except IndexError:
+                pass
+            for k in range(1, self.workers):
+                try:
+                    path = queues[(i + k) % self.workers].popleft()
+                except IndexError:
+                    continue
+                with cond:
+                    state['stolen'] += 1
+                return path
+            return None
+
+        def work(i):
+            while True:
+                path = take(i)
+                if path is None:
+                    with cond:
+                        while state['outstanding'] and path is None:
+                            path = take(i)
+                            if path is None:
+                                cond.wait()
+                        if path is None:
+                            return
+                children = []
+                try:
+                    if prune is not None and prune(path):
+                        with cond:
+                            state['pruned'] += 1
+                    else:
+                        children = list(visit(path) or ())
+                        with cond:
+                            state['visited'] += 1
+                except Exception as e:
+                    logger.warning(f"Error walking {path}: {e}")
+                    with cond:
+                        state['errors'] += 1
+                if children:
+                    # Count the children before publishing them, so a thief that finishes
+                    # one cannot drive outstanding to zero while this parent is still open.
+                    with cond:
+                        state['outstanding'] += len(children)
+                    queues[i].extend(children)
+                with cond:
+                    state['outstanding'] -= 1
+                    if state['outstanding'] == 0 or children:
+                        cond.notify_all()
+
+        if self.workers == 1:
+            work(0)
+        else:
+            threads = [threading.Thread(target=work, args=(i,), name=f"scan-walker-{i}", daemon=True)
+                       for i in range(self.workers)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        del state['outstanding']
+        return state
@@ -8,6 +8,8 @@ setup(
     version='0.1.0',
     packages=find_packages(),
     install_requires=install_requires,
+    # .tar.zst support on Python < 3.14 (backports.zstd works too)
+    extras_require={'zstd': ['zstandard']},
     description='A tool to automatically extract downloaded movie files from Radarr and notify Radarr to rescan the extracted content.',
     author='Your Name',
     author_email='your.email@example.com',
@@ -0,0 +1,161 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.archive_index import ArchiveIndex
+from radarr_extractor.listing import ListingCache
+
+
+class TestArchiveIndex(unittest.TestCase):
+
+    def test_signature_change_reloads(self):
+        loads = []
+        index = ArchiveIndex(lambda path: loads.append(path) or {'n': len(loads)})
+        self.assertIsNone(index.peek('/a.zip', (1, 1)))
+        self.assertEqual(index.get('/a.zip', (1, 1)), {'n': 1})
+        self.assertEqual(index.get('/a.zip', (1, 1)), {'n': 1})
+        self.assertEqual(index.peek('/a.zip', (1, 1)), {'n': 1})
+        self.assertIsNone(index.peek('/a.zip', (2, 1)))
+        self.assertEqual(index.get('/a.zip', (2, 1)), {'n': 2})
+        stats = index.stats()
+        self.assertEqual((stats['misses'], stats['stale']), (2, 1))
+
+    def test_lru_eviction(self):
+        index = ArchiveIndex(lambda path: {'path': path}, capacity=2)
+        index.get('/a', 0)
+        index.get('/b', 0)
+        index.get('/a', 0)  # /a is now the most recently used
+        index.get('/c', 0)
+        self.assertIsNotNone(index.peek('/a', 0))
+        self.assertIsNone(index.peek('/b', 0))
+        self.assertEqual(index.stats()['evicted'], 1)
+
+
+class TestArchiveSummaries(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.archive = os.path.join(self.temp_dir, 'movie.zip')
+        with zipfile.ZipFile(self.archive, 'w') as zf:
+            zf.writestr('Movie/movie.mkv', b'm' * 1000)
+            zf.writestr('Movie/movie.srt', b's' * 100)
+            zf.writestr('Movie/movie.nfo', b'n' * 10)
+            zf.writestr('Movie/sample-movie.mkv', b'x' * 500)
+
+    def test_summary_honours_member_filter(self):
+        summary = core._summarize_archive(self.archive)
+        self.assertEqual(summary['members'], 4)
+        self.assertEqual(summary['size'], 1610)
+        self.assertEqual(summary['extract_members'], 2)
+        self.assertEqual(summary['extract_size'], 1100)
+        self.assertTrue(summary['has_media'])
+
+    def test_list_tar_members(self):
+        import tarfile
+        tar_path = os.path.join(self.temp_dir, 'movie.tar.gz')
+        payload = os.path.join(self.temp_dir, 'movie.mkv')
+        with open(payload, 'wb') as f:
+            f.write(b'v' * 321)
+        with tarfile.open(tar_path, 'w:gz') as tf:
+            tf.add(payload, arcname='movie.mkv')
+        self.assertEqual(core.list_archive_members(tar_path), [('movie.mkv', 321)])
+
+    def test_broken_archive_is_reported(self):
+        broken = os.path.join(self.temp_dir, 'broken.zip')
+        with open(broken, 'wb') as f:
+            f.write(b'not a zip')
+        self.assertIn('error', core._summarize_archive(broken))
+
+    def test_cached_until_archive_changes(self):
+        with patch.object(core, '_ARCHIVE_INDEX', ArchiveIndex(core._summarize_archive)):
+            self.assertIsNone(core.get_archive_index(self.archive, load=False))
+            first = core.get_archive_index(self.archive)
+            self.assertIs(core.get_archive_index(self.archive, load=False), first)
+            with zipfile.ZipFile(self.archive, 'a') as zf:
+                zf.writestr('Movie/extra.mkv', b'e' * 50)
+            st = os.stat(self.archive)
+            os.utime(self.archive, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+            self.assertIsNone(core.get_archive_index(self.archive, load=False))
+            self.assertEqual(core.get_archive_index(self.archive)['members'], 5)
+
+
+class TestBrowseIndex(unittest.TestCase):
+
+    def setUp(self):
+        from radarr_extractor import main
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        patcher = patch.object(main, 'DOWNLOAD_DIR', self.temp_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch.object(core, '_ARCHIVE_INDEX', ArchiveIndex(core._summarize_archive))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = main.app.test_client()
+        with zipfile.ZipFile(os.path.join(self.temp_dir, 'movie.zip'), 'w') as zf:
+            zf.writestr('movie.mkv', b'm' * 2048)
+
+    def test_listing_carries_cached_summary(self):
+        entry = self.client.get('/api/list').get_json()['entries'][0]
+        self.assertIsNone(entry['index'])
+        resp = self.client.get('/archive-index?path=movie.zip')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json()['extract_members'], 1)
+        entry = self.client.get('/api/list').get_json()['entries'][0]
+        self.assertEqual(entry['index']['extract_size'], 2048)
+
+    def test_archive_index_rejects_other_paths(self):
+        self.assertEqual(self.client.get('/archive-index?path=../etc/passwd').status_code, 400)
+        self.assertEqual(self.client.get('/archive-index?path=missing.zip').status_code, 400)
+
+
+class TestListingSignatures(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        for patcher in (patch.object(core, '_ARCHIVE_INDEX', ArchiveIndex(lambda path: {'members': 1})),
+                        patch.object(core, '_LISTINGS', ListingCache(60)),
+                        patch.object(core, 'is_file_extracted', return_value=False)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _touch(self, *names):
+        for name in names:
+            with open(os.path.join(self.temp_dir, name), 'wb') as f:
+                f.write(name.encode())
+
+    def _scandirs_for_page(self, **kwargs):
+        with patch('os.scandir', wraps=os.scandir) as scandir:
+            page = core.list_directory(self.temp_dir, limit=20, **kwargs)
+        return scandir.call_count, page
+
+    def test_volume_signatures_come_from_the_listing(self):
+        """A page of RAR sets costs one scandir (the listing) whatever the directory size."""
+        self._touch(*[f'movie{i:03}.rar' for i in range(200)])
+        self._touch('set.part1.rar', 'set.part2.rar')
+        core.get_archive_index(os.path.join(self.temp_dir, 'movie000.rar'))
+        core.get_archive_index(os.path.join(self.temp_dir, 'set.part1.rar'))
+        scans, page = self._scandirs_for_page()
+        self.assertEqual(scans, 1)
+        self.assertEqual(page['entries'][0]['index'], {'members': 1})
+        self.assertIsNone(page['entries'][1]['index'])
+        scans, page = self._scandirs_for_page(cursor=page['next_cursor'])
+        self.assertEqual(scans, 0)
+        page = core.list_directory(self.temp_dir, limit=300)
+        entries = {e['name']: e for e in page['entries']}
+        self.assertEqual(entries['set.part1.rar']['index'], {'members': 1})
+        self.assertEqual(entries['set.part2.rar']['index'], {'volume': True})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import tempfile
+import os
+import shutil
+import sys
+import zipfile
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor.backends import SystemFastBackend, BackendUnavailable, UnsafeArchiveError
+from radarr_extractor.core import _is_safe_path, _should_extract_member, extract_archive, get_last_extract_stats
+
+
+@unittest.skipUnless(shutil.which('bsdtar'), "bsdtar not installed")
+class TestSystemFastBackend(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.dest = os.path.join(self.temp_dir, 'out')
+        self.backend = SystemFastBackend()
+
+    def _zip(self, members):
+        path = os.path.join(self.temp_dir, 'test.zip')
+        with zipfile.ZipFile(path, 'w') as zf:
+            for name, data in members.items():
+                zf.writestr(name, data)
+        return path
+
+    def test_extracts_filtered_members(self):
+        """Media is extracted, junk and samples are filtered, staging is removed."""
+        path = self._zip({'movie/movie.mkv': b'x' * 100, 'movie/info.nfo': b'n',
+                          'movie/sample.mkv': b's'})
+        written = self.backend.extract(path, self.dest, 'zip', _should_extract_member, _is_safe_path)
+        self.assertEqual(written, 100)
+        self.assertEqual(os.listdir(self.dest), ['movie'])
+        self.assertEqual(os.listdir(os.path.join(self.dest, 'movie')), ['movie.mkv'])
+
+    def test_rejects_traversal_before_extracting(self):
+        path = self._zip({'../evil.mkv': b'e'})
+        with self.assertRaises(UnsafeArchiveError):
+            self.backend.extract(path, self.dest, 'zip', _should_extract_member, _is_safe_path)
+        self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'evil.mkv')))
+
+    def test_unavailable_tool(self):
+        with patch.object(self.backend, '_find', return_value=None):
+            with self.assertRaises(BackendUnavailable):
+                self.backend.select_tool('zip')
+
+    def test_extract_archive_falls_back_to_python(self):
+        """With no external tool, extract_archive uses the python backend."""
+        path = self._zip({'movie.mkv': b'x' * 10})
+        with patch('radarr_extractor.core.EXTRACT_BACKEND', 'system_fast'), \
+                patch('radarr_extractor.backends.SystemFastBackend._find', return_value=None):
+            extract_dir = extract_archive(path)
+        self.assertTrue(os.path.exists(os.path.join(extract_dir, 'movie.mkv')))
+        self.assertEqual(get_last_extract_stats()['backend'], 'python')
+
+    def test_extract_archive_system_fast(self):
+        path = self._zip({'movie.mkv': b'x' * 10})
+        with patch('radarr_extractor.core.EXTRACT_BACKEND', 'system_fast'):
+            extract_dir = extract_archive(path)
+        self.assertTrue(os.path.exists(os.path.join(extract_dir, 'movie.mkv')))
+        stats = get_last_extract_stats()
+        self.assertEqual(stats['backend'], 'system_fast')
+        self.assertEqual(stats['bytes_written'], 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
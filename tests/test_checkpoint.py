@@ -0,0 +1,107 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.checkpoint import ExtractionCheckpoint
+
+
+class TestResumableExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.dest = os.path.join(self.temp_dir, 'out')
+        os.makedirs(self.dest)
+        self.members = {'a.mkv': b'a' * 5000, 'b.mkv': b'b' * 7000, 'c.mkv': b'c' * 9000}
+
+    def _make_zip(self):
+        path = os.path.join(self.temp_dir, 'movie.zip')
+        with zipfile.ZipFile(path, 'w') as zf:
+            for name, data in self.members.items():
+                zf.writestr(name, data)
+        return path
+
+    def _make_7z(self):
+        import py7zr
+        path = os.path.join(self.temp_dir, 'movie.7z')
+        with py7zr.SevenZipFile(path, 'w') as z:
+            for name, data in self.members.items():
+                z.writestr(data, name)
+        return path
+
+    def _interrupt_then_resume(self, extract, archive, fail_on='b.mkv'):
+        real_commit = ExtractionCheckpoint.commit
+
+        def flaky_commit(ckpt, name, *args):
+            if name == fail_on:
+                raise OSError("container stopped")
+            return real_commit(ckpt, name, *args)
+
+        with patch.object(ExtractionCheckpoint, 'commit', flaky_commit):
+            with self.assertRaises(OSError):
+                extract(archive, self.dest)
+        ckpt = ExtractionCheckpoint(archive, self.dest)
+        self.assertTrue(os.path.exists(ckpt.path))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, fail_on)))
+
+        written = []
+        with patch('radarr_extractor.core._account_bytes', written.append):
+            extract(archive, self.dest)
+        for name, data in self.members.items():
+            with open(os.path.join(self.dest, name), 'rb') as f:
+                self.assertEqual(f.read(), data)
+        self.assertFalse(os.path.exists(ckpt.path))
+        self.assertEqual([n for n in os.listdir(self.dest) if n.endswith('.partial')], [])
+        return written
+
+    def test_zip_resumes_after_interruption(self):
+        archive = self._make_zip()
+        written = self._interrupt_then_resume(core._safe_extract_zip, archive)
+        # a.mkv was completed before the interruption and is not written again
+        self.assertEqual(sum(written), len(self.members['b.mkv']) + len(self.members['c.mkv']))
+
+    def test_7z_resumes_after_interruption(self):
+        try:
+            archive = self._make_7z()
+        except ImportError:
+            self.skipTest("py7zr not installed")
+        written = self._interrupt_then_resume(core._safe_extract_7z, archive)
+        self.assertEqual(sum(written), len(self.members['b.mkv']) + len(self.members['c.mkv']))
+
+    def test_changed_archive_is_not_resumed(self):
+        archive = self._make_zip()
+        ckpt = ExtractionCheckpoint(archive, self.dest)
+        open(os.path.join(self.dest, 'a.mkv'), 'wb').write(self.members['a.mkv'])
+        ckpt._members['a.mkv'] = [5000, zipfile.ZipFile(archive).getinfo('a.mkv').CRC]
+        ckpt._dirty = True
+        ckpt.save()
+        self.assertTrue(ExtractionCheckpoint(archive, self.dest).is_done(
+            'a.mkv', os.path.join(self.dest, 'a.mkv'), 5000, ckpt._members['a.mkv'][1]))
+        st = os.stat(archive)
+        os.utime(archive, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        self.assertFalse(ExtractionCheckpoint(archive, self.dest).is_done(
+            'a.mkv', os.path.join(self.dest, 'a.mkv'), 5000, ckpt._members['a.mkv'][1]))
+
+    def test_damaged_member_is_not_resumed(self):
+        archive = self._make_zip()
+        crc = zipfile.ZipFile(archive).getinfo('a.mkv').CRC
+        out_path = os.path.join(self.dest, 'a.mkv')
+        ckpt = ExtractionCheckpoint(archive, self.dest)
+        open(out_path, 'wb').write(self.members['a.mkv'])
+        ckpt._members['a.mkv'] = [5000, crc]
+        self.assertTrue(ckpt.is_done('a.mkv', out_path, 5000, crc))
+        # Same size, different content: the CRC check catches it
+        open(out_path, 'wb').write(b'x' * 5000)
+        self.assertFalse(ckpt.is_done('a.mkv', out_path, 5000, crc))
+
+
+if __name__ == '__main__':
+    unittest.main()
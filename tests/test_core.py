@@ -36,6 +36,8 @@ class TestCore(unittest.TestCase):
         self.assertTrue(is_compressed_file("test.tar"))
         self.assertTrue(is_compressed_file("test.tgz"))
         self.assertTrue(is_compressed_file("test.tbz2"))
+        self.assertTrue(is_compressed_file("test.tar.xz"))
+        self.assertTrue(is_compressed_file("test.tar.zst"))
         
         # Test case insensitive
         self.assertTrue(is_compressed_file("TEST.RAR"))
@@ -113,6 +115,48 @@ class TestCore(unittest.TestCase):
             with open(extracted_file, 'r') as f:
                 self.assertEqual(f.read(), test_content)
     
+    def _make_tar(self, name, mode, fileobj=None):
+        """Build a tarball containing a single media file."""
+        test_tar = os.path.join(self.temp_dir, name)
+        src = os.path.join(self.temp_dir, "src.mkv")
+        with open(src, 'wb') as f:
+            f.write(b"movie data" * 100)
+        if fileobj is None:
+            with tarfile.open(test_tar, mode) as tf:
+                tf.add(src, arcname="movie/movie.mkv")
+        else:
+            with fileobj(test_tar) as raw, tarfile.open(fileobj=raw, mode=mode) as tf:
+                tf.add(src, arcname="movie/movie.mkv")
+        os.remove(src)
+        return test_tar
+
+    def test_extract_archive_tar_xz(self):
+        """Test streaming TAR.XZ extraction."""
+        test_tar = self._make_tar("test.tar.xz", 'w:xz')
+        extract_dir = extract_archive(test_tar)
+        with open(os.path.join(extract_dir, "movie", "movie.mkv"), 'rb') as f:
+            self.assertEqual(f.read(), b"movie data" * 100)
+
+    def test_extract_archive_tar_zst(self):
+        """Test streaming TAR.ZST extraction when a zstd module is available."""
+        try:
+            from backports import zstd
+        except ImportError:
+            self.skipTest("backports.zstd not installed")
+        test_tar = self._make_tar("test.tar.zst", 'w|', fileobj=lambda p: zstd.open(p, 'wb'))
+        extract_dir = extract_archive(test_tar)
+        self.assertTrue(os.path.exists(os.path.join(extract_dir, "movie", "movie.mkv")))
+
+    def test_extract_tar_rejects_traversal(self):
+        """Members escaping the destination are refused while streaming."""
+        test_tar = os.path.join(self.temp_dir, "evil.tar.gz")
+        with tarfile.open(test_tar, 'w:gz') as tf:
+            info = tarfile.TarInfo("../escape.mkv")
+            tf.addfile(info)
+        with self.assertRaises(Exception) as context:
+            extract_archive(test_tar)
+        self.assertIn("Unsafe tar member path", str(context.exception))
+
     def test_extract_archive_unsupported(self):
         """Test unsupported archive format."""
         test_file = os.path.join(self.temp_dir, "test.unsupported")
@@ -143,7 +187,9 @@ class TestCore(unittest.TestCase):
         # Verify calls
         mock_is_extracted.assert_called_once_with(test_file)
         mock_extract.assert_called_once_with(test_file)
-        mock_record.assert_called_once_with(test_file)
+        mock_record.assert_called_once()
+        self.assertEqual(mock_record.call_args.args, (test_file,))
+        self.assertEqual(mock_record.call_args.kwargs['destination'], "/extracted/path")
         mock_notify.assert_called_once_with("/extracted/path")
     
     @patch('radarr_extractor.core.is_file_extracted')
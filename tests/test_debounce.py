@@ -0,0 +1,51 @@
+import unittest
+import os
+import sys
+import time
+import threading
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor.debounce import EventDebouncer
+
+
+class TestEventDebouncer(unittest.TestCase):
+
+    def setUp(self):
+        self.dispatched = []
+        self.done = threading.Event()
+
+        def callback(path):
+            self.dispatched.append(path)
+            self.done.set()
+
+        self.debouncer = EventDebouncer(callback, 0.2)
+        self.addCleanup(self.debouncer.stop)
+
+    def test_coalesces_burst_into_single_dispatch(self):
+        """Repeated events for one path result in one callback."""
+        for _ in range(50):
+            self.debouncer.touch('/downloads/a.rar')
+        self.assertEqual(self.debouncer.stats()['queue_depth'], 1)
+        self.assertTrue(self.done.wait(2))
+        time.sleep(0.3)
+        self.assertEqual(self.dispatched, ['/downloads/a.rar'])
+        stats = self.debouncer.stats()
+        self.assertEqual(stats['events'], 50)
+        self.assertEqual(stats['coalesced'], 49)
+        self.assertEqual(stats['queue_depth'], 0)
+
+    def test_new_event_rearms_timer(self):
+        """A path keeps waiting while events keep arriving."""
+        self.debouncer.touch('/downloads/a.rar')
+        for _ in range(4):
+            time.sleep(0.1)
+            self.debouncer.touch('/downloads/a.rar')
+        self.assertEqual(self.dispatched, [])
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(self.dispatched, ['/downloads/a.rar'])
+
+
+if __name__ == '__main__':
+    unittest.main()
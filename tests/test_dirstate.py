@@ -0,0 +1,79 @@
+import unittest
+import os
+import sys
+import tempfile
+import shutil
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.dirstate import DirStateCache
+
+
+class TestDirStateScan(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.test_dir, '.dirstate.json')
+        self.root = os.path.join(self.test_dir, 'downloads')
+        os.makedirs(os.path.join(self.root, 'movie1'))
+        os.makedirs(os.path.join(self.root, 'movie2', 'sub'))
+        open(os.path.join(self.root, 'movie1', 'a.zip'), 'w').close()
+        open(os.path.join(self.root, 'movie2', 'sub', 'b.rar'), 'w').close()
+        open(os.path.join(self.root, 'movie2', 'b.part02.rar'), 'w').close()
+        self.cache_patch = patch.object(core, '_DIRSTATE', DirStateCache(self.cache_file))
+        self.cache_patch.start()
+
+    def tearDown(self):
+        self.cache_patch.stop()
+        shutil.rmtree(self.test_dir)
+
+    def _scan(self, **kwargs):
+        # mkdtemp lives under /tmp, which the scanner treats as a temp directory
+        with patch('radarr_extractor.core._submit_process') as mock_submit, \
+                patch('radarr_extractor.core.is_temp_directory', return_value=False):
+            summary = core.scan_directory(self.root, **kwargs)
+        return summary, sorted(c.args[0] for c in mock_submit.call_args_list)
+
+    def test_second_scan_uses_cache(self):
+        first, found = self._scan()
+        self.assertEqual(first['listed'], 4)
+        self.assertEqual(found, [os.path.join(self.root, 'movie1', 'a.zip'),
+                                 os.path.join(self.root, 'movie2', 'sub', 'b.rar')])
+        self.assertTrue(os.path.exists(self.cache_file))
+
+        # A fresh cache object reads the persisted state
+        core._DIRSTATE = DirStateCache(self.cache_file)
+        second, found_again = self._scan()
+        self.assertEqual(second['listed'], 0)
+        self.assertEqual(second['cached'], 4)
+        self.assertEqual(found_again, found)
+
+    def test_new_file_is_detected(self):
+        self._scan()
+        new_file = os.path.join(self.root, 'movie1', 'c.7z')
+        open(new_file, 'w').close()
+        st = os.stat(os.path.join(self.root, 'movie1'))
+        os.utime(os.path.join(self.root, 'movie1'), ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        summary, found = self._scan()
+        self.assertEqual(summary['listed'], 1)
+        self.assertIn(new_file, found)
+
+    def test_force_lists_everything(self):
+        self._scan()
+        summary, _ = self._scan(force=True)
+        self.assertEqual(summary['listed'], 4)
+        self.assertEqual(summary['cached'], 0)
+
+    def test_removed_directory_is_pruned(self):
+        self._scan()
+        self.assertEqual(len(core._DIRSTATE), 4)
+        shutil.rmtree(os.path.join(self.root, 'movie2', 'sub'))
+        self._scan()
+        self.assertEqual(len(core._DIRSTATE), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from types import SimpleNamespace
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.archive_index import ArchiveIndex
+from radarr_extractor.diskspace import DiskSpacePlanner, Reservation
+from radarr_extractor.jobs import JobQueue
+
+
+class FakeDisk:
+    """statvfs stand-in with 1-byte blocks."""
+
+    def __init__(self, free: int, total: int = 10 ** 9):
+        self.free = free
+        self.total = total
+
+    def __call__(self, path):
+        return SimpleNamespace(f_bavail=self.free, f_frsize=1, f_blocks=self.total)
+
+
+class TestDiskSpacePlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def test_reservations_count_against_free_space(self):
+        disk = FakeDisk(1000)
+        planner = DiskSpacePlanner(100, statvfs=disk)
+        first, available = planner.reserve('/a.rar', self.temp_dir, 600)
+        self.assertIsNotNone(first)
+        self.assertEqual(available, 900)
+        # 1000 free - 600 promised - 100 reserve leaves 300
+        second, available = planner.reserve('/b.rar', self.temp_dir, 400)
+        self.assertIsNone(second)
+        self.assertEqual(available, 300)
+        # Bytes already written are reflected in free space, not double counted
+        first.written = 500
+        disk.free = 500
+        self.assertIsNotNone(planner.reserve('/b.rar', self.temp_dir, 250)[0])
+        self.assertEqual(planner.stats()['reserved'], 100 + 250)
+
+    def test_deferred_archives_are_released_as_space_frees(self):
+        disk = FakeDisk(300)
+        planner = DiskSpacePlanner(0, statvfs=disk)
+        planner.defer('/old.rar', self.temp_dir, 200)
+        planner.defer('/new.rar', self.temp_dir, 200)
+        self.assertEqual(planner.recheck(), ['/old.rar'])
+        self.assertEqual([d['path'] for d in planner.deferred()], ['/new.rar'])
+        disk.free = 1000
+        self.assertEqual(planner.recheck(), ['/new.rar'])
+        self.assertEqual(planner.stats()['resubmitted'], 2)
+
+    def test_resubmit_keeps_the_source(self):
+        """The recheck thread hands a deferral back with the source it was queued under."""
+        disk = FakeDisk(100)
+        resubmitted = []
+        done = threading.Event()
+
+        def resubmit(key, source):
+            resubmitted.append((key, source))
+            done.set()
+
+        planner = DiskSpacePlanner(0, recheck_sec=1, resubmit=resubmit, statvfs=disk)
+        planner.defer('/a.rar', self.temp_dir, 500, 'webhook')
+        self.assertEqual(planner.deferred()[0]['source'], 'webhook')
+        disk.free = 1000
+        self.assertTrue(done.wait(3))
+        self.assertEqual(resubmitted, [('/a.rar', 'webhook')])
+
+    def test_unknown_destination_is_admitted(self):
+        planner = DiskSpacePlanner(0, statvfs=FakeDisk(0))
+        reservation, available = planner.reserve('/a.rar', os.path.join(self.temp_dir, 'missing'), 10)
+        self.assertIsNotNone(reservation)
+        self.assertIsNone(available)
+
+
+class TestProcessFileSpaceCheck(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.archive = os.path.join(self.temp_dir, 'movie.zip')
+        with zipfile.ZipFile(self.archive, 'w') as zf:
+            zf.writestr('movie.mkv', b'm' * 5000)
+            zf.writestr('movie.nfo', b'n' * 100000)
+        for patcher in (patch.object(core, 'is_temp_directory', return_value=False),
+                        patch.object(core, 'is_file_extracted', return_value=False),
+                        patch.object(core, 'record_extracted_file'),
+                        patch.object(core, 'notify_radarr'),
+                        patch.object(core, 'FINGERPRINT_DEDUP', False),
+                        patch.object(core, 'EXTRACT_MODE', 'inplace'),
+                        patch.object(core, '_ARCHIVE_INDEX', ArchiveIndex(core._summarize_archive))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_planned_size_uses_filtered_members(self):
+        self.assertEqual(core._planned_size(self.archive), (5000, True))
+
+    def test_compressed_tarball_is_estimated_without_reading_it(self):
+        import tarfile
+        tar_path = os.path.join(self.temp_dir, 'movie.tar.gz')
+        with tarfile.open(tar_path, 'w:gz') as tf:
+            tf.add(self.archive, arcname='movie.zip')
+        size = os.path.getsize(tar_path)
+        with patch.object(core, 'list_archive_members') as members, \
+                patch.object(core, 'DISK_COMPRESSED_RATIO', 3.0):
+            self.assertEqual(core._planned_size(tar_path), (size * 3, False))
+            # The estimate is capped at what the filesystem could ever hold
+            planner = DiskSpacePlanner(0, statvfs=FakeDisk(0, total=size))
+            with patch.object(core, '_DISK', planner):
+                result = core._reserve_space(tar_path)[1]
+        members.assert_not_called()
+        self.assertEqual(result['status'], 'deferred')
+        self.assertEqual(planner.deferred()[0]['needed'], size)
+
+    def test_defers_until_space_frees(self):
+        disk = FakeDisk(4000)
+        planner = DiskSpacePlanner(0, statvfs=disk)
+        with patch.object(core, '_DISK', planner), patch.object(core, 'extract_archive') as extract:
+            result = core.process_file(self.archive)
+            self.assertEqual(result['status'], 'deferred')
+            extract.assert_not_called()
+            self.assertEqual(planner.deferred()[0]['needed'], 5000)
+            disk.free = 6000
+            self.assertEqual(planner.recheck(), [self.archive])
+            extract.return_value = self.temp_dir
+            self.assertEqual(core.process_file(self.archive)['status'], 'extracted')
+        self.assertEqual(planner.stats()['running'], 0)
+
+    def test_archive_larger_than_filesystem_fails(self):
+        planner = DiskSpacePlanner(0, statvfs=FakeDisk(100, total=1000))
+        with patch.object(core, '_DISK', planner), patch.object(core, 'extract_archive') as extract:
+            result = core.process_file(self.archive)
+        self.assertEqual(result['status'], 'failed')
+        extract.assert_not_called()
+        self.assertEqual(planner.deferred(), [])
+
+    def test_deferred_job_runs_again_to_completion(self):
+        """A deferred job is requeued as itself and ends up done, not stuck."""
+        disk = FakeDisk(4000)
+        planner = DiskSpacePlanner(0, statvfs=disk)
+        jobs = JobQueue(core._run_job, workers=1, capacity=5)
+        with patch.object(core, '_DISK', planner), patch.object(core, '_JOBS', jobs), \
+                patch.object(core, '_DEFERRED_JOBS', {}), \
+                patch.object(core, 'extract_archive', return_value=self.temp_dir), \
+                patch.object(core, '_submit_process') as submit:
+            job = jobs.submit(self.archive, 'webhook', 0)
+            self.assertEqual(self._wait_finished(job), 'deferred')
+            self.assertEqual(planner.deferred()[0]['source'], 'webhook')
+            disk.free = 6000
+            for key in planner.recheck():
+                core._resubmit_deferred(key, 'webhook')
+            self.assertEqual(self._wait_finished(job), 'done')
+        submit.assert_not_called()
+        status = job.to_dict()
+        self.assertEqual(status['requeues'], 1)
+        self.assertIsNotNone(status['requeued_at'])
+
+    def _wait_finished(self, job, timeout=5):
+        deadline = time.time() + timeout
+        while not job.finished and time.time() < deadline:
+            time.sleep(0.02)
+        return job.to_dict()['state']
+
+    def test_failed_system_fast_attempt_releases_written_bytes(self):
+        reservation = Reservation(self.archive, None, 5000)
+
+        def extract(*args, on_bytes, **kwargs):
+            on_bytes(3000)
+            raise RuntimeError("unrar crashed")
+
+        backend = SimpleNamespace(extract=extract)
+        core._EXTRACT_STATS.current = {'bytes_written': 0}
+        core._EXTRACT_STATS.reservation = reservation
+        try:
+            with patch.object(core, 'get_system_fast_backend', return_value=backend):
+                self.assertFalse(core._extract_system_fast(self.archive, self.temp_dir, 'zip'))
+        finally:
+            core._EXTRACT_STATS.current = None
+            core._EXTRACT_STATS.reservation = None
+        self.assertEqual(reservation.written, 0)
+        self.assertEqual(reservation.outstanding(), 5000)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import errno
+import os
+import sys
+import shutil
+import tempfile
+import zipfile
+import zlib
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core, fastcopy
+
+
+class TestFastCopy(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.data = os.urandom(3 * 1024 * 1024 + 17)
+        self.src = os.path.join(self.temp_dir, 'src.bin')
+        with open(self.src, 'wb') as f:
+            f.write(self.data)
+
+    def _copy(self, offset, count):
+        dst = os.path.join(self.temp_dir, 'dst.bin')
+        copied = []
+        with open(self.src, 'rb') as s, open(dst, 'wb') as d:
+            fastcopy.copy_range(s.fileno(), d.fileno(), offset, count, copied.append, 64 * 1024)
+        with open(dst, 'rb') as f:
+            return f.read(), sum(copied)
+
+    def test_copy_range_from_offset(self):
+        out, accounted = self._copy(1000, 2 * 1024 * 1024)
+        self.assertEqual(out, self.data[1000:1000 + 2 * 1024 * 1024])
+        self.assertEqual(accounted, len(out))
+
+    def test_falls_back_when_kernel_copy_unsupported(self):
+        def unsupported(*args, **kwargs):
+            raise OSError(errno.EXDEV, "cross-device")
+        with patch('os.copy_file_range', unsupported, create=True), \
+                patch('os.sendfile', unsupported, create=True):
+            out, _ = self._copy(5, 1024 * 1024)
+        self.assertEqual(out, self.data[5:5 + 1024 * 1024])
+
+    def test_short_source_raises(self):
+        with self.assertRaises(OSError):
+            self._copy(len(self.data) - 10, 100)
+
+    def test_stored_zip_member_uses_range_copy(self):
+        archive = os.path.join(self.temp_dir, 'movie.zip')
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('stored.mkv', self.data, compress_type=zipfile.ZIP_STORED)
+            zf.writestr('deflated.mkv', self.data[:100000], compress_type=zipfile.ZIP_DEFLATED)
+        dest = os.path.join(self.temp_dir, 'out')
+        os.makedirs(dest)
+        with patch('radarr_extractor.core.copy_range', wraps=fastcopy.copy_range) as spy:
+            core._safe_extract_zip(archive, dest)
+        self.assertEqual(spy.call_count, 1)
+        with open(os.path.join(dest, 'stored.mkv'), 'rb') as f:
+            self.assertEqual(f.read(), self.data)
+        with open(os.path.join(dest, 'deflated.mkv'), 'rb') as f:
+            self.assertEqual(f.read(), self.data[:100000])
+
+    def test_stored_zip_member_crc_mismatch_fails(self):
+        archive = os.path.join(self.temp_dir, 'movie.zip')
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('stored.mkv', self.data, compress_type=zipfile.ZIP_STORED)
+        with open(archive, 'r+b') as f:
+            f.seek(30 + len('stored.mkv') + 1000)  # inside the member data, headers intact
+            byte = f.read(1)
+            f.seek(-1, os.SEEK_CUR)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        dest = os.path.join(self.temp_dir, 'out')
+        os.makedirs(dest)
+        with self.assertRaisesRegex(Exception, 'CRC mismatch'):
+            core._safe_extract_zip(archive, dest)
+        self.assertFalse(os.path.exists(os.path.join(dest, 'stored.mkv')))
+        self.assertFalse(os.path.exists(os.path.join(dest, 'stored.mkv.partial')))
+
+    def test_file_crc32(self):
+        self.assertEqual(fastcopy.file_crc32(self.src, 64 * 1024), zlib.crc32(self.data))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.fingerprint import compute_fingerprint, EDGE_BYTES
+
+
+class TestFingerprint(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def _write(self, name, data):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_same_content_same_fingerprint(self):
+        data = os.urandom(3 * 1024 * 1024)
+        a = self._write('a.rar', data)
+        b = self._write('b.rar', data)
+        self.assertEqual(compute_fingerprint(a), compute_fingerprint(b))
+        self.assertTrue(compute_fingerprint(a).startswith(f"v1:{len(data)}:"))
+
+    def test_changes_in_head_or_tail_change_fingerprint(self):
+        data = bytearray(os.urandom(3 * 1024 * 1024))
+        a = self._write('a.rar', bytes(data))
+        data[EDGE_BYTES // 2] ^= 0xFF
+        b = self._write('b.rar', bytes(data))
+        data[EDGE_BYTES // 2] ^= 0xFF
+        data[-10] ^= 0xFF
+        c = self._write('c.rar', bytes(data))
+        self.assertEqual(len({compute_fingerprint(p) for p in (a, b, c)}), 3)
+
+    @patch('radarr_extractor.core.is_temp_directory', return_value=False)
+    @patch('radarr_extractor.core.notify_radarr')
+    @patch('radarr_extractor.core.record_extracted_file')
+    @patch('radarr_extractor.core.extract_archive')
+    @patch('radarr_extractor.core.is_file_extracted', return_value=False)
+    def test_process_file_skips_duplicate(self, _is_extracted, mock_extract, mock_record, mock_notify, _is_temp):
+        path = self._write('moved.zip', os.urandom(1024))
+        with patch('radarr_extractor.core.find_by_fingerprint', return_value='/downloads/old/orig.zip'):
+            result = core.process_file(path)
+        self.assertEqual(result['status'], 'skipped')
+        mock_extract.assert_not_called()
+        mock_notify.assert_not_called()
+        self.assertEqual(mock_record.call_args.kwargs['fingerprint'], compute_fingerprint(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
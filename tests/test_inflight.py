@@ -0,0 +1,96 @@
+import unittest
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.inflight import InFlightRegistry
+
+
+class TestInFlightRegistry(unittest.TestCase):
+
+    def test_entries_are_dropped_after_release(self):
+        reg = InFlightRegistry(stripes=4)
+        for i in range(100):
+            self.assertTrue(reg.acquire(f'/downloads/{i}.rar'))
+            reg.release(f'/downloads/{i}.rar')
+        self.assertEqual(len(reg), 0)
+        self.assertEqual(reg.stats()['acquired'], 100)
+
+    def test_non_blocking_acquire_reports_busy(self):
+        reg = InFlightRegistry()
+        self.assertTrue(reg.acquire('/downloads/a.rar', archive='a'))
+        self.assertFalse(reg.acquire('/downloads/a.rar'))
+        snap = reg.snapshot()
+        self.assertEqual([s['path'] for s in snap], ['/downloads/a.rar'])
+        self.assertEqual(snap[0]['archive'], 'a')
+        self.assertEqual(snap[0]['waiters'], 0)
+        reg.release('/downloads/a.rar')
+        self.assertEqual(reg.snapshot(), [])
+        self.assertEqual(len(reg), 0)
+        with self.assertRaises(RuntimeError):
+            reg.release('/downloads/a.rar')
+
+    def test_blocking_waiter_keeps_entry_alive(self):
+        reg = InFlightRegistry()
+        reg.acquire('k')
+        got = threading.Event()
+
+        def waiter():
+            if reg.acquire('k', blocking=True, timeout=5):
+                got.set()
+                reg.release('k')
+
+        t = threading.Thread(target=waiter)
+        t.start()
+        deadline = time.time() + 5
+        while reg.stats()['waiters'] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(reg.snapshot()[0]['waiters'], 1)
+        reg.release('k')
+        t.join()
+        self.assertTrue(got.is_set())
+        self.assertEqual(len(reg), 0)
+
+    def test_concurrent_claims_yield_one_winner(self):
+        reg = InFlightRegistry()
+        barrier = threading.Barrier(8)
+        wins = []
+
+        def claim():
+            barrier.wait()
+            if reg.acquire('same'):
+                wins.append(1)
+
+        threads = [threading.Thread(target=claim) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(wins), 1)
+
+
+class TestProcessFileInFlight(unittest.TestCase):
+
+    @patch('radarr_extractor.core.is_file_extracted', return_value=False)
+    def test_process_file_busy_and_cleanup(self, _is_extracted):
+        path = '/downloads/movie.rar'
+        key = os.path.realpath(path)
+        self.assertTrue(core._IN_FLIGHT.acquire(key))
+        try:
+            self.assertEqual(core.process_file(path)['status'], 'busy')
+        finally:
+            core._IN_FLIGHT.release(key)
+        with patch('radarr_extractor.core.extract_archive', side_effect=Exception("boom")):
+            self.assertEqual(core.process_file(path)['status'], 'failed')
+        self.assertFalse(core._IN_FLIGHT.is_held(key))
+        self.assertEqual(core.get_in_flight(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import tempfile
+import os
+import shutil
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.jobs import Job, JobQueue, QueueFull
+from radarr_extractor.stability import StabilityMonitor
+from radarr_extractor.volumes import volume_set_probe
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def test_priority_order_and_capacity(self):
+        """Higher priority jobs run first; a full queue rejects new jobs."""
+        gate = threading.Event()
+        order = []
+
+        def runner(job):
+            gate.wait(2)
+            order.append(job.path)
+            return {'status': 'extracted', 'bytes_written': 5}
+
+        queue = JobQueue(runner, workers=1, capacity=2)
+        first = queue.submit('/a', 'ui', 1)
+        time.sleep(0.1)  # let the worker pick up the first job and block
+        queue.submit('/b', 'ui', 1)
+        queue.submit('/c', 'webhook', 0)
+        with self.assertRaises(QueueFull):
+            queue.submit('/d', 'ui', 1)
+        gate.set()
+        deadline = time.time() + 2
+        while len(order) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(order, ['/a', '/c', '/b'])
+        status = queue.get(first.id).to_dict()
+        self.assertEqual(status['state'], 'done')
+        self.assertEqual(status['bytes_extracted'], 5)
+        self.assertEqual(queue.stats()['rejected'], 1)
+
+
+class TestWebhookJobs(unittest.TestCase):
+
+    def setUp(self):
+        from radarr_extractor import main
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        patcher = patch.object(main, 'DOWNLOAD_DIR', self.temp_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        monitor = StabilityMonitor(core._dispatch_process, window_sec=0.05, polls=1, max_wait_sec=1,
+                                   probe=volume_set_probe, on_vanish=core._drop_vanished)
+        self.addCleanup(monitor.stop)
+        patcher = patch.object(core, '_STABILITY', monitor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.main = main
+        self.client = main.app.test_client()
+        self.archive = os.path.join(self.temp_dir, 'movie.rar')
+        with open(self.archive, 'wb') as f:
+            f.write(b'x')
+
+    def _post(self):
+        return self.client.post('/webhook', json={
+            'eventType': 'Download',
+            'movieFile': {'relativePath': 'movie.rar'},
+            'movie': {'title': 'Movie'},
+        })
+
+    def test_webhook_returns_job_id(self):
+        """The webhook answers 202 immediately and the job is queryable."""
+        with patch('radarr_extractor.core.process_file', return_value={'status': 'skipped'}):
+            resp = self._post()
+            self.assertEqual(resp.status_code, 202)
+            job_id = resp.get_json()['job_id']
+            status = self.client.get(f'/jobs/{job_id}')
+            self.assertEqual(status.status_code, 200)
+            self.assertEqual(status.get_json()['path'], self.archive)
+        self.assertEqual(self.client.get('/jobs/unknown').status_code, 404)
+
+    def test_webhook_backpressure(self):
+        with patch.object(self.main, 'submit_job', side_effect=QueueFull("full")):
+            resp = self._post()
+        self.assertEqual(resp.status_code, 429)
+
+
+class TestJobStability(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.archive = os.path.join(self.temp_dir, 'movie.rar')
+        with open(self.archive, 'wb') as f:
+            f.write(b'x')
+        self.monitor = StabilityMonitor(core._dispatch_process, window_sec=0.1, polls=2, max_wait_sec=5,
+                                        probe=volume_set_probe, on_vanish=core._drop_vanished)
+        self.addCleanup(self.monitor.stop)
+        self.jobs = JobQueue(core._run_job, workers=1, capacity=10)
+        for patcher in (patch.object(core, '_STABILITY', self.monitor),
+                        patch.object(core, '_JOBS', self.jobs),
+                        patch.object(core, '_WAITING_JOBS', {})):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _wait_finished(self, job, timeout=5):
+        deadline = time.time() + timeout
+        while not job.finished and time.time() < deadline:
+            time.sleep(0.02)
+        return job.to_dict()['state']
+
+    def test_job_waits_for_growing_file(self):
+        """A job waits in the stability monitor, not in a worker, until its archive stops growing."""
+        sizes = []
+
+        def fake_process(path):
+            if path == self.archive:
+                sizes.append(os.path.getsize(path))
+            return {'status': 'extracted'}
+
+        with patch.object(core, 'process_file', side_effect=fake_process):
+            job = core.submit_job(self.archive, 'webhook')
+            for _ in range(5):
+                time.sleep(0.08)
+                with open(self.archive, 'ab') as f:
+                    f.write(b'x')
+                self.assertEqual(job.to_dict()['state'], 'waiting')
+                self.assertEqual(self.jobs.stats()['running'], 0)
+            # Other jobs are not held up behind the waiting one
+            other = core.submit_job(os.path.join(self.temp_dir, 'movie.nfo'), 'ui')
+            self.assertEqual(self._wait_finished(other), 'done')
+            self.assertEqual(self._wait_finished(job), 'done')
+        self.assertEqual(sizes, [6])
+
+    def test_job_for_vanished_file_is_skipped(self):
+        with patch.object(core, 'process_file') as process:
+            job = core.submit_job(self.archive, 'ui')
+            os.remove(self.archive)
+            self.assertEqual(self._wait_finished(job), 'skipped')
+        process.assert_not_called()
+        self.assertEqual(job.to_dict()['error'], 'file disappeared')
+        self.assertEqual(self.jobs.stats()['waiting'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
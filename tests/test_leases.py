@@ -0,0 +1,133 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.leases import LeaseManager
+
+
+class TestLeaseManager(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.a = LeaseManager(self.temp_dir, 'instance-a', ttl_sec=2, heartbeat_sec=0.5)
+        self.b = LeaseManager(self.temp_dir, 'instance-b', ttl_sec=2, heartbeat_sec=0.5)
+        self.addCleanup(self.a.stop)
+        self.addCleanup(self.b.stop)
+
+    def _age(self, manager, key, seconds):
+        path = manager._lease_path(key)
+        old = os.stat(path).st_mtime - seconds
+        os.utime(path, (old, old))
+
+    def test_only_one_instance_claims(self):
+        self.assertTrue(self.a.claim('/downloads/a.rar'))
+        self.assertFalse(self.b.claim('/downloads/a.rar'))
+        self.assertEqual(self.b.owner('/downloads/a.rar'), 'instance-a')
+        self.a.release('/downloads/a.rar')
+        self.assertTrue(self.b.claim('/downloads/a.rar'))
+
+    def test_stale_lease_is_reclaimed(self):
+        self.assertTrue(self.a.claim('/downloads/a.rar'))
+        self.a._stop.set()  # simulate a crash: no more heartbeats
+        self._age(self.a, '/downloads/a.rar', 10)
+        self.assertTrue(self.b.claim('/downloads/a.rar'))
+        self.assertEqual(self.b.stats()['reclaimed'], 1)
+        self.assertEqual(self.b.owner('/downloads/a.rar'), 'instance-b')
+        # The old holder notices on its next renewal and does not delete b's lease
+        self.a.renew()
+        self.assertEqual(self.a.stats()['lost'], 1)
+        self.a.release('/downloads/a.rar')
+        self.assertEqual(self.b.owner('/downloads/a.rar'), 'instance-b')
+
+    def test_heartbeat_keeps_lease_alive(self):
+        self.assertTrue(self.a.claim('/downloads/a.rar'))
+        self._age(self.a, '/downloads/a.rar', 1.5)
+        time.sleep(0.8)  # at least one heartbeat
+        self.assertFalse(self.b.claim('/downloads/a.rar'))
+        self.assertGreaterEqual(self.a.stats()['renewals'], 1)
+
+    def test_takeover_leaves_no_helper_files(self):
+        self.assertTrue(self.a.claim('/downloads/a.rar'))
+        self.a._stop.set()
+        self._age(self.a, '/downloads/a.rar', 10)
+        self.assertTrue(self.b.claim('/downloads/a.rar'))
+        leftovers = [n for n in os.listdir(self.temp_dir) if n.endswith(('.reclaim', '.tmp'))]
+        self.assertEqual(leftovers, [])
+
+    def test_takeover_in_progress_is_respected(self):
+        self.assertTrue(self.a.claim('/downloads/a.rar'))
+        self.a._stop.set()
+        self._age(self.a, '/downloads/a.rar', 10)
+        guard = self.a._lease_path('/downloads/a.rar') + '.reclaim'
+        open(guard, 'w').close()
+        self.assertFalse(self.b.claim('/downloads/a.rar'))
+        # A guard abandoned by a crashed reclaimer expires like a lease
+        old = os.stat(guard).st_mtime - 10
+        os.utime(guard, (old, old))
+        self.assertFalse(self.b.claim('/downloads/a.rar'))
+        self.assertTrue(self.b.claim('/downloads/a.rar'))
+
+    def test_renewal_failing_past_ttl_marks_lease_lost(self):
+        self.assertTrue(self.a.claim('/downloads/a.rar'))
+        self.a._stop.set()
+        self.a._renewed['/downloads/a.rar'] -= 10
+        with patch('radarr_extractor.leases.os.utime', side_effect=PermissionError("read-only")):
+            self.a.renew()
+        self.assertTrue(self.a.is_lost('/downloads/a.rar'))
+        self.a.release('/downloads/a.rar')
+        self.assertFalse(self.a.is_lost('/downloads/a.rar'))
+
+    def test_clock_files_are_cleaned_up(self):
+        self.a.claim('/downloads/a.rar')
+        clock = os.path.join(self.temp_dir, '.clock-instance-a')
+        self.assertTrue(os.path.exists(clock))
+        self.a.stop()
+        self.assertFalse(os.path.exists(clock))
+        # A crashed instance's clock is pruned by the next instance to start
+        dead = os.path.join(self.temp_dir, '.clock-crashed')
+        open(dead, 'w').close()
+        old = time.time() - 60
+        os.utime(dead, (old, old))
+        LeaseManager(self.temp_dir, 'instance-c', ttl_sec=2).stop()
+        self.assertFalse(os.path.exists(dead))
+
+    @patch('radarr_extractor.core.is_temp_directory', return_value=False)
+    @patch('radarr_extractor.core.notify_radarr')
+    @patch('radarr_extractor.core.record_extracted_file')
+    @patch('radarr_extractor.core.is_file_extracted', return_value=False)
+    def test_extraction_stops_when_lease_is_lost(self, _is_extracted, mock_record, mock_notify, _is_temp):
+        archive = os.path.join(self.temp_dir, 'movie.zip')
+        open(archive, 'wb').close()
+        key = os.path.realpath(archive)
+
+        def extract(path):
+            self.a._stop.set()
+            self._age(self.a, key, 10)
+            self.assertTrue(self.b.claim(key))
+            self.a.renew()
+            core._account_bytes(1024)  # the next write notices
+            self.fail("extraction kept writing without its lease")
+
+        with patch.object(core, '_get_leases', return_value=self.a), \
+                patch.object(core, 'DISK_SPACE_CHECK', False), \
+                patch.object(core, 'FINGERPRINT_DEDUP', False), \
+                patch.object(core, 'extract_archive', side_effect=extract):
+            result = core.process_file(archive)
+        self.assertEqual(result, {'status': 'busy', 'reason': 'lease lost to instance-b'})
+        mock_record.assert_not_called()
+        mock_notify.assert_not_called()
+        self.assertIsNone(getattr(core._EXTRACT_STATS, 'lease', None))
+        self.assertEqual(self.b.owner(key), 'instance-b')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.listing import ListingCache, decode_cursor, encode_cursor
+
+
+class TestListingCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        os.mkdir(os.path.join(self.temp_dir, 'zdir'))
+        for i in range(25):
+            with open(os.path.join(self.temp_dir, f'file{i:02d}.bin'), 'wb') as f:
+                f.write(b'x' * i)
+        open(os.path.join(self.temp_dir, '.dirstate.json'), 'w').close()
+
+    def _all_pages(self, cache, **kwargs):
+        names, cursor = [], None
+        while True:
+            page = cache.page(self.temp_dir, cursor=cursor, limit=10, **kwargs)
+            names.extend(e['name'] for e in page['entries'])
+            cursor = page['next_cursor']
+            if cursor is None:
+                return names
+
+    def test_pages_cover_listing_once(self):
+        cache = ListingCache(hidden={'.dirstate.json'})
+        names = self._all_pages(cache)
+        self.assertEqual(names, ['zdir'] + [f'file{i:02d}.bin' for i in range(25)])
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_sort_and_filter(self):
+        cache = ListingCache(hidden={'.dirstate.json'})
+        names = self._all_pages(cache, sort='size', predicate=lambda e: not e['is_dir'] and e['size'] >= 20)
+        self.assertEqual(names, [f'file{i:02d}.bin' for i in range(24, 19, -1)])
+
+    def test_cursor_survives_new_entries(self):
+        cache = ListingCache(ttl_sec=0, hidden={'.dirstate.json'})
+        first = cache.page(self.temp_dir, limit=5)
+        self.assertEqual(first['entries'][-1]['name'], 'file03.bin')
+        # An entry sorting before the cursor must not shift the next page
+        open(os.path.join(self.temp_dir, 'aaa.bin'), 'w').close()
+        second = cache.page(self.temp_dir, cursor=first['next_cursor'], limit=5)
+        self.assertEqual(second['entries'][0]['name'], 'file04.bin')
+        self.assertEqual(second['total'], 27)
+
+    def test_invalidate_and_ttl(self):
+        cache = ListingCache(ttl_sec=60)
+        cache.get(self.temp_dir)
+        cache.get(self.temp_dir)
+        cache.invalidate(self.temp_dir)
+        cache.get(self.temp_dir)
+        stats = cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['invalidated']), (1, 2, 1))
+
+    def test_bad_cursor(self):
+        self.assertEqual(decode_cursor(encode_cursor((True, 'a', 'A'))), (True, 'a', 'A'))
+        with self.assertRaises(ValueError):
+            decode_cursor('not-a-cursor')
+        cache = ListingCache()
+        name_cursor = cache.page(self.temp_dir, limit=3)['next_cursor']
+        with self.assertRaises(ValueError):
+            cache.page(self.temp_dir, sort='size', cursor=name_cursor)
+
+
+class TestListApi(unittest.TestCase):
+
+    def setUp(self):
+        from radarr_extractor import main
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        for name in ('done.rar', 'new.zip', 'notes.txt', '.new.zip.progress.json', 'movie.mkv.partial'):
+            open(os.path.join(self.temp_dir, name), 'wb').close()
+        os.mkdir(os.path.join(self.temp_dir, 'Movie'))
+        for patcher in (patch.object(main, 'DOWNLOAD_DIR', self.temp_dir),
+                        patch.object(core, '_LISTINGS', ListingCache(hidden=core.HIDDEN_NAMES,
+                                                                 hidden_suffixes=core.HIDDEN_SUFFIXES)),
+                        patch.object(core, 'is_file_extracted', side_effect=lambda p: p.endswith('done.rar'))):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.client = main.app.test_client()
+
+    def test_filters(self):
+        names = lambda resp: [e['name'] for e in resp.get_json()['entries']]
+        self.assertEqual(names(self.client.get('/api/list')), ['Movie', 'done.rar', 'new.zip', 'notes.txt'])
+        self.assertEqual(names(self.client.get('/api/list?filter=archives')), ['done.rar', 'new.zip'])
+        pending = self.client.get('/api/list?filter=pending').get_json()
+        self.assertEqual([e['name'] for e in pending['entries']], ['new.zip'])
+        self.assertFalse(pending['entries'][0]['extracted'])
+        self.assertEqual(pending['entries'][0]['rel'], 'new.zip')
+
+    def test_pagination_and_errors(self):
+        page = self.client.get('/api/list?limit=2').get_json()
+        self.assertEqual(len(page['entries']), 2)
+        rest = self.client.get(f"/api/list?limit=2&cursor={page['next_cursor']}").get_json()
+        self.assertEqual([e['name'] for e in rest['entries']], ['new.zip', 'notes.txt'])
+        self.assertIsNone(rest['next_cursor'])
+        self.assertEqual(self.client.get('/api/list?sort=bogus').status_code, 400)
+        self.assertEqual(self.client.get('/api/list?cursor=zzz').status_code, 400)
+        self.assertEqual(self.client.get('/api/list?path=../..').status_code, 400)
+
+    def test_watchdog_event_invalidates(self):
+        self.client.get('/api/list')
+        open(os.path.join(self.temp_dir, 'late.7z'), 'wb').close()
+        self.assertEqual(len(self.client.get('/api/list').get_json()['entries']), 4)
+
+        class Event:
+            is_directory = False
+            src_path = os.path.join(self.temp_dir, 'late.7z')
+
+        core.DownloadHandler().on_any_event(Event())
+        self.assertEqual(len(self.client.get('/api/list').get_json()['entries']), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
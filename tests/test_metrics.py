@@ -0,0 +1,59 @@
+import unittest
+import os
+import sys
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import metrics
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        # Keep test metrics out of the registry served at /metrics
+        self.registry = metrics.Registry()
+
+    def test_histogram_exposition(self):
+        """Buckets are cumulative and carry the metric's labels."""
+        hist = metrics.Histogram('test_latency_seconds', 'Test histogram.', buckets=(1, 10),
+                                 labelnames=('format',), registry=self.registry)
+        hist.observe(0.5, format='zip')
+        hist.observe(5, format='zip')
+        hist.observe(50, format='zip')
+        text = '\n'.join(hist.render())
+        self.assertIn('# TYPE test_latency_seconds histogram', text)
+        self.assertIn('test_latency_seconds_bucket{format="zip",le="1"} 1', text)
+        self.assertIn('test_latency_seconds_bucket{format="zip",le="10"} 2', text)
+        self.assertIn('test_latency_seconds_bucket{format="zip",le="+Inf"} 3', text)
+        self.assertIn('test_latency_seconds_count{format="zip"} 3', text)
+        self.assertIn('test_latency_seconds_sum{format="zip"} 55.5', text)
+
+    def test_function_backed_gauge(self):
+        gauge = metrics.Gauge('test_depth', 'Test gauge.', fn=lambda: 7, registry=self.registry)
+        self.assertIn('test_depth 7', gauge.render())
+        self.assertIn('test_depth 7', self.registry.render())
+        self.assertNotIn('test_depth', metrics.render())
+
+    def test_metrics_endpoint(self):
+        from radarr_extractor.main import app
+        resp = app.test_client().get('/metrics')
+        self.assertEqual(resp.status_code, 200)
+        body = resp.get_data(as_text=True)
+        self.assertIn('radarr_extractor_extraction_seconds', body)
+        self.assertIn('radarr_extractor_executor_queue_depth', body)
+        self.assertIn('radarr_extractor_notify_retries_total', body)
+
+    def test_stats_endpoint(self):
+        from radarr_extractor.main import app
+        resp = app.test_client().get('/stats')
+        self.assertEqual(resp.status_code, 200)
+        body = resp.get_json()
+        for key in ('backends', 'pools', 'events', 'listing', 'tracker', 'notify'):
+            self.assertIn(key, body)
+        self.assertIn('threads', body['pools'])
+        self.assertIn('debounce', body['events'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import os
+import sys
+import time
+from unittest.mock import MagicMock
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor.notifier import RadarrNotifier
+
+
+class TestRadarrNotifier(unittest.TestCase):
+
+    def _notifier(self, **kwargs):
+        notifier = RadarrNotifier('http://radarr:7878/', 'key', **kwargs)
+        self.addCleanup(notifier.stop)
+        notifier._session.post = MagicMock()
+        return notifier
+
+    def _wait_for(self, predicate, timeout=2.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_coalesces_same_folder(self):
+        """Repeated rescans for one folder inside the window are sent once."""
+        notifier = self._notifier(coalesce_sec=0.1)
+        for _ in range(5):
+            notifier.enqueue('/downloads/movie')
+        notifier.enqueue('/downloads/other')
+        self.assertTrue(self._wait_for(lambda: notifier.stats()['sent'] == 2))
+        self.assertEqual(notifier._session.post.call_count, 2)
+        args, kwargs = notifier._session.post.call_args_list[0]
+        self.assertEqual(args[0], 'http://radarr:7878/api/v3/command')
+        self.assertEqual(kwargs['json'], {"name": "RescanMovie", "path": '/downloads/movie'})
+        self.assertEqual(notifier.stats()['coalesced'], 4)
+
+    def test_enqueue_never_blocks_on_failures(self):
+        """An unreachable Radarr is retried in the background and then dropped."""
+        notifier = self._notifier(coalesce_sec=0, max_attempts=3, backoff_sec=0.01)
+        notifier._session.post.side_effect = ConnectionError("unreachable")
+        started = time.monotonic()
+        notifier.enqueue('/downloads/movie')
+        self.assertLess(time.monotonic() - started, 0.1)
+        self.assertTrue(self._wait_for(lambda: notifier.stats()['failed'] == 1))
+        self.assertEqual(notifier._session.post.call_count, 3)
+        self.assertEqual(notifier.stats()['retries'], 2)
+        self.assertEqual(notifier.stats()['queue_depth'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
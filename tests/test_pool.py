@@ -0,0 +1,91 @@
+import unittest
+import tempfile
+import os
+import shutil
+import sys
+import zipfile
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.membudget import MemoryBudget
+
+
+class TestProcessPoolMode(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def test_use_process_pool_by_mode(self):
+        with patch('radarr_extractor.core.EXTRACT_POOL_MODE', 'thread'):
+            self.assertFalse(core._use_process_pool('7z'))
+        with patch('radarr_extractor.core.EXTRACT_POOL_MODE', 'process'):
+            self.assertTrue(core._use_process_pool('rar'))
+        with patch('radarr_extractor.core.EXTRACT_POOL_MODE', 'auto'):
+            self.assertTrue(core._use_process_pool('zip'))
+            self.assertFalse(core._use_process_pool('rar'))
+            self.assertFalse(core._use_process_pool('tar'))
+
+    def test_extract_in_worker_process(self):
+        """Extraction runs in the pool and its stats come back to the caller."""
+        path = os.path.join(self.temp_dir, 'test.zip')
+        with zipfile.ZipFile(path, 'w') as zf:
+            zf.writestr('movie.mkv', b'x' * 1000)
+        with patch('radarr_extractor.core.EXTRACT_POOL_MODE', 'process'):
+            extract_dir = core.extract_archive(path)
+        self.addCleanup(core._PROCESS_POOL.shutdown)
+        self.assertTrue(os.path.exists(os.path.join(extract_dir, 'movie.mkv')))
+        stats = core.get_last_extract_stats()
+        self.assertEqual(stats['pool'], 'process')
+        self.assertEqual(stats['bytes_written'], 1000)
+        pool = core.get_pool_stats()['processes']
+        self.assertGreaterEqual(pool['completed'], 1)
+        self.assertEqual(pool['busy'], 0)
+
+    def test_worker_progress_reaches_reservation_and_job(self):
+        """Bytes written in the worker are relayed to the parent's reservation and job callback."""
+        from radarr_extractor.diskspace import Reservation
+        path = os.path.join(self.temp_dir, 'test.zip')
+        with zipfile.ZipFile(path, 'w') as zf:
+            zf.writestr('movie.mkv', os.urandom(6 * 1024 * 1024))
+        reservation = Reservation(path, None, 6 * 1024 * 1024)
+        seen = []
+        core._EXTRACT_STATS.reservation = reservation
+        core._EXTRACT_STATS.on_bytes = seen.append
+        try:
+            with patch('radarr_extractor.core.EXTRACT_POOL_MODE', 'process'):
+                core.extract_archive(path)
+        finally:
+            core._EXTRACT_STATS.reservation = None
+            core._EXTRACT_STATS.on_bytes = None
+        self.addCleanup(core._PROCESS_POOL.shutdown)
+        self.assertEqual(reservation.written, 6 * 1024 * 1024)
+        self.assertEqual(sum(seen), 6 * 1024 * 1024)
+
+    def test_sevenzip_budget_is_held_by_the_parent(self):
+        """Worker processes can't share the 7z budget, so the parent reserves it around the run."""
+        try:
+            import py7zr
+        except ImportError:
+            self.skipTest("py7zr not installed")
+        path = os.path.join(self.temp_dir, 'test.7z')
+        with py7zr.SevenZipFile(path, 'w') as z:
+            z.writestr(b'x' * 1000, 'movie.mkv')
+        budget = MemoryBudget(1 << 30)
+        with patch('radarr_extractor.core.EXTRACT_POOL_MODE', 'process'), \
+                patch.object(core, '_SEVENZIP_MEMORY', budget):
+            extract_dir = core.extract_archive(path)
+        self.addCleanup(core._PROCESS_POOL.shutdown)
+        self.assertTrue(os.path.exists(os.path.join(extract_dir, 'movie.mkv')))
+        self.assertEqual(core.get_last_extract_stats()['pool'], 'process')
+        stats = budget.stats()
+        self.assertEqual(stats['reservations'], 1)
+        self.assertEqual(stats['peak_used'], core._sevenzip_memory_estimate(path))
+        self.assertEqual(stats['used'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
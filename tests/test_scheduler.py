@@ -0,0 +1,124 @@
+import unittest
+import os
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.scheduler import ExtractionScheduler
+
+
+class TestExtractionScheduler(unittest.TestCase):
+
+    def _run_order(self, sched, submissions):
+        """Block the single worker, queue submissions, then return the order they ran in."""
+        gate = threading.Event()
+        order = []
+        sched.submit(gate.wait, priority='webhook')
+        time.sleep(0.05)
+        futures = [sched.submit(order.append, name, **kwargs) for name, kwargs in submissions]
+        gate.set()
+        for f in futures:
+            f.result(timeout=5)
+        sched.shutdown()
+        return order
+
+    def test_priority_classes(self):
+        sched = ExtractionScheduler(1)
+        order = self._run_order(sched, [
+            ('scan', {'priority': 'scan'}),
+            ('watchdog', {'priority': 'watchdog'}),
+            ('ui', {'priority': 'ui'}),
+            ('webhook', {'priority': 'webhook'}),
+        ])
+        self.assertEqual(order, ['webhook', 'ui', 'watchdog', 'scan'])
+
+    def test_groups_take_turns(self):
+        sched = ExtractionScheduler(1)
+        order = self._run_order(sched, [
+            ('a1', {'group': 'A'}), ('a2', {'group': 'A'}), ('a3', {'group': 'A'}),
+            ('b1', {'group': 'B'}), ('b2', {'group': 'B'}),
+        ])
+        self.assertEqual(order, ['a1', 'b1', 'a2', 'b2', 'a3'])
+
+    def test_fairness_off_is_fifo(self):
+        sched = ExtractionScheduler(1, fairness=False)
+        order = self._run_order(sched, [
+            ('a1', {'group': 'A'}), ('a2', {'group': 'A'}), ('b1', {'group': 'B'}),
+        ])
+        self.assertEqual(order, ['a1', 'a2', 'b1'])
+
+    def test_served_groups_do_not_accumulate(self):
+        sched = ExtractionScheduler(1)
+        for i in range(500):
+            sched.submit(lambda: None, group=f"Movie {i}").result(timeout=5)
+        sched.shutdown()
+        self.assertLessEqual(len(sched._served), ExtractionScheduler.SERVED_SLACK + 1)
+
+    def test_smallest_first(self):
+        sched = ExtractionScheduler(1, smallest_first=True, fairness=False)
+        order = self._run_order(sched, [
+            ('big', {'size': 300}), ('unknown', {}), ('small', {'size': 10}), ('mid', {'size': 50}),
+        ])
+        self.assertEqual(order, ['small', 'mid', 'big', 'unknown'])
+
+    def test_aging_promotes_waiting_tasks(self):
+        sched = ExtractionScheduler(1, aging_sec=0.1)
+        gate = threading.Event()
+        order = []
+        sched.submit(gate.wait, priority='webhook')
+        time.sleep(0.05)
+        old = sched.submit(order.append, 'old-scan', priority='scan')
+        time.sleep(0.35)
+        new = sched.submit(order.append, 'new-watchdog', priority='watchdog')
+        gate.set()
+        old.result(timeout=5)
+        new.result(timeout=5)
+        sched.shutdown()
+        self.assertEqual(order, ['old-scan', 'new-watchdog'])
+        self.assertEqual(sched.stats()['aged'], 1)
+
+    def test_exceptions_reach_the_future(self):
+        sched = ExtractionScheduler(2)
+
+        def boom():
+            raise ValueError('bad archive')
+
+        with self.assertRaises(ValueError):
+            sched.submit(boom).result(timeout=5)
+        self.assertEqual(sched.submit(lambda: 42).result(timeout=5), 42)
+        sched.shutdown()
+        stats = sched.stats()
+        self.assertEqual((stats['completed'], stats['failed']), (1, 1))
+        self.assertEqual(stats['classes']['watchdog']['started'], 2)
+
+
+class TestCoreScheduling(unittest.TestCase):
+
+    def test_fairness_group_is_top_level_folder(self):
+        with patch.object(core, 'DOWNLOAD_DIR', '/downloads'):
+            self.assertEqual(core._fairness_group('/downloads/Movie.2024/cd1/a.rar'), 'Movie.2024')
+            self.assertEqual(core._fairness_group('/downloads/a.rar'), '')
+            self.assertEqual(core._fairness_group('/elsewhere/x/a.rar'), '/elsewhere/x')
+
+    def test_best_pending_priority_wins(self):
+        path = '/downloads/Movie/movie.rar'
+        with patch.object(core, '_STABILITY') as stability, \
+                patch.object(core, 'is_file_extracted', return_value=False), \
+                patch.object(core, 'is_temp_directory', return_value=False), \
+                patch.object(core, '_submit_to_executor') as submit:
+            core._submit_process(path, source='scan')
+            core._submit_process(path, source='watchdog')
+            core._submit_process(path, source='scan')
+            self.assertTrue(stability.watch.called)
+            core._dispatch_process(path)
+        self.assertEqual(submit.call_args.kwargs['priority'], 'watchdog')
+        self.assertNotIn(path, core._PENDING_PRIORITY)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.membudget import MemoryBudget
+
+try:
+    import py7zr
+    from radarr_extractor.sevenzip import estimate_decoder_memory
+except ImportError:  # pragma: no cover
+    py7zr = None
+
+
+@unittest.skipIf(py7zr is None, "py7zr not installed")
+class TestSevenZipStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.archive = os.path.join(self.temp_dir, 'movie.7z')
+        with py7zr.SevenZipFile(self.archive, 'w') as z:
+            z.writestr(os.urandom(300000), 'Movie/movie.mkv')
+            z.writestr(b'subs', 'Movie/movie.srt')
+            z.writestr(b'info', 'Movie/movie.nfo')
+            z.writestr(b'extra', 'Movie/extras.bin')
+        self.dest = os.path.join(self.temp_dir, 'out')
+        os.makedirs(self.dest)
+
+    def test_media_only_filter_is_honored(self):
+        with patch('radarr_extractor.core.EXTRACT_ONLY_MEDIA', True):
+            core._safe_extract_7z(self.archive, self.dest)
+        found = sorted(os.listdir(os.path.join(self.dest, 'Movie')))
+        self.assertEqual(found, ['movie.mkv', 'movie.srt'])
+
+    def test_reports_memory(self):
+        core._EXTRACT_STATS.current = {'bytes_written': 0}
+        try:
+            core._safe_extract_7z(self.archive, self.dest)
+            stats = core._EXTRACT_STATS.current
+        finally:
+            core._EXTRACT_STATS.current = None
+        self.assertEqual(stats['bytes_written'], 300000 + 4 + 5)
+        self.assertGreater(stats['peak_rss'], 0)
+        with py7zr.SevenZipFile(self.archive) as z:
+            self.assertEqual(stats['memory_estimate'], estimate_decoder_memory(z))
+        self.assertGreaterEqual(stats['memory_estimate'], 1 << 20)
+
+
+class TestMemoryBudget(unittest.TestCase):
+
+    def test_waits_for_budget(self):
+        budget = MemoryBudget(100)
+        order = []
+        release = threading.Event()
+
+        def hold():
+            with budget.reserve(80):
+                order.append('first')
+                release.wait(5)
+
+        t = threading.Thread(target=hold)
+        t.start()
+        while not order:
+            time.sleep(0.01)
+
+        def second():
+            with budget.reserve(50):
+                order.append('second')
+
+        t2 = threading.Thread(target=second)
+        t2.start()
+        time.sleep(0.1)
+        self.assertEqual(order, ['first'])
+        release.set()
+        t.join()
+        t2.join()
+        self.assertEqual(order, ['first', 'second'])
+        self.assertEqual(budget.stats()['waits'], 1)
+        self.assertEqual(budget.stats()['used'], 0)
+
+    def test_oversized_runs_alone(self):
+        budget = MemoryBudget(100)
+        with budget.reserve(500):
+            self.assertEqual(budget.stats()['oversized'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import tempfile
+import os
+import shutil
+import sys
+import time
+import threading
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor.stability import StabilityMonitor
+
+
+class TestStabilityMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.promoted = []
+        self.done = threading.Event()
+
+        def callback(path):
+            self.promoted.append(path)
+            self.done.set()
+
+        self.monitor = StabilityMonitor(callback, window_sec=0.1, polls=2, max_wait_sec=5)
+        self.addCleanup(self.monitor.stop)
+
+    def _write(self, name, size, age=0):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        if age:
+            past = time.time() - age
+            os.utime(path, (past, past))
+        return path
+
+    def test_old_file_promoted_immediately(self):
+        """Files untouched for longer than the window skip polling."""
+        path = self._write('old.rar', 10, age=60)
+        self.monitor.watch(path)
+        self.assertTrue(self.done.wait(1))
+        self.assertEqual(self.promoted, [path])
+        self.assertEqual(self.monitor.stats()['polls'], 1)
+
+    def test_growing_file_waits_until_stable(self):
+        """A file that keeps growing is promoted only after it stops."""
+        path = self._write('growing.rar', 10)
+        self.monitor.watch(path)
+        for i in range(5):
+            time.sleep(0.08)
+            with open(path, 'ab') as f:
+                f.write(b'x')
+            self.assertEqual(self.promoted, [])
+        self.assertTrue(self.done.wait(2))
+        self.assertEqual(self.promoted, [path])
+
+    def test_vanished_file_dropped(self):
+        """Files removed while pending are not promoted."""
+        path = self._write('gone.rar', 10)
+        self.monitor.watch(path)
+        os.remove(path)
+        time.sleep(0.3)
+        self.assertEqual(self.promoted, [])
+        self.assertEqual(self.monitor.stats()['vanished'], 1)
+
+    def test_slow_probe_does_not_hold_the_lock(self):
+        """watch() and stats() stay responsive while a probe is blocked."""
+        probing = threading.Event()
+        release = threading.Event()
+
+        def slow_probe(path):
+            probing.set()
+            release.wait(2)
+            return 10, 0.0
+
+        monitor = StabilityMonitor(self.promoted.append, window_sec=0.1, polls=1, max_wait_sec=5,
+                                   probe=slow_probe)
+        self.addCleanup(monitor.stop)
+        self.addCleanup(release.set)
+        monitor.watch('/slow/a.rar')
+        self.assertTrue(probing.wait(1))
+        started = time.monotonic()
+        monitor.watch('/slow/b.rar')
+        self.assertEqual(monitor.stats()['pending'], 2)
+        self.assertLess(time.monotonic() - started, 0.5)
+        release.set()
+
+
+if __name__ == '__main__':
+    unittest.main()
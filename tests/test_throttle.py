@@ -0,0 +1,153 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import core
+from radarr_extractor.throttle import IOThrottle, TokenBucket
+
+MIB = 1024 * 1024
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_unlimited_never_waits(self):
+        bucket = TokenBucket(0)
+        self.assertEqual(bucket.take(10 * MIB, 0.0), 0.0)
+
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(MIB, burst=MIB)
+        bucket._last = 0.0
+        self.assertEqual(bucket.take(MIB, 0.0), 0.0)
+        # Debt accumulates so back-to-back callers queue behind each other
+        self.assertAlmostEqual(bucket.take(MIB, 0.0), 1.0)
+        self.assertAlmostEqual(bucket.take(MIB, 0.0), 2.0)
+        self.assertAlmostEqual(bucket.take(0, 3.0), 0.0)
+
+
+class TestIOThrottle(unittest.TestCase):
+
+    def test_device_limits_are_separate(self):
+        throttle = IOThrottle(device_rate=MIB, device_rates={2: 0})
+        with patch('radarr_extractor.throttle.time.sleep') as sleep:
+            throttle.consume(4 * MIB, device=1)
+            throttle.consume(4 * MIB, device=1)
+            throttle.consume(64 * MIB, device=2)
+        self.assertEqual(sleep.call_count, 1)
+        self.assertAlmostEqual(sleep.call_args[0][0], 4.0, places=1)
+        stats = throttle.stats()
+        self.assertEqual(stats['devices']['1']['bytes_total'], 8 * MIB)
+        self.assertEqual(stats['devices']['2']['limit'], 0)
+        self.assertEqual(stats['bytes_total'], 72 * MIB)
+
+    def test_global_limit_applies_across_devices(self):
+        throttle = IOThrottle(rate=2 * MIB)
+        with patch('radarr_extractor.throttle.time.sleep') as sleep:
+            throttle.consume(4 * MIB, device=1)
+            throttle.consume(4 * MIB, device=2)
+        # The first 4 MiB fit the burst; the second must wait for the shared bucket
+        self.assertEqual(sleep.call_count, 1)
+        self.assertAlmostEqual(sleep.call_args[0][0], 2.0, places=1)
+        self.assertEqual(throttle.stats()['throttled'], 1)
+
+    def test_adaptive_backs_off_and_recovers(self):
+        throttle = IOThrottle(device_rate=100 * MIB, adaptive=True, latency_target=0.02, min_rate=MIB)
+        with patch('radarr_extractor.throttle.time.sleep'):
+            throttle.consume(50 * MIB, device=1)
+        # 100 ms per MiB is far above the 20 ms target
+        throttle.observe_write(MIB, 0.1, device=1)
+        limit = throttle.stats()['devices']['1']['limit']
+        self.assertLess(limit, 100 * MIB)
+        self.assertEqual(throttle.stats()['devices']['1']['backoffs'], 1)
+        dev = throttle._devices[1]
+        for _ in range(60):
+            dev.adjusted_at = 0.0
+            throttle.observe_write(MIB, 0.001, device=1)
+        self.assertIsNone(dev.adaptive_rate)
+        self.assertEqual(throttle.stats()['devices']['1']['limit'], 100 * MIB)
+
+    def test_share_splits_limits(self):
+        throttle = IOThrottle(rate=8 * MIB, device_rate=4 * MIB)
+        throttle.set_share(0.5)
+        throttle.consume(1, device=1)
+        stats = throttle.stats()
+        self.assertEqual(stats['limit'], 4 * MIB)
+        self.assertEqual(stats['devices']['1']['limit'], 2 * MIB)
+
+
+class TestCoreThrottling(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def test_extraction_is_charged_to_destination_device(self):
+        archive = os.path.join(self.temp_dir, 'movie.zip')
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr('movie.mkv', os.urandom(256 * 1024))
+        throttle = IOThrottle()
+        with patch.object(core, '_THROTTLE', throttle), patch.object(core, 'EXTRACT_MODE', 'inplace'):
+            core._extract_local(archive)
+        device = os.stat(self.temp_dir).st_dev
+        stats = throttle.stats()
+        self.assertEqual(stats['devices'][str(device)]['bytes_total'], 256 * 1024)
+        self.assertEqual(core.get_last_extract_stats()['device'], device)
+
+    def _charged_chunks(self, archive, **throttle_args):
+        throttle = IOThrottle(**throttle_args)
+        chunks = []
+        consume = throttle.consume
+        throttle.consume = lambda n, device=None: chunks.append(n) or consume(n, device)
+        with patch.object(core, '_THROTTLE', throttle), patch.object(core, 'EXTRACT_MODE', 'inplace'), \
+                patch.object(core, 'EXTRACT_BUFFER_SIZE', 64 * 1024):
+            core._extract_local(archive)
+        return chunks
+
+    def test_tar_members_are_charged_per_chunk(self):
+        import tarfile
+        payload = os.path.join(self.temp_dir, 'payload.mkv')
+        with open(payload, 'wb') as f:
+            f.write(os.urandom(MIB))
+        archive = os.path.join(self.temp_dir, 'movie.tar.gz')
+        with tarfile.open(archive, 'w:gz') as tf:
+            tf.add(payload, arcname='Movie/movie.mkv')
+        chunks = self._charged_chunks(archive)
+        self.assertEqual(sum(chunks), MIB)
+        self.assertLessEqual(max(chunks), 64 * 1024)
+        extracted = os.path.join(self.temp_dir, 'Movie', 'movie.mkv')
+        self.assertEqual(os.path.getsize(extracted), MIB)
+        self.assertEqual(int(os.path.getmtime(extracted)), int(os.path.getmtime(payload)))
+
+    def test_kernel_copies_are_capped_under_a_limit(self):
+        archive = os.path.join(self.temp_dir, 'movie.zip')
+        with zipfile.ZipFile(archive, 'w', zipfile.ZIP_STORED) as zf:
+            zf.writestr('movie.mkv', os.urandom(MIB))
+        chunks = self._charged_chunks(archive, rate=1024 * MIB)
+        self.assertEqual(sum(chunks), MIB)
+        self.assertLessEqual(max(chunks), 64 * 1024)
+
+    def test_system_fast_is_bypassed_under_a_limit(self):
+        archive = os.path.join(self.temp_dir, 'movie.zip')
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr('movie.mkv', b'm' * 1000)
+        with patch.object(core, 'EXTRACT_BACKEND', 'system_fast'), \
+                patch.object(core, '_extract_system_fast') as system_fast:
+            self._charged_chunks(archive, device_rate=10 * MIB)
+        system_fast.assert_not_called()
+        self.assertEqual(core.get_last_extract_stats()['backend'], 'python')
+        self.assertTrue(IOThrottle(adaptive=True).limited())
+        self.assertFalse(IOThrottle().limited())
+
+    def test_parse_device_limits(self):
+        limits = core._parse_device_limits(f"{self.temp_dir}=40, /does/not/exist=10,")
+        self.assertEqual(limits, {os.stat(self.temp_dir).st_dev: 40 * MIB})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import tempfile
+import os
+import shutil
+from unittest.mock import patch
+import sys
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor import tracker
+
+
+class TestTracker(unittest.TestCase):
+
+    def setUp(self):
+        """Point the tracker at a fresh file for each test."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.tracker_file = os.path.join(self.temp_dir, '.extracted_files')
+        patcher = patch('radarr_extractor.tracker.TRACKER_FILE', self.tracker_file)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        tracker.reset_tracker_cache()
+        self.addCleanup(tracker.reset_tracker_cache)
+
+    def test_record_and_lookup(self):
+        """Recorded paths are found without re-reading the file."""
+        self.assertFalse(tracker.is_file_extracted('/downloads/a.rar'))
+        tracker.record_extracted_file('/downloads/a.rar')
+        self.assertTrue(tracker.is_file_extracted('/downloads/a.rar'))
+        before = tracker.get_tracker_stats()
+        for _ in range(10):
+            self.assertTrue(tracker.is_file_extracted('/downloads/a.rar'))
+        after = tracker.get_tracker_stats()
+        self.assertEqual(after['hits'] - before['hits'], 10)
+        self.assertEqual(after['full_reloads'], before['full_reloads'])
+        self.assertEqual(after['tail_reads'], before['tail_reads'])
+
+    def test_fingerprint_lookup(self):
+        """Fingerprints survive a reload and do not show up as paths."""
+        tracker.record_extracted_file('/downloads/a.rar', fingerprint='v1:10:abc')
+        tracker.record_extracted_file('/downloads/b.rar')
+        tracker.reset_tracker_cache()
+        self.assertEqual(tracker.find_by_fingerprint('v1:10:abc'), '/downloads/a.rar')
+        self.assertIsNone(tracker.find_by_fingerprint('v1:10:def'))
+        self.assertEqual(tracker.load_extracted_files(), {'/downloads/a.rar', '/downloads/b.rar'})
+
+    def test_picks_up_external_append(self):
+        """Lines appended by another process are read incrementally."""
+        tracker.record_extracted_file('/downloads/a.rar')
+        self.assertTrue(tracker.is_file_extracted('/downloads/a.rar'))
+        with open(self.tracker_file, 'a') as f:
+            f.write('/downloads/b.rar\n')
+        self.assertTrue(tracker.is_file_extracted('/downloads/b.rar'))
+        self.assertGreaterEqual(tracker.get_tracker_stats()['tail_reads'], 1)
+
+    def test_reloads_when_file_replaced(self):
+        """A replaced tracker file (new inode) triggers a full reload."""
+        tracker.record_extracted_file('/downloads/a.rar')
+        self.assertTrue(tracker.is_file_extracted('/downloads/a.rar'))
+        replacement = self.tracker_file + '.new'
+        with open(replacement, 'w') as f:
+            f.write('/downloads/c.rar\n')
+        os.replace(replacement, self.tracker_file)
+        self.assertTrue(tracker.is_file_extracted('/downloads/c.rar'))
+        self.assertFalse(tracker.is_file_extracted('/downloads/a.rar'))
+
+    def test_ignores_torn_line(self):
+        """A partially written last line is not treated as an entry."""
+        with open(self.tracker_file, 'w') as f:
+            f.write('/downloads/a.rar\n/downloads/b.r')
+        self.assertTrue(tracker.is_file_extracted('/downloads/a.rar'))
+        self.assertFalse(tracker.is_file_extracted('/downloads/b.r'))
+        with open(self.tracker_file, 'a') as f:
+            f.write('ar\n')
+        self.assertTrue(tracker.is_file_extracted('/downloads/b.rar'))
+
+
+class TestSqliteTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.db_path = os.path.join(self.temp_dir, 'tracker.db')
+        self.legacy_path = os.path.join(self.temp_dir, '.extracted_files')
+
+    def _open(self, **kwargs):
+        store = tracker.SqliteTrackerStore(self.db_path, legacy_path=self.legacy_path, **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def test_migrates_legacy_file_once(self):
+        """Legacy entries are imported and only new lines are imported on reopen."""
+        with open(self.legacy_path, 'w') as f:
+            f.write('/downloads/a.rar\n/downloads/b.rar\n')
+        store = self._open()
+        self.assertTrue(store.contains('/downloads/a.rar'))
+        self.assertEqual(store.stats()['migrated'], 2)
+        store.close()
+        with open(self.legacy_path, 'a') as f:
+            f.write('/downloads/c.rar\n')
+        store = self._open()
+        self.assertEqual(store.stats()['migrated'], 1)
+        self.assertEqual(store.load(), {'/downloads/a.rar', '/downloads/b.rar', '/downloads/c.rar'})
+
+    def test_migrates_legacy_fingerprints(self):
+        """Fingerprint lines fill the fingerprint column instead of becoming rows."""
+        with open(self.legacy_path, 'w') as f:
+            f.write('/dl/a.rar\n#fp\tabc123\t/dl/b.rar\n/dl/b.rar\n')
+        store = self._open()
+        self.assertEqual(store.find_fingerprint('abc123'), '/dl/b.rar')
+        self.assertEqual(store.load(), {'/dl/a.rar', '/dl/b.rar'})
+        self.assertEqual(store.get('/dl/b.rar')['fingerprint'], 'abc123')
+
+    def test_batched_record_with_details(self):
+        """Pending records are visible before the batch is written."""
+        store = self._open(batch_size=3, flush_sec=60)
+        store.record('/downloads/a.rar', {'size': 10, 'destination': '/downloads'})
+        self.assertTrue(store.contains('/downloads/a.rar'))
+        self.assertEqual(store.stats()['rows_written'], 0)
+        store.record('/downloads/b.rar', {})
+        store.record('/downloads/c.rar', {})
+        self.assertEqual(store.stats()['rows_written'], 3)
+        row = store.get('/downloads/a.rar')
+        self.assertEqual(row['size'], 10)
+        self.assertEqual(row['destination'], '/downloads')
+
+    def test_fingerprint_lookup(self):
+        """Fingerprints are found both while pending and once written."""
+        store = self._open(batch_size=2, flush_sec=60)
+        store.record('/downloads/a.rar', {'fingerprint': 'v1:10:abc'})
+        self.assertEqual(store.find_fingerprint('v1:10:abc'), '/downloads/a.rar')
+        store.record('/downloads/b.rar', {})
+        self.assertEqual(store.stats()['pending'], 0)
+        self.assertEqual(store.find_fingerprint('v1:10:abc'), '/downloads/a.rar')
+        self.assertIsNone(store.find_fingerprint('v1:10:def'))
+
+
+if __name__ == '__main__':
+    unittest.main()
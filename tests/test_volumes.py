@@ -0,0 +1,97 @@
+import unittest
+import tempfile
+import os
+import shutil
+import sys
+import time
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor.volumes import (
+    volume_info,
+    is_first_volume,
+    find_volume_set,
+    first_volume,
+    volume_set_probe,
+)
+
+
+class TestVolumes(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def _touch(self, *names):
+        paths = []
+        for name in names:
+            path = os.path.join(self.temp_dir, name)
+            with open(path, 'wb') as f:
+                f.write(b'x')
+            paths.append(path)
+        return paths
+
+    def test_volume_info(self):
+        """Both naming schemes map to a shared key and ordered index."""
+        self.assertEqual(volume_info('/d/movie.part01.rar'), (('/d', 'movie', 'part'), 0))
+        self.assertEqual(volume_info('/d/Movie.PART10.RAR'), (('/d', 'movie', 'part'), 9))
+        self.assertEqual(volume_info('/d/movie.rar'), (('/d', 'movie', 'old'), 0))
+        self.assertEqual(volume_info('/d/movie.r00'), (('/d', 'movie', 'old'), 1))
+        self.assertIsNone(volume_info('/d/movie.zip'))
+
+    def test_is_first_volume(self):
+        self.assertTrue(is_first_volume('/d/movie.part001.rar'))
+        self.assertTrue(is_first_volume('/d/movie.rar'))
+        self.assertTrue(is_first_volume('/d/movie.zip'))
+        self.assertFalse(is_first_volume('/d/movie.part02.rar'))
+        self.assertFalse(is_first_volume('/d/movie.r00'))
+
+    def test_find_volume_set_old_style(self):
+        """Old-style sets are ordered .rar, .r00, .r01 and exclude other releases."""
+        rar, r00, r01 = self._touch('movie.rar', 'movie.r00', 'movie.r01')
+        self._touch('other.rar', 'other.r00', 'movie.nfo')
+        self.assertEqual(find_volume_set(r01), [rar, r00, r01])
+        self.assertEqual(first_volume(r01), rar)
+
+    def test_continuation_volumes_need_rar_head(self):
+        """.s00-.z99 count as RAR volumes only next to their .rar; split zips are left alone."""
+        zip_path, z01 = self._touch('other.zip', 'other.z01')
+        self.assertIsNone(volume_info(z01))
+        self.assertTrue(is_first_volume(z01))
+        self.assertEqual(find_volume_set(zip_path), [zip_path])
+        rar, s02 = self._touch('movie.rar', 'movie.s02')
+        self.assertEqual(volume_info(s02), ((self.temp_dir, 'movie', 'old'), 103))
+        self.assertEqual(find_volume_set(s02), [rar, s02])
+        self.assertIsNone(volume_info(os.path.join(self.temp_dir, 'movie.r100')))
+
+    def test_first_volume_missing(self):
+        """Later volumes without their first volume have no set head yet."""
+        self._touch('movie.part02.rar', 'movie.part03.rar')
+        self.assertIsNone(first_volume(os.path.join(self.temp_dir, 'movie.part03.rar')))
+
+    def test_probe_sees_new_volume(self):
+        """Adding a volume changes the set signature."""
+        first, = self._touch('movie.part01.rar')
+        before, _ = volume_set_probe(first)
+        self._touch('movie.part02.rar')
+        after, _ = volume_set_probe(first)
+        self.assertNotEqual(before, after)
+
+    def test_directory_listing_is_cached_until_it_changes(self):
+        """Repeated lookups in an unchanged directory share one scandir pass."""
+        rar, r00 = self._touch('movie.rar', 'movie.r00')
+        past = time.time() - 60
+        os.utime(self.temp_dir, (past, past))
+        with patch('radarr_extractor.volumes.os.scandir', wraps=os.scandir) as scandir:
+            self.assertEqual(find_volume_set(r00), [rar, r00])
+            self.assertEqual(find_volume_set(rar), [rar, r00])
+            self.assertEqual(scandir.call_count, 1)
+            r01, = self._touch('movie.r01')
+            self.assertEqual(find_volume_set(rar), [rar, r00, r01])
+            self.assertEqual(scandir.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import sys
+import threading
+import time
+from collections import deque
+from unittest.mock import patch
+
+# Add the parent directory to the path so we can import the modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from radarr_extractor.walker import TreeWalker
+
+
+def _tree(depth, fanout):
+    """Virtual tree: each node 'a/b/c' has `fanout` children until `depth`."""
+    def children(path):
+        if path.count('/') >= depth:
+            return []
+        return [f"{path}/{i}" for i in range(fanout)]
+    return children
+
+
+class TestTreeWalker(unittest.TestCase):
+
+    def _walk(self, workers, **kwargs):
+        visited = []
+        lock = threading.Lock()
+        children = _tree(3, 4)
+
+        def visit(path):
+            with lock:
+                visited.append(path)
+            return children(path)
+
+        stats = TreeWalker(workers).walk('r', visit, **kwargs)
+        return visited, stats
+
+    def test_visits_every_directory_once(self):
+        for workers in (1, 4):
+            visited, stats = self._walk(workers)
+            self.assertEqual(len(visited), 1 + 4 + 16 + 64)
+            self.assertEqual(len(set(visited)), len(visited))
+            self.assertEqual(stats['visited'], len(visited))
+
+    def test_prune_skips_subtree(self):
+        visited, stats = self._walk(4, prune=lambda p: p == 'r/0')
+        self.assertNotIn('r/0', visited)
+        self.assertFalse(any(p.startswith('r/0/') for p in visited))
+        self.assertEqual(len(visited), 1 + 3 + 12 + 48)
+        self.assertEqual(stats['pruned'], 1)
+
+    def test_visit_errors_do_not_stop_walk(self):
+        def visit(path):
+            if path == 'r/1':
+                raise OSError("gone")
+            return _tree(2, 2)(path)
+
+        stats = TreeWalker(3).walk('r', visit)
+        self.assertEqual(stats['errors'], 1)
+        self.assertEqual(stats['visited'], 1 + 1 + 2)
+
+    def test_workers_wait_while_parent_publishes_children(self):
+        """A stolen child finishing first must not let idle workers exit early."""
+        alive = []
+
+        class SlowDeque(deque):
+            def extend(self, items):
+                super().extend(items)
+                time.sleep(0.2)  # let another worker steal and finish the child
+                alive.append(sum(t.name.startswith('scan-walker-') and t.is_alive()
+                                 for t in threading.enumerate()))
+
+        visit = lambda path: ['r/0'] if path == 'r' else []
+        with patch('radarr_extractor.walker.deque', SlowDeque):
+            stats = TreeWalker(3).walk('r', visit)
+        self.assertEqual(stats['visited'], 2)
+        self.assertEqual(alive, [3])
+
+
+if __name__ == '__main__':
+    unittest.main()